@@ -1,22 +1,33 @@
+import click
 from flask import Flask
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 
 from app.infrastructure.config import Config
-from app.infrastructure.database import init_db
-from app.adapters.postgresql_repository import PostgreSQLUserRepository, PostgreSQLTaskRepository
+from app.infrastructure.database import db, init_db
+from app.infrastructure.cache import create_cache_backend
+from app.infrastructure.event_broker import create_event_broker
+from app.infrastructure.password_hasher import BoundedPasswordHasher
+from app.adapters.postgresql_repository import PostgreSQLUserRepository, PostgreSQLTaskRepository, PostgreSQLOutboxRepository
+from app.adapters.cached_user_repository import CachedUserRepository
 from app.application.service import UserService
-from app.application.auth_service import AuthService
+from app.application.auth_service import AuthService, TokenClaims
 from app.application.task_service import TaskService
+from app.application.outbox import OutboxProcessor
 from app.adapters.api.auth_controller import auth_blueprint, AuthController
 from app.adapters.api.user_controller import user_blueprint, UserController
 from app.adapters.api.task_controller import task_blueprint, TaskController
 from app.adapters.api.error_handler import register_error_handlers
+from app.adapters.api.serializers import create_json_provider
+from app.adapters.api.live_events import TaskEventPublisher
+from app.adapters.api.query_profiler import QueryProfiler
+from app.domain.observer import TaskNotifier
 
 def create_app():
     """Create and configure the Flask application."""
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = create_json_provider(app, app.config['JSON_BACKEND'])
     
     # Enable CORS
     CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
@@ -27,12 +38,54 @@ def create_app():
     # Initialize the database
     init_db(app)
     
+    # Opt-in SQL profiling of a sample of requests (Server-Timing header and a log line)
+    if app.config['QUERY_PROFILER_SAMPLE_RATE'] > 0:
+        profiler = QueryProfiler(app.config['QUERY_PROFILER_SAMPLE_RATE'], app.config['QUERY_PROFILER_REPEAT_THRESHOLD'])
+        with app.app_context():
+            profiler.init_app(app, db.engine)
+    
     # Initialize repositories and services
     user_repository = PostgreSQLUserRepository()
     task_repository = PostgreSQLTaskRepository()
-    auth_service = AuthService(user_repository)
+    
+    # Cache user lookups, which happen on every authenticated request
+    user_cache = create_cache_backend(
+        app.config['USER_CACHE_BACKEND'],
+        max_size=app.config['USER_CACHE_MAX_SIZE'],
+        url=app.config['USER_CACHE_REDIS_URL']
+    )
+    if user_cache:
+        user_repository = CachedUserRepository(
+            user_repository,
+            user_cache,
+            app.config['USER_CACHE_TTL'],
+            suggest_ttl=app.config['USER_SUGGEST_CACHE_TTL']
+        )
+    password_hasher = BoundedPasswordHasher(
+        max_workers=app.config['PASSWORD_HASH_WORKERS'],
+        max_queue=app.config['PASSWORD_HASH_QUEUE'],
+        timeout=app.config['PASSWORD_HASH_TIMEOUT'],
+        use_processes=app.config['PASSWORD_HASH_EXECUTOR'] == 'process'
+    )
+    auth_service = AuthService(user_repository, password_hasher)
     user_service = UserService(user_repository, auth_service)
-    task_service = TaskService(task_repository, user_repository)
+    
+    # Task changes are pushed to /tasks/events subscribers through the broker
+    event_broker = create_event_broker(
+        app.config['LIVE_EVENTS_BACKEND'],
+        url=app.config['LIVE_EVENTS_REDIS_URL'],
+        max_queue=app.config['LIVE_EVENTS_QUEUE_SIZE'],
+        max_subscribers=app.config['LIVE_EVENTS_MAX_SUBSCRIBERS'],
+        timeout=app.config['LIVE_EVENTS_REDIS_TIMEOUT'],
+        max_pending=app.config['LIVE_EVENTS_PUBLISH_QUEUE']
+    )
+    task_notifier = None
+    if event_broker:
+        task_notifier = TaskNotifier()
+        task_notifier.attach(TaskEventPublisher(event_broker, app.json.dumps))
+    task_service = TaskService(task_repository, user_repository, task_notifier)
+    # Server hooks end the open streams when a worker stops (see gunicorn.conf.py)
+    app.extensions['event_broker'] = event_broker
     
     # JWT configuration
     @jwt.user_identity_loader
@@ -43,8 +96,30 @@ def create_app():
     
     @jwt.user_lookup_loader
     def user_lookup_callback(_jwt_header, jwt_data):
-        identity = jwt_data["sub"]
-        return user_service.get_user_by_id(int(identity))
+        return user_service.get_token_user(TokenClaims(jwt_data, app.config['AUTH_CLAIMS_PRINCIPAL']))
+    
+    # Completion notifications are delivered from the outbox by a separate worker
+    outbox_processor = OutboxProcessor(
+        PostgreSQLOutboxRepository(),
+        task_repository,
+        user_repository,
+        batch_size=app.config['OUTBOX_BATCH_SIZE'],
+        lease_seconds=app.config['OUTBOX_LEASE_SECONDS'],
+        max_attempts=app.config['OUTBOX_MAX_ATTEMPTS'],
+        roster_ttl=app.config['TECH_LEAD_ROSTER_TTL'],
+        digest_window=app.config['NOTIFY_DIGEST_WINDOW'],
+        digest_max_tasks=app.config['NOTIFY_DIGEST_MAX_TASKS'],
+        max_pending=app.config['NOTIFY_QUEUE_SIZE']
+    )
+    
+    @app.cli.command('outbox-worker')
+    def outbox_worker_command():
+        """Deliver pending outbox events until interrupted."""
+        click.echo("Outbox worker started")
+        try:
+            outbox_processor.run(poll_interval=app.config['OUTBOX_POLL_INTERVAL'])
+        except KeyboardInterrupt:
+            click.echo("Outbox worker stopped")
     
     # Register error handlers
     register_error_handlers(app)
@@ -52,7 +127,7 @@ def create_app():
     # Initialize controllers
     AuthController(auth_service, user_service)
     UserController(user_service)
-    TaskController(task_service, user_service)
+    TaskController(task_service, user_service, event_broker)
     
     # Register blueprints
     app.register_blueprint(auth_blueprint)
@@ -0,0 +1,284 @@
+import logging
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Optional, Union
+from flask import Flask
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.config import config as jwt_config
+from jwt import InvalidTokenError
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route, Router
+
+from app.domain.entity import Principal, Role, User
+from app.application.auth_service import TokenClaims
+from app.application.service import AsyncUserService
+from app.application.task_service import AsyncTaskService
+from app.adapters.api.conditional import compute_etag, etag_matches
+from app.adapters.api.params import parse_page_args, parse_task_query, parse_user_page
+from app.adapters.api.serializers import serialize_task, serialize_user
+from app.adapters.api.streaming import NDJSON_MIMETYPE
+from app.adapters.api.task_controller import TaskController
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Request], Awaitable[Optional[Response]]]
+
+
+class _UseFallback(Exception):
+    """Raised by a native handler to let the Flask app answer the request instead."""
+
+
+class _Endpoint:
+    """ASGI app running a handler, or the fallback app when the handler returns None."""
+    
+    def __init__(self, handler: Handler, fallback):
+        self.handler = handler
+        self.fallback = fallback
+    
+    async def __call__(self, scope, receive, send):
+        request = Request(scope, receive)
+        response = await self.handler(request)
+        if response is None:
+            await self.fallback(scope, receive, send)
+        else:
+            await response(scope, receive, send)
+
+
+class AsyncApi:
+    """Native async handlers for the read endpoints most clients poll.
+    
+    GET /tasks, /tasks/{id}, /tasks/stats, /users and /users/{id} are
+    answered on the event loop through the async services, with the same
+    bodies, status codes and ETags as the Flask controllers. Every other
+    request (writes, streaming listings, SSE, CORS preflights, and reads
+    without a valid access token in the JWT header) is passed to the Flask
+    app, which runs on a thread pool.
+    """
+    
+    def __init__(
+        self,
+        flask_app: Flask,
+        task_service: AsyncTaskService,
+        user_service: AsyncUserService,
+        fallback
+    ):
+        self.flask_app = flask_app
+        self.task_service = task_service
+        self.user_service = user_service
+        self.fallback = fallback
+        self.encoder = type(flask_app.json).__name__
+        # orjson writes bytes directly; the standard provider returns text
+        self._dumps = getattr(flask_app.json, 'dumps_bytes', flask_app.json.dumps)
+    
+    def router(self, lifespan=None) -> Router:
+        """Router serving the native endpoints and handing everything else to the fallback app."""
+        routes = [
+            ('/tasks', self.get_tasks),
+            ('/tasks/stats', self.get_task_stats),
+            ('/tasks/{task_id:int}', self.get_task),
+            ('/users', self.get_users),
+            ('/users/{user_id:int}', self.get_user),
+        ]
+        # No methods on the routes: other methods must reach Flask instead of getting a 405
+        return Router(
+            [Route(path, _Endpoint(self._guarded(handler), self.fallback)) for path, handler in routes],
+            redirect_slashes=False,
+            default=self.fallback,
+            lifespan=lifespan
+        )
+    
+    def _guarded(self, handler: Callable[..., Awaitable[Response]]) -> Handler:
+        """Run a handler for GET requests only, turning errors into the API's JSON errors."""
+        async def guarded(request: Request) -> Optional[Response]:
+            if request.method != 'GET':
+                return None
+            try:
+                response = await handler(request, **request.path_params)
+            except _UseFallback:
+                return None
+            except ValueError as e:
+                response = self._json({"error": str(e)}, HTTPStatus.BAD_REQUEST)
+            except Exception:
+                logger.exception(f"Unhandled error in {request.method} {request.url.path}")
+                response = self._json({"error": "Internal server error"}, HTTPStatus.INTERNAL_SERVER_ERROR)
+            if response is not None:
+                self._cors(request, response)
+            return response
+        return guarded
+    
+    @staticmethod
+    def _cors(request: Request, response: Response):
+        # Same headers flask-cors sends for the allow-all, with-credentials setup
+        origin = request.headers.get('origin')
+        if origin:
+            response.headers['Access-Control-Allow-Origin'] = origin
+            response.headers['Access-Control-Allow-Credentials'] = 'true'
+            response.headers['Vary'] = 'Origin'
+    
+    def _json(self, data: Any, status: int = HTTPStatus.OK) -> Response:
+        return Response(self._dumps(data), status_code=status, media_type='application/json')
+    
+    def _etag(self, request: Request, version: str, *context) -> str:
+        # Flask's request.full_path, so both servers give the same tags
+        full_path = f"{request.url.path}?{request.scope['query_string'].decode('utf-8', 'replace')}"
+        return compute_etag(self.encoder, full_path, version, *context)
+    
+    def _conditional(self, request: Request, etag: str) -> Optional[Response]:
+        """A 304 response if the client already holds this representation, else None."""
+        if etag_matches(request.headers.get('if-none-match'), etag):
+            return self._tag(Response(status_code=HTTPStatus.NOT_MODIFIED), etag)
+        return None
+    
+    @staticmethod
+    def _tag(response: Response, etag: str) -> Response:
+        response.headers['ETag'] = f'"{etag}"'
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    
+    def _bearer_token(self, request: Request) -> Optional[str]:
+        """The access token in the app's JWT header, if that is where flask-jwt-extended looks first."""
+        with self.flask_app.app_context():
+            if jwt_config.token_location[0] != 'headers':
+                return None
+            header_name, header_type = jwt_config.header_name, jwt_config.header_type
+        
+        parts = request.headers.get(header_name, '').split()
+        if header_type:
+            return parts[1] if len(parts) == 2 and parts[0] == header_type else None
+        return parts[0] if len(parts) == 1 else None
+    
+    async def _authenticate(self, request: Request) -> Union[User, Principal, Response]:
+        """The requesting user, or the error response flask-jwt-extended would send.
+        
+        Only a valid access token in the JWT header is checked here. Requests
+        without one (other token locations, missing, expired or invalid tokens)
+        are handed to the Flask app, which answers them with its own rules.
+        """
+        token = self._bearer_token(request)
+        if token is None:
+            raise _UseFallback()
+        
+        try:
+            # Uses the Flask app's JWT settings (secret, algorithm, leeway)
+            with self.flask_app.app_context():
+                claims = decode_token(token)
+        except InvalidTokenError:
+            raise _UseFallback()
+        if claims.get('type') != 'access':
+            raise _UseFallback()
+        
+        token_claims = TokenClaims(claims, self.flask_app.config['AUTH_CLAIMS_PRINCIPAL'])
+        user = await self.user_service.get_token_user(token_claims)
+        if user is None:
+            return self._json({"msg": f"Error loading the user {token_claims.user_id}"}, HTTPStatus.UNAUTHORIZED)
+        return user
+    
+    async def get_tasks(self, request: Request) -> Optional[Response]:
+        """GET /tasks, except streamed listings which Flask serves."""
+        args = request.query_params
+        if args.get('stream') or NDJSON_MIMETYPE in request.headers.get('accept', ''):
+            return None
+        
+        current_user = await self._authenticate(request)
+        if isinstance(current_user, Response):
+            return current_user
+        
+        query = parse_task_query(args, TaskController.SEARCH_MAX_LENGTH)
+        # Validate every parameter before the probe, so a bad request never gets a 304
+        page_args = parse_page_args(args)
+        if page_args and page_args[1]:
+            self.task_service.check_page_cursor(page_args[1], query)
+        
+        version = await self.task_service.get_tasks_version(query, current_user)
+        etag = self._etag(request, version, current_user.role)
+        unchanged = self._conditional(request, etag)
+        if unchanged:
+            return unchanged
+        
+        if page_args:
+            limit, cursor = page_args
+            page = await self.task_service.get_tasks_page(
+                limit=limit,
+                cursor=cursor,
+                query=query,
+                requesting_user=current_user
+            )
+            return self._tag(self._json(page.to_dict(serialize_task)), etag)
+        
+        tasks = await self.task_service.get_tasks(query, requesting_user=current_user)
+        return self._tag(self._json([serialize_task(task) for task in tasks]), etag)
+    
+    async def get_task(self, request: Request, task_id: int) -> Response:
+        """GET /tasks/{id}."""
+        current_user = await self._authenticate(request)
+        if isinstance(current_user, Response):
+            return current_user
+        
+        version = await self.task_service.get_task_version(task_id, current_user)
+        etag = self._etag(request, version, current_user.role) if version else None
+        if etag:
+            unchanged = self._conditional(request, etag)
+            if unchanged:
+                return unchanged
+        
+        task = await self.task_service.get_task_by_id(task_id, current_user)
+        if not task:
+            return self._json({"error": f"Task with ID {task_id} not found"}, HTTPStatus.NOT_FOUND)
+        
+        response = self._json(serialize_task(task))
+        return self._tag(response, etag) if etag else response
+    
+    async def get_task_stats(self, request: Request) -> Response:
+        """GET /tasks/stats."""
+        current_user = await self._authenticate(request)
+        if isinstance(current_user, Response):
+            return current_user
+        
+        stats = await self.task_service.get_task_stats(requesting_user=current_user)
+        return self._json(stats.to_dict())
+    
+    async def get_users(self, request: Request) -> Response:
+        """GET /users."""
+        current_user = await self._authenticate(request)
+        if isinstance(current_user, Response):
+            return current_user
+        
+        args = request.query_params
+        role = None
+        if args.get('role'):
+            try:
+                role = Role(args['role'])
+            except ValueError:
+                raise ValueError(f"Invalid role. Valid options are: {[r.value for r in Role]}")
+        search_term = args.get('search')
+        page_args = parse_user_page(args)
+        
+        etag = self._etag(request, await self.user_service.get_users_version(role, search_term))
+        unchanged = self._conditional(request, etag)
+        if unchanged:
+            return unchanged
+        
+        if page_args:
+            limit, cursor = page_args
+            page = await self.user_service.get_users_page(
+                limit=limit,
+                cursor=cursor,
+                role=role,
+                search_term=search_term
+            )
+            return self._tag(self._json(page.to_dict(serialize_user)), etag)
+        
+        users = await self.user_service.get_all_users(role, search_term)
+        return self._tag(self._json([serialize_user(user) for user in users]), etag)
+    
+    async def get_user(self, request: Request, user_id: int) -> Response:
+        """GET /users/{id}."""
+        current_user = await self._authenticate(request)
+        if isinstance(current_user, Response):
+            return current_user
+        
+        user = await self.user_service.get_user_by_id(user_id)
+        if not user:
+            return self._json({"error": f"User with ID {user_id} not found"}, HTTPStatus.NOT_FOUND)
+        
+        return self._json(serialize_user(user))
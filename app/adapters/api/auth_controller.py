@@ -1,10 +1,11 @@
 from flask import Blueprint, jsonify, request
 from http import HTTPStatus
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_current_user
 
 from app.domain.entity import Role
 from app.application.auth_service import AuthService
 from app.application.service import UserService
+from app.adapters.api.serializers import serialize_user
 
 # Create blueprint
 auth_blueprint = Blueprint('auth', __name__, url_prefix='/auth')
@@ -21,6 +22,14 @@ class AuthController:
         """Register routes with the blueprint."""
         auth_blueprint.route('/login', methods=['POST'])(self.login)
         auth_blueprint.route('/refresh', methods=['POST'])(self.refresh)
+        auth_blueprint.route('/revoke', methods=['POST'])(self.revoke)
+    
+    def _access_claims(self, user):
+        """Claims embedded in access tokens so requests can authorize without loading the user."""
+        return {
+            "role": user.role.value if isinstance(user.role, Role) else user.role,
+            "ver": user.token_version
+        }
     
     def login(self):
         """Login endpoint."""
@@ -33,12 +42,15 @@ class AuthController:
             user = self.auth_service.authenticate(data['email'], data['password'])
             
             # Create tokens using user ID as identity
-            user_data = user.to_dict()
+            user_data = serialize_user(user)
             access_token = create_access_token(
                 identity=user.id,
-                additional_claims={"role": user.role.value if isinstance(user.role, Role) else user.role}
+                additional_claims=self._access_claims(user)
+            )
+            refresh_token = create_refresh_token(
+                identity=user.id,
+                additional_claims={"ver": user.token_version}
             )
-            refresh_token = create_refresh_token(identity=user.id)
             
             return jsonify({
                 "access_token": access_token,
@@ -52,13 +64,20 @@ class AuthController:
     def refresh(self):
         """Refresh token endpoint."""
         identity = get_jwt_identity()
-        user = self.user_service.get_user_by_id(int(identity))
+        user = get_current_user()
         if not user:
             return jsonify({"error": "User not found"}), HTTPStatus.NOT_FOUND
             
         access_token = create_access_token(
             identity=identity,
-            additional_claims={"role": user.role.value if isinstance(user.role, Role) else user.role}
+            additional_claims=self._access_claims(user)
         )
         
-        return jsonify({"access_token": access_token}) 
\ No newline at end of file
+        return jsonify({"access_token": access_token})
+    
+    @jwt_required()
+    def revoke(self):
+        """Revoke every token issued to the current user (log out everywhere)."""
+        identity = get_jwt_identity()
+        self.user_service.revoke_tokens(int(identity))
+        return "", HTTPStatus.NO_CONTENT 
\ No newline at end of file
@@ -0,0 +1,42 @@
+import hashlib
+from typing import Optional
+from flask import Response, current_app, request
+from werkzeug.http import parse_etags
+
+# Bump when the JSON representation of tasks or users changes shape
+REPRESENTATION_VERSION = 1
+
+
+def compute_etag(encoder: str, full_path: str, version: str, *context) -> str:
+    """Strong ETag for a response body produced by `encoder` for `full_path` from a data version."""
+    parts = [REPRESENTATION_VERSION, encoder, full_path, version, *context]
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def make_etag(version: str, *context) -> str:
+    """Strong ETag for the response to this request, given the data version it depends on.
+    
+    The request path and query string are part of the tag, so every
+    filter, page and cursor gets its own.
+    """
+    return compute_etag(type(current_app.json).__name__, request.full_path, version, *context)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value lists the ETag."""
+    return bool(if_none_match) and parse_etags(if_none_match).contains(etag)
+
+
+def not_modified(etag: str) -> Optional[Response]:
+    """A 304 response if the client already holds this representation, else None."""
+    if not request.if_none_match.contains(etag):
+        return None
+    
+    return tag(Response(status=304), etag)
+
+
+def tag(response: Response, etag: str) -> Response:
+    """Attach the ETag and ask clients to revalidate before reusing the response."""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
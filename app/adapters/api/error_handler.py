@@ -1,6 +1,8 @@
 from flask import Flask, jsonify
 from werkzeug.exceptions import BadRequest, NotFound
 from http import HTTPStatus
+from app.infrastructure.password_hasher import PasswordHasherBusyError
+from app.infrastructure.event_broker import SubscriberLimitError
 
 def register_error_handlers(app: Flask):
     """Register error handlers with the Flask app."""
@@ -17,6 +19,13 @@ def register_error_handlers(app: Flask):
     def handle_not_found(error):
         return jsonify({"error": "Resource not found"}), HTTPStatus.NOT_FOUND
     
+    @app.errorhandler(PasswordHasherBusyError)
+    @app.errorhandler(SubscriberLimitError)
+    def handle_busy(error):
+        response = jsonify({"error": str(error)})
+        response.headers['Retry-After'] = '1'
+        return response, HTTPStatus.SERVICE_UNAVAILABLE
+    
     @app.errorhandler(Exception)
     def handle_generic_error(error):
         return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR 
\ No newline at end of file
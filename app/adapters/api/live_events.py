@@ -0,0 +1,86 @@
+import json
+import logging
+from typing import Callable, List, Optional
+from flask import Response
+from app.domain.entity import TaskStatus
+from app.domain.observer import Observer, TaskEvent
+from app.adapters.api.serializers import serialize_task
+from app.infrastructure.event_broker import BrokerMessage, EventBroker, Subscription
+
+logger = logging.getLogger(__name__)
+
+EVENT_STREAM_MIMETYPE = 'text/event-stream'
+
+# Sent before closing the stream of a subscriber that fell too far behind,
+# or when the worker shuts down
+RESYNC_FRAME = 'event: resync\ndata: {}\n\n'
+# Comment line that keeps idle connections (and proxies) from timing out
+HEARTBEAT_FRAME = ': keepalive\n\n'
+
+
+def sse_frame(event: str, data: str) -> str:
+    """Format one Server-Sent Events frame; `data` is a single-line JSON document."""
+    return f'event: {event}\ndata: {data}\n\n'
+
+
+class TaskEventPublisher(Observer):
+    """Observer that publishes task events to live subscribers through the broker.
+
+    Each event is serialized once. Completed tasks are only sent to
+    subscribers allowed to see them; the others get a `task.removed` frame
+    so they drop the task, as the change feed does with tombstones.
+    Publishing never fails the write that caused the event.
+    """
+
+    def __init__(self, broker: EventBroker, dumps: Optional[Callable[[object], str]] = None):
+        self.broker = broker
+        self.dumps = dumps or json.dumps
+
+    def update(self, subject, *args, **kwargs):
+        event = kwargs.get('event')
+        if not isinstance(event, TaskEvent):
+            return
+
+        try:
+            self.broker.publish(self._message(event))
+        except Exception:
+            logger.exception(f"Publishing task event '{event.event_type}' failed")
+
+    def _message(self, event: TaskEvent) -> BrokerMessage:
+        task = event.task
+        data = {"type": event.event_type, "task": serialize_task(task)}
+        if event.user_id is not None:
+            data["user_id"] = event.user_id
+        frame = sse_frame(f'task.{event.event_type}', self.dumps(data))
+
+        if task.status != TaskStatus.COMPLETED:
+            return BrokerMessage(frame)
+
+        removed = sse_frame('task.removed', self.dumps({"type": "removed", "task_id": task.id}))
+        return BrokerMessage(frame, permission="view_all_completed_tasks", fallback=removed)
+
+
+def _frames(subscription: Subscription, heartbeat: float, batch: int):
+    try:
+        while not subscription.overflowed and not subscription.closed:
+            frames: List[str] = subscription.get(heartbeat, batch)
+            yield ''.join(frames) if frames else HEARTBEAT_FRAME
+        yield RESYNC_FRAME
+    finally:
+        subscription.close()
+
+
+def event_stream_response(subscription: Subscription, heartbeat: float = 15, batch: int = 50) -> Response:
+    """Stream a subscription's frames as text/event-stream until the client goes away.
+
+    Frames already queued are written together. The subscription is closed
+    when the client disconnects (noticed at the next write, at most
+    `heartbeat` seconds later), after it overflows, or when the broker
+    shuts its subscribers down.
+    """
+    # No request context is kept for the stream: frames are already encoded
+    response = Response(_frames(subscription, heartbeat, batch), mimetype=EVENT_STREAM_MIMETYPE)
+    response.headers['Cache-Control'] = 'no-cache'
+    # Keep reverse proxies such as nginx from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
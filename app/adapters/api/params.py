@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import Mapping, Optional, Tuple
+from app.domain.entity import TaskStatus, TaskPriority
+from app.application.pagination import decode_cursor, decode_user_cursor, parse_page_size
+from app.application.task_query import TaskQuery
+
+# Query parameter parsing shared by the Flask controllers and the ASGI routes.
+# `args` is any mapping of parameter names to string values.
+
+
+def parse_datetime_param(args: Mapping[str, str], name: str) -> Optional[datetime]:
+    """Parse an optional ISO datetime query parameter."""
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name} format. Use ISO format (YYYY-MM-DDTHH:MM:SS)")
+
+
+def parse_int_param(args: Mapping[str, str], name: str) -> Optional[int]:
+    """Parse an optional integer query parameter."""
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+
+
+def parse_task_query(args: Mapping[str, str], search_max_length: int) -> TaskQuery:
+    """Build a task query from the request's query parameters.
+    
+    `status` and `priority` accept comma-separated lists of values, and
+    `q` searches task titles and descriptions.
+    """
+    statuses = None
+    status_param = args.get('status')
+    if status_param:
+        try:
+            statuses = [TaskStatus(value.strip()) for value in status_param.split(',')]
+        except ValueError:
+            raise ValueError(f"Invalid status. Valid options are: {[s.value for s in TaskStatus]}")
+    
+    priorities = None
+    priority_param = args.get('priority')
+    if priority_param:
+        try:
+            priorities = [TaskPriority(value.strip()) for value in priority_param.split(',')]
+        except ValueError:
+            raise ValueError(f"Invalid priority. Valid options are: {[p.value for p in TaskPriority]}")
+    
+    # An exact due_date is a range of one instant
+    due_date = parse_datetime_param(args, 'due_date')
+    due_after = parse_datetime_param(args, 'due_after') or due_date
+    due_before = parse_datetime_param(args, 'due_before') or due_date
+    
+    search = args.get('q')
+    if search and len(search) > search_max_length:
+        raise ValueError(f"q must be at most {search_max_length} characters")
+    
+    return TaskQuery(
+        assignee_id=parse_int_param(args, 'user_id'),
+        creator_id=parse_int_param(args, 'creator_id'),
+        statuses=statuses,
+        priorities=priorities,
+        due_after=due_after,
+        due_before=due_before,
+        updated_since=parse_datetime_param(args, 'updated_since'),
+        search=search
+    )
+
+
+def parse_page_args(args: Mapping[str, str]) -> Optional[Tuple[int, Optional[str]]]:
+    """Validated page size and well-formed cursor when a page is asked for, None for a full listing."""
+    if 'limit' not in args and 'cursor' not in args:
+        return None
+    
+    cursor = args.get('cursor') or None
+    if cursor:
+        decode_cursor(cursor)
+    return parse_page_size(args.get('limit')), cursor
+
+
+def parse_user_page(args: Mapping[str, str]) -> Optional[Tuple[int, Optional[str]]]:
+    """Like parse_page_args, with the cursor checked against the user listing's order."""
+    page_args = parse_page_args(args)
+    if page_args and page_args[1]:
+        decode_user_cursor(page_args[1])
+    return page_args
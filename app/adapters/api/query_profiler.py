@@ -0,0 +1,133 @@
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+from flask import Flask, Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Literals and placeholders, so statements differing only in values share a shape
+_LITERALS = re.compile(r"'(?:[^']|'')*'|%\(\w+\)s|\$\d+|:\w+|\b\d+(?:\.\d+)?\b")
+# Expanded IN lists, whose length varies with the values
+_VALUE_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with its values and IN list lengths normalized away."""
+    shape = _LITERALS.sub('?', statement)
+    shape = _VALUE_LISTS.sub('(?)', shape)
+    return _SPACES.sub(' ', shape).strip()
+
+
+class QueryProfile:
+    """SQL statements run while serving one request."""
+
+    __slots__ = ('started', 'count', 'duration', 'shapes', 'shape_durations')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+        self.shape_durations: Dict[str, float] = {}
+
+    def record(self, statement: str, duration: float):
+        shape = statement_shape(statement)
+        self.count += 1
+        self.duration += duration
+        self.shapes[shape] += 1
+        self.shape_durations[shape] = self.shape_durations.get(shape, 0.0) + duration
+
+    def repeated(self, threshold: int) -> List[dict]:
+        """Statement shapes run at least `threshold` times, the usual sign of an N+1 pattern."""
+        return [
+            {"count": count, "ms": round(self.shape_durations[shape] * 1000, 3), "statement": shape}
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryProfiler:
+    """Opt-in per-request SQL profiling.
+
+    A sample of requests (`sample_rate`, from 0 to 1) gets a QueryProfile fed
+    by the engine's cursor events. When the response is ready it gets a
+    Server-Timing header with the database time and statement count, and
+    one JSON log line is written with the statement shapes run
+    `repeat_threshold` times or more (logged as a warning when there are
+    any). Statements run after the response is returned, such as those of
+    a streamed listing, are not counted.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        repeat_threshold: int = 5,
+        sampler: Callable[[], float] = random.random
+    ):
+        self.sample_rate = sample_rate
+        self.repeat_threshold = repeat_threshold
+        self.sampler = sampler
+
+    def init_app(self, app: Flask, engine: Engine):
+        """Profile the engine's statements during the app's sampled requests."""
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.listen(engine, 'handle_error', self._handle_error)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    @staticmethod
+    def _current() -> Optional[QueryProfile]:
+        return g.get('query_profile') if has_request_context() else None
+
+    def _start(self):
+        if self.sample_rate >= 1 or self.sampler() < self.sample_rate:
+            g.query_profile = QueryProfile()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current() is not None:
+            conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        profile = self._current()
+        started = conn.info.get('query_started')
+        if profile is not None and started:
+            profile.record(statement, time.perf_counter() - started.pop())
+
+    def _handle_error(self, exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get('query_started'):
+            connection.info['query_started'].pop()
+
+    def _finish(self, response: Response) -> Response:
+        profile: Optional[QueryProfile] = g.pop('query_profile', None)
+        if profile is None:
+            return response
+
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        db_ms = profile.duration * 1000
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={db_ms:.1f};desc="{profile.count} queries", app;dur={total_ms - db_ms:.1f}'
+        )
+
+        repeated = profile.repeated(self.repeat_threshold)
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "queries": profile.count,
+            "db_ms": round(db_ms, 3),
+            "total_ms": round(total_ms, 3),
+            "repeated": repeated,
+        }
+        logger.log(logging.WARNING if repeated else logging.INFO, "Query profile %s", json.dumps(record))
+        return response
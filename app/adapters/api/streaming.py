@@ -0,0 +1,53 @@
+from typing import Callable, Iterable, Optional
+from flask import Response, json, request, stream_with_context
+from app.adapters.api.serializers import serialize as default_serialize
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def requested_stream_format() -> Optional[str]:
+    """The streaming format asked for by the request, if any.
+    
+    `Accept: application/x-ndjson` or `?stream=ndjson` selects NDJSON, and
+    `?stream=json` (or `?stream=1`) a chunked JSON array.
+    """
+    stream = (request.args.get('stream') or '').lower()
+    if stream == 'ndjson' or request.accept_mimetypes.best == NDJSON_MIMETYPE:
+        return 'ndjson'
+    if stream in ('1', 'true', 'json'):
+        return 'json'
+    return None
+
+
+def _chunks(items: Iterable, serialize: Callable, batch: int):
+    """Serialize items one at a time and group them to keep writes few."""
+    buffer = []
+    for item in items:
+        buffer.append(json.dumps(serialize(item)))
+        if len(buffer) >= batch:
+            yield buffer
+            buffer = []
+    if buffer:
+        yield buffer
+
+
+def stream_response(items: Iterable, stream_format: str, serialize: Optional[Callable] = None, batch: int = 100) -> Response:
+    """Serialize items one at a time into a streamed NDJSON or JSON array response."""
+    serialize = serialize or default_serialize
+    
+    if stream_format == 'ndjson':
+        def generate():
+            for lines in _chunks(items, serialize, batch):
+                yield '\n'.join(lines) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+    
+    def generate():
+        yield '['
+        first = True
+        for lines in _chunks(items, serialize, batch):
+            yield ('' if first else ',') + ','.join(lines)
+            first = False
+        yield ']'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
@@ -1,11 +1,19 @@
 from datetime import datetime
-from flask import Blueprint, jsonify, request
+from typing import Optional
+from flask import Blueprint, current_app, jsonify, request
 from http import HTTPStatus
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, get_current_user
 
 from app.domain.entity import TaskStatus, TaskPriority, Role
-from app.application.task_service import TaskService
+from app.application.task_service import TaskService, TransitionOutcome
 from app.application.service import UserService
+from app.application.task_query import TaskQuery
+from app.adapters.api.streaming import requested_stream_format, stream_response
+from app.adapters.api.params import parse_int_param, parse_page_args, parse_task_query
+from app.adapters.api.serializers import serialize_task
+from app.adapters.api.conditional import make_etag, not_modified, tag
+from app.adapters.api.live_events import event_stream_response
+from app.infrastructure.event_broker import EventBroker
 
 # Create blueprint
 task_blueprint = Blueprint('tasks', __name__, url_prefix='/tasks')
@@ -13,15 +21,41 @@ task_blueprint = Blueprint('tasks', __name__, url_prefix='/tasks')
 class TaskController:
     """Controller for task endpoints."""
     
-    def __init__(self, task_service: TaskService, user_service: UserService):
+    # Maximum number of tasks accepted by a single bulk request
+    BULK_MAX_ITEMS = 500
+    # Maximum length of the q= search text
+    SEARCH_MAX_LENGTH = 200
+    # Changes returned per /tasks/changes request
+    CHANGES_DEFAULT_LIMIT = 500
+    CHANGES_MAX_LIMIT = 1000
+    # Per-task status reported by the bulk status and priority endpoints
+    TRANSITION_STATUSES = {
+        TransitionOutcome.UPDATED: HTTPStatus.OK,
+        TransitionOutcome.NOT_FOUND: HTTPStatus.NOT_FOUND,
+        TransitionOutcome.FORBIDDEN: HTTPStatus.FORBIDDEN,
+    }
+    
+    def __init__(
+        self,
+        task_service: TaskService,
+        user_service: UserService,
+        event_broker: Optional[EventBroker] = None
+    ):
         self.task_service = task_service
         self.user_service = user_service
+        self.event_broker = event_broker
         self._register_routes()
     
     def _register_routes(self):
         """Register routes with the blueprint."""
         task_blueprint.route('', methods=['POST'])(self.create_task)
+        task_blueprint.route('/bulk', methods=['POST'])(self.create_tasks_bulk)
+        task_blueprint.route('/bulk/status', methods=['PUT'])(self.update_tasks_status_bulk)
+        task_blueprint.route('/bulk/priority', methods=['PUT'])(self.update_tasks_priority_bulk)
         task_blueprint.route('', methods=['GET'])(self.get_tasks)
+        task_blueprint.route('/stats', methods=['GET'])(self.get_task_stats)
+        task_blueprint.route('/changes', methods=['GET'])(self.get_task_changes)
+        task_blueprint.route('/events', methods=['GET'])(self.get_task_events)
         task_blueprint.route('/<int:task_id>', methods=['GET'])(self.get_task)
         task_blueprint.route('/<int:task_id>', methods=['PUT'])(self.update_task)
         task_blueprint.route('/<int:task_id>/status', methods=['PUT'])(self.update_task_status)
@@ -31,18 +65,17 @@ class TaskController:
     
     def _get_current_user(self):
         """Get the current user from JWT."""
-        user_id = get_jwt_identity()
-        return self.user_service.get_user_by_id(int(user_id))
+        # Already loaded once for this request by the JWT user lookup loader
+        return get_current_user()
     
-    @jwt_required()
-    def create_task(self):
-        """Create task endpoint."""
-        current_user = self._get_current_user()
-        data = request.get_json()
+    def _parse_new_task(self, data):
+        """Validate a task creation payload and return create_task keyword arguments."""
+        if not isinstance(data, dict):
+            raise ValueError("Task payload must be an object")
         
         # Validate required fields
         if not all(key in data for key in ['title', 'description', 'priority']):
-            return jsonify({"error": "Title, description, and priority are required"}), HTTPStatus.BAD_REQUEST
+            raise ValueError("Title, description, and priority are required")
         
         # Validate and parse due date if provided
         due_date = None
@@ -50,33 +83,83 @@ class TaskController:
             try:
                 due_date = datetime.fromisoformat(data['due_date'])
             except ValueError:
-                return jsonify({"error": "Invalid due_date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)"}), HTTPStatus.BAD_REQUEST
+                raise ValueError("Invalid due_date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)")
         
         # Validate priority
         try:
             priority = TaskPriority(data['priority'])
         except ValueError:
-            return jsonify({
-                "error": f"Invalid priority. Valid options are: {[p.value for p in TaskPriority]}"
-            }), HTTPStatus.BAD_REQUEST
+            raise ValueError(f"Invalid priority. Valid options are: {[p.value for p in TaskPriority]}")
         
         # Get assigned users
         assigned_user_ids = data.get('assigned_user_ids', [])
         if not isinstance(assigned_user_ids, list):
-            return jsonify({"error": "assigned_user_ids must be a list"}), HTTPStatus.BAD_REQUEST
+            raise ValueError("assigned_user_ids must be a list")
+        
+        return {
+            'title': data['title'],
+            'description': data['description'],
+            'priority': priority,
+            'due_date': due_date,
+            'assigned_user_ids': assigned_user_ids
+        }
+    
+    @jwt_required()
+    def create_task(self):
+        """Create task endpoint."""
+        current_user = self._get_current_user()
+        data = request.get_json()
         
         try:
             task = self.task_service.create_task(
-                title=data['title'],
-                description=data['description'],
-                priority=priority,
-                due_date=due_date,
-                assigned_user_ids=assigned_user_ids,
-                creator_id=current_user.id
+                creator_id=current_user.id,
+                **self._parse_new_task(data)
             )
-            return jsonify(task.to_dict()), HTTPStatus.CREATED
+            return jsonify(serialize_task(task)), HTTPStatus.CREATED
+        except ValueError as e:
+            return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    
+    @jwt_required()
+    def create_tasks_bulk(self):
+        """Bulk create tasks endpoint."""
+        current_user = self._get_current_user()
+        data = request.get_json()
+        
+        items = data.get('tasks') if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "tasks must be a non-empty list"}), HTTPStatus.BAD_REQUEST
+        
+        if len(items) > self.BULK_MAX_ITEMS:
+            return jsonify({"error": f"At most {self.BULK_MAX_ITEMS} tasks can be created at once"}), HTTPStatus.BAD_REQUEST
+        
+        # Validate every payload first, keeping track of its position in the request
+        results = [None] * len(items)
+        valid_indexes = []
+        valid_items = []
+        for index, item in enumerate(items):
+            try:
+                valid_items.append(self._parse_new_task(item))
+                valid_indexes.append(index)
+            except ValueError as e:
+                results[index] = {"index": index, "status": HTTPStatus.BAD_REQUEST, "error": str(e)}
+        
+        try:
+            created = self.task_service.create_tasks_bulk(valid_items, current_user.id) if valid_items else []
         except ValueError as e:
             return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+        
+        for index, result in zip(valid_indexes, created):
+            if isinstance(result, ValueError):
+                results[index] = {"index": index, "status": HTTPStatus.BAD_REQUEST, "error": str(result)}
+            else:
+                results[index] = {"index": index, "status": HTTPStatus.CREATED, "task": serialize_task(result)}
+        
+        failed = sum(1 for result in results if result["status"] != HTTPStatus.CREATED)
+        return jsonify({
+            "created": len(results) - failed,
+            "failed": failed,
+            "results": results
+        }), HTTPStatus.CREATED if not failed else HTTPStatus.MULTI_STATUS
     
     @jwt_required()
     def update_task(self, task_id):
@@ -142,77 +225,128 @@ class TaskController:
         try:
             # Call service method to update task
             updated_task = self.task_service.update_task(task_id, updates, current_user)
-            return jsonify(updated_task.to_dict())
+            return jsonify(serialize_task(updated_task))
         except ValueError as e:
             return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
     
+    def _parse_int_param(self, name):
+        """Parse an optional integer query parameter."""
+        return parse_int_param(request.args, name)
+    
+    def _parse_task_query(self) -> TaskQuery:
+        """Build a task query from the request's query parameters."""
+        return parse_task_query(request.args, self.SEARCH_MAX_LENGTH)
+    
     @jwt_required()
     def get_tasks(self):
         """Get tasks endpoint."""
         current_user = self._get_current_user()
         
-        # Parse query parameters
-        status_param = request.args.get('status')
-        priority_param = request.args.get('priority')
-        user_id_param = request.args.get('user_id')
-        due_date_param = request.args.get('due_date')
+        try:
+            query = self._parse_task_query()
+            
+            # Stream large listings row by row instead of building the whole list
+            stream_format = requested_stream_format()
+            if stream_format:
+                tasks = self.task_service.iter_tasks(
+                    query,
+                    requesting_user=current_user,
+                    chunk_size=current_app.config['STREAM_CHUNK_SIZE']
+                )
+                return stream_response(tasks, stream_format, serialize_task)
+            
+            # Validate every parameter before the probe, so a bad request never gets a 304
+            page_args = parse_page_args(request.args)
+            if page_args and page_args[1]:
+                self.task_service.check_page_cursor(page_args[1], query)
+            
+            # Answer polling clients from a count/max probe when nothing changed
+            etag = make_etag(self.task_service.get_tasks_version(query, current_user), current_user.role)
+            unchanged = not_modified(etag)
+            if unchanged:
+                return unchanged
+            
+            # Paginate when the client asks for a page
+            if page_args:
+                limit, cursor = page_args
+                page = self.task_service.get_tasks_page(
+                    limit=limit,
+                    cursor=cursor,
+                    query=query,
+                    requesting_user=current_user
+                )
+                return tag(jsonify(page.to_dict(serialize_task)), etag)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
         
-        # Parse status if provided
-        status = None
-        if status_param:
-            try:
-                status = TaskStatus(status_param)
-            except ValueError:
-                return jsonify({
-                    "error": f"Invalid status. Valid options are: {[s.value for s in TaskStatus]}"
-                }), HTTPStatus.BAD_REQUEST
+        tasks = self.task_service.get_tasks(query, requesting_user=current_user)
         
-        # Parse priority if provided
-        priority = None
-        if priority_param:
-            try:
-                priority = TaskPriority(priority_param)
-            except ValueError:
-                return jsonify({
-                    "error": f"Invalid priority. Valid options are: {[p.value for p in TaskPriority]}"
-                }), HTTPStatus.BAD_REQUEST
+        return tag(jsonify([serialize_task(task) for task in tasks]), etag)
+    
+    @jwt_required()
+    def get_task_changes(self):
+        """Get the tasks created, updated or deleted since the `since` cursor."""
+        current_user = self._get_current_user()
         
-        # Parse user_id if provided
-        user_id = None
-        if user_id_param:
-            try:
-                user_id = int(user_id_param)
-            except ValueError:
-                return jsonify({"error": "user_id must be an integer"}), HTTPStatus.BAD_REQUEST
+        try:
+            limit = self._parse_int_param('limit') or self.CHANGES_DEFAULT_LIMIT
+            if limit < 1 or limit > self.CHANGES_MAX_LIMIT:
+                raise ValueError(f"limit must be between 1 and {self.CHANGES_MAX_LIMIT}")
+            
+            page = self.task_service.get_task_changes(
+                limit=limit,
+                cursor=request.args.get('since') or None,
+                requesting_user=current_user
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
         
-        # Parse due_date if provided
-        due_date = None
-        if due_date_param:
-            try:
-                due_date = datetime.fromisoformat(due_date_param)
-            except ValueError:
-                return jsonify({"error": "Invalid due_date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)"}), HTTPStatus.BAD_REQUEST
+        return jsonify(page.to_dict(serialize_task))
+    
+    # EventSource cannot send headers, so the token may also come as ?jwt=
+    @jwt_required(locations=['headers', 'query_string'])
+    def get_task_events(self):
+        """Stream task events as Server-Sent Events."""
+        if self.event_broker is None:
+            return jsonify({"error": "Live task events are disabled"}), HTTPStatus.NOT_FOUND
         
-        tasks = self.task_service.get_tasks(
-            status=status,
-            priority=priority,
-            user_id=user_id,
-            due_date=due_date,
-            requesting_user=current_user
+        current_user = self._get_current_user()
+        
+        # Raises SubscriberLimitError (503) when the server is at its subscriber limit
+        subscription = self.event_broker.subscribe(current_user.has_permission)
+        return event_stream_response(
+            subscription,
+            heartbeat=current_app.config['LIVE_EVENTS_HEARTBEAT']
         )
+    
+    @jwt_required()
+    def get_task_stats(self):
+        """Get task counts per status, priority and assignee."""
+        current_user = self._get_current_user()
         
-        return jsonify([task.to_dict() for task in tasks])
+        stats = self.task_service.get_task_stats(requesting_user=current_user)
+        
+        return jsonify(stats.to_dict())
     
     @jwt_required()
     def get_task(self, task_id):
         """Get task endpoint."""
         current_user = self._get_current_user()
         
+        # Hidden or missing tasks have no version and fall through to the 404 below
+        version = self.task_service.get_task_version(task_id, current_user)
+        etag = make_etag(version, current_user.role) if version else None
+        if etag:
+            unchanged = not_modified(etag)
+            if unchanged:
+                return unchanged
+        
         task = self.task_service.get_task_by_id(task_id, current_user)
         if not task:
             return jsonify({"error": f"Task with ID {task_id} not found"}), HTTPStatus.NOT_FOUND
         
-        return jsonify(task.to_dict())
+        response = jsonify(serialize_task(task))
+        return tag(response, etag) if etag else response
     
     @jwt_required()
     def update_task_status(self, task_id):
@@ -232,7 +366,7 @@ class TaskController:
         
         try:
             task = self.task_service.update_task_status(task_id, status, current_user)
-            return jsonify(task.to_dict())
+            return jsonify(serialize_task(task))
         except ValueError as e:
             return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
     
@@ -254,10 +388,77 @@ class TaskController:
         
         try:
             task = self.task_service.update_task_priority(task_id, priority, current_user)
-            return jsonify(task.to_dict())
+            return jsonify(serialize_task(task))
         except ValueError as e:
             return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
     
+    def _transition_tasks_bulk(self, data, status=None, priority=None):
+        """Apply a status or priority to every task listed in the request."""
+        task_ids = data.get('task_ids')
+        if not isinstance(task_ids, list) or not task_ids or not all(isinstance(task_id, int) for task_id in task_ids):
+            return jsonify({"error": "task_ids must be a non-empty list of integers"}), HTTPStatus.BAD_REQUEST
+        
+        if len(task_ids) > self.BULK_MAX_ITEMS:
+            return jsonify({"error": f"At most {self.BULK_MAX_ITEMS} tasks can be updated at once"}), HTTPStatus.BAD_REQUEST
+        
+        outcome = self.task_service.transition_tasks(
+            task_ids, self._get_current_user(), status=status, priority=priority
+        )
+        
+        results = []
+        for task_id, result in outcome.items():
+            entry = {"task_id": task_id, "status": self.TRANSITION_STATUSES[result.outcome]}
+            if result.error is not None:
+                entry["error"] = result.error
+            results.append(entry)
+        
+        failed = sum(1 for result in results if result["status"] != HTTPStatus.OK)
+        return jsonify({
+            "updated": len(results) - failed,
+            "failed": failed,
+            "results": results
+        }), HTTPStatus.OK if not failed else HTTPStatus.MULTI_STATUS
+    
+    @jwt_required()
+    def update_tasks_status_bulk(self):
+        """Bulk update task status endpoint."""
+        data = request.get_json()
+        
+        if not isinstance(data, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), HTTPStatus.BAD_REQUEST
+        
+        if 'status' not in data:
+            return jsonify({"error": "Status is required"}), HTTPStatus.BAD_REQUEST
+        
+        try:
+            status = TaskStatus(data['status'])
+        except ValueError:
+            return jsonify({
+                "error": f"Invalid status. Valid options are: {[s.value for s in TaskStatus]}"
+            }), HTTPStatus.BAD_REQUEST
+        
+        return self._transition_tasks_bulk(data, status=status)
+    
+    @jwt_required()
+    def update_tasks_priority_bulk(self):
+        """Bulk update task priority endpoint."""
+        data = request.get_json()
+        
+        if not isinstance(data, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), HTTPStatus.BAD_REQUEST
+        
+        if 'priority' not in data:
+            return jsonify({"error": "Priority is required"}), HTTPStatus.BAD_REQUEST
+        
+        try:
+            priority = TaskPriority(data['priority'])
+        except ValueError:
+            return jsonify({
+                "error": f"Invalid priority. Valid options are: {[p.value for p in TaskPriority]}"
+            }), HTTPStatus.BAD_REQUEST
+        
+        return self._transition_tasks_bulk(data, priority=priority)
+    
     @jwt_required()
     def assign_user(self, task_id, user_id):
         """Assign user to task endpoint."""
@@ -265,7 +466,7 @@ class TaskController:
         
         try:
             task = self.task_service.assign_user_to_task(task_id, user_id, current_user)
-            return jsonify(task.to_dict())
+            return jsonify(serialize_task(task))
         except ValueError as e:
             return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
     
@@ -276,6 +477,6 @@ class TaskController:
         
         try:
             task = self.task_service.unassign_user_from_task(task_id, user_id, current_user)
-            return jsonify(task.to_dict())
+            return jsonify(serialize_task(task))
         except ValueError as e:
             return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST 
\ No newline at end of file
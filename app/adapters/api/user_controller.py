@@ -4,6 +4,9 @@ from flask_jwt_extended import jwt_required
 
 from app.domain.entity import Role
 from app.application.service import UserService
+from app.adapters.api.serializers import serialize_user
+from app.adapters.api.params import parse_user_page
+from app.adapters.api.conditional import make_etag, not_modified, tag
 
 # Create blueprint
 user_blueprint = Blueprint('users', __name__, url_prefix='/users')
@@ -11,6 +14,10 @@ user_blueprint = Blueprint('users', __name__, url_prefix='/users')
 class UserController:
     """Controller for user endpoints."""
     
+    # Autocomplete returns at most this many suggestions
+    AUTOCOMPLETE_DEFAULT_LIMIT = 10
+    AUTOCOMPLETE_MAX_LIMIT = 25
+    
     def __init__(self, user_service: UserService):
         self.user_service = user_service
         self._register_routes()
@@ -19,6 +26,7 @@ class UserController:
         """Register routes with the blueprint."""
         user_blueprint.route('', methods=['POST'])(self.create_user)
         user_blueprint.route('', methods=['GET'])(self.get_users)
+        user_blueprint.route('/autocomplete', methods=['GET'])(self.autocomplete_users)
         user_blueprint.route('/<int:user_id>', methods=['GET'])(self.get_user)
         user_blueprint.route('/<int:user_id>', methods=['PUT'])(self.update_user)
     
@@ -45,7 +53,7 @@ class UserController:
                 role=role,
                 password=data['password']
             )
-            return jsonify(user.to_dict()), HTTPStatus.CREATED
+            return jsonify(serialize_user(user)), HTTPStatus.CREATED
         except ValueError as e:
             return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
     
@@ -79,7 +87,7 @@ class UserController:
                 email=email,
                 role=role
             )
-            return jsonify(user.to_dict()), HTTPStatus.OK
+            return jsonify(serialize_user(user)), HTTPStatus.OK
         except ValueError as e:
             return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
     
@@ -99,8 +107,57 @@ class UserController:
                     "error": f"Invalid role. Valid options are: {[r.value for r in Role]}"
                 }), HTTPStatus.BAD_REQUEST
         
+        # Validate the page before the probe, so a bad request never gets a 304
+        try:
+            page_args = parse_user_page(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+        
+        # Answer polling clients from a count/max probe when nothing changed
+        etag = make_etag(self.user_service.get_users_version(role, search_term))
+        unchanged = not_modified(etag)
+        if unchanged:
+            return unchanged
+        
+        # Paginate when the client asks for a page
+        if page_args:
+            limit, cursor = page_args
+            page = self.user_service.get_users_page(limit=limit, cursor=cursor, role=role, search_term=search_term)
+            return tag(jsonify(page.to_dict(serialize_user)), etag)
+        
         users = self.user_service.get_all_users(role, search_term)
-        return jsonify([user.to_dict() for user in users])
+        return tag(jsonify([serialize_user(user) for user in users]), etag)
+    
+    @jwt_required()
+    def autocomplete_users(self):
+        """Suggest users for a partially typed name or email."""
+        term = request.args.get('q', '')
+        
+        try:
+            limit = int(request.args.get('limit') or self.AUTOCOMPLETE_DEFAULT_LIMIT)
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), HTTPStatus.BAD_REQUEST
+        if limit < 1 or limit > self.AUTOCOMPLETE_MAX_LIMIT:
+            return jsonify({
+                "error": f"limit must be between 1 and {self.AUTOCOMPLETE_MAX_LIMIT}"
+            }), HTTPStatus.BAD_REQUEST
+        
+        role = None
+        role_param = request.args.get('role')
+        if role_param:
+            try:
+                role = Role(role_param)
+            except ValueError:
+                return jsonify({
+                    "error": f"Invalid role. Valid options are: {[r.value for r in Role]}"
+                }), HTTPStatus.BAD_REQUEST
+        
+        users = self.user_service.suggest_users(term, limit, role)
+        
+        response = jsonify([serialize_user(user) for user in users])
+        # Let the browser reuse results while the user retypes the same term
+        response.headers['Cache-Control'] = 'private, max-age=30'
+        return response
     
     @jwt_required()
     def get_user(self, user_id):
@@ -109,4 +166,4 @@ class UserController:
         if not user:
             return jsonify({"error": f"User with ID {user_id} not found"}), HTTPStatus.NOT_FOUND
         
-        return jsonify(user.to_dict()) 
\ No newline at end of file
+        return jsonify(serialize_user(user)) 
\ No newline at end of file
@@ -0,0 +1,170 @@
+from typing import List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import joinedload
+from app.application.ports import AsyncUserRepository, AsyncTaskRepository, TaskStats, TaskVersion
+from app.application.pagination import Page
+from app.application.task_query import TaskQuery
+from app.adapters.postgresql_repository import (
+    TaskModel, TaskStatements, TaskUserModel, UserModel, UserStatements, version_tag
+)
+from app.adapters.task_search import TaskSearch, create_task_search
+from app.domain.entity import User, Role, Task
+
+
+class AsyncPostgreSQLUserRepository(UserStatements, AsyncUserRepository):
+    """Async PostgreSQL implementation of the user read port.
+    
+    Runs the same statements as PostgreSQLUserRepository, each call in a
+    short session of its own.
+    """
+    
+    def __init__(self, session_factory: async_sessionmaker):
+        self.session_factory = session_factory
+    
+    async def get_all(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> List[User]:
+        """Get all users, optionally filtered by role and search term."""
+        statement = self._filter(select(UserModel), role, search_term)
+        
+        async with self.session_factory() as session:
+            user_models = (await session.execute(statement)).scalars().all()
+            return [user_model.to_entity() for user_model in user_models]
+    
+    async def get_list_version(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> str:
+        """Count and latest change of the matching users, read with one aggregate query."""
+        statement = self._filter(select(func.count(UserModel.id), func.max(UserModel.updated_at)), role, search_term)
+        
+        async with self.session_factory() as session:
+            count, last_updated = (await session.execute(statement)).one()
+            return version_tag(count, last_updated)
+    
+    async def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        role: Optional[Role] = None,
+        search_term: Optional[str] = None
+    ) -> Page[User]:
+        """Get one page of users ordered by ID, starting after the cursor."""
+        statement = self._filter(select(UserModel), role, search_term)
+        
+        if cursor:
+            statement = statement.where(self._after_id(cursor))
+        
+        # Fetch one extra row to know whether another page follows
+        statement = statement.order_by(UserModel.id.asc()).limit(limit + 1)
+        
+        async with self.session_factory() as session:
+            user_models = (await session.execute(statement)).scalars().all()
+            return self._to_page(user_models, limit)
+    
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        """Get a user by ID."""
+        async with self.session_factory() as session:
+            user_model = await session.get(UserModel, user_id)
+            return user_model.to_entity() if user_model else None
+    
+    async def get_token_version(self, user_id: int) -> Optional[int]:
+        """Get the current token version of a user without loading the row."""
+        async with self.session_factory() as session:
+            return (await session.execute(
+                select(UserModel.token_version).where(UserModel.id == user_id)
+            )).scalar()
+
+
+class AsyncPostgreSQLTaskRepository(TaskStatements, AsyncTaskRepository):
+    """Async PostgreSQL implementation of the task read port.
+    
+    Filters, keyset pagination and version probes are built by the same
+    TaskStatements as PostgreSQLTaskRepository. Assignees are always loaded
+    eagerly, since lazy loads cannot run under an event loop.
+    """
+    
+    def __init__(self, session_factory: async_sessionmaker, search: Optional[TaskSearch] = None):
+        self.session_factory = session_factory
+        self.search = search or create_task_search(
+            session_factory.kw['bind'].dialect.name,
+            [TaskModel.title, TaskModel.description]
+        )
+    
+    @staticmethod
+    def _select_tasks():
+        return select(TaskModel).options(
+            joinedload(TaskModel.assigned_users).joinedload(TaskUserModel.user)
+        )
+    
+    async def find(self, query: TaskQuery) -> List[Task]:
+        """Get all tasks matching a query specification, newest or most relevant first."""
+        if query.matches_nothing():
+            return []
+        
+        statement = self._ordered(self._select_tasks().where(*self._criteria(query)), query)
+        
+        async with self.session_factory() as session:
+            task_models = (await session.execute(statement)).unique().scalars().all()
+            return TaskModel.to_entities(task_models)
+    
+    async def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        query: Optional[TaskQuery] = None
+    ) -> Page[Task]:
+        """Get one page of tasks matching the query, starting after the cursor.
+        
+        Tasks come newest first, or most relevant first for a text search.
+        """
+        if query is not None and query.matches_nothing():
+            return Page([])
+        
+        statement = self._select_tasks()
+        if query is not None:
+            statement = statement.where(*self._criteria(query))
+        rank = self._rank(query)
+        
+        if cursor:
+            statement = statement.where(self._after_cursor(cursor, rank))
+        
+        statement = self._page_ordered(statement, rank).limit(limit + 1)
+        
+        async with self.session_factory() as session:
+            result = (await session.execute(statement)).unique()
+            rows = result.all() if rank is not None else result.scalars().all()
+            return self._to_page(rows, limit, rank)
+    
+    async def get_version(self, task_id: int) -> Optional[TaskVersion]:
+        """Read the update time of a task and its assignees with one aggregate query."""
+        async with self.session_factory() as session:
+            row = (await session.execute(self._version_statement(task_id))).first()
+        if row is None:
+            return None
+        
+        return TaskVersion(row[0], version_tag(row[1], row[2], row[3]))
+    
+    async def get_list_version(self, query: TaskQuery) -> str:
+        """Count and latest change of the matching tasks, plus the latest change of any user."""
+        if query.matches_nothing():
+            return version_tag(0, None, None)
+        
+        async with self.session_factory() as session:
+            count, last_updated = (await session.execute(self._list_version_statement(query))).one()
+            users_updated = (await session.execute(select(func.max(UserModel.updated_at)))).scalar()
+        return version_tag(count, last_updated, users_updated)
+    
+    async def get_stats(self) -> TaskStats:
+        """Read the counters kept by the task_stats triggers."""
+        counts, assignee_counts = self._stats_statements()
+        
+        async with self.session_factory() as session:
+            return self._to_stats(
+                (await session.execute(counts)).all(),
+                (await session.execute(assignee_counts)).all()
+            )
+    
+    async def get_by_id(self, task_id: int) -> Optional[Task]:
+        """Get a task by ID."""
+        async with self.session_factory() as session:
+            task_model = (await session.execute(
+                self._select_tasks().where(TaskModel.id == task_id)
+            )).unique().scalar_one_or_none()
+            return task_model.to_entity() if task_model else None
@@ -0,0 +1,169 @@
+import threading
+from typing import List, Optional
+from app.application.ports import UserRepository
+from app.application.pagination import Page
+from app.domain.entity import User, Role
+from app.infrastructure.cache import CacheBackend
+
+
+class CachedUserRepository(UserRepository):
+    """Read-through cache for user lookups by ID.
+
+    Wraps another UserRepository. Writes go to the wrapped repository first
+    and then refresh the cached entry, so readers never see a user older than
+    the last write made through this process (or any process, when the
+    backend is shared). Password hashes are never cached: cached users come
+    back without one, and logins read users by email from the wrapped
+    repository.
+    """
+
+    def __init__(self, repository: UserRepository, backend: CacheBackend, ttl: float = 60, suggest_ttl: float = 30):
+        self.repository = repository
+        self.backend = backend
+        self.ttl = ttl
+        # Autocomplete results are not invalidated on writes, so keep them briefly
+        self.suggest_ttl = suggest_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def _to_record(user: User) -> dict:
+        return {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "role": user.role.value if isinstance(user.role, Role) else user.role,
+            "token_version": user.token_version
+        }
+
+    @staticmethod
+    def _from_record(record: dict) -> User:
+        return User(
+            id=record["id"],
+            name=record["name"],
+            email=record["email"],
+            role=Role(record["role"]),
+            token_version=record.get("token_version", 0)
+        )
+
+    def _store(self, user: User):
+        self.backend.set(self._key(user.id), self._to_record(user), self.ttl)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": getattr(self.backend, "evictions", None)
+            }
+
+    def create(self, user: User) -> User:
+        """Create a user and cache it."""
+        created = self.repository.create(user)
+        self._store(created)
+        return created
+
+    def update(self, user: User) -> User:
+        """Update a user and replace its cached entry."""
+        self.backend.delete(self._key(user.id))
+        updated = self.repository.update(user)
+        self._store(updated)
+        return updated
+
+    def get_token_version(self, user_id: int) -> Optional[int]:
+        """Get the token version of a user, always from the database.
+        
+        Never cached: bump_token_version only drops the entry in this
+        process, and other workers must see a revocation on their next request.
+        """
+        return self.repository.get_token_version(user_id)
+
+    def bump_token_version(self, user_id: int) -> bool:
+        """Invalidate every token issued to a user and drop its cached entry."""
+        bumped = self.repository.bump_token_version(user_id)
+        self.backend.delete(self._key(user_id))
+        return bumped
+
+    def get_all(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> List[User]:
+        """Get all users, optionally filtered by role and search term."""
+        return self.repository.get_all(role, search_term)
+
+    def get_list_version(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> str:
+        """Get the version tag of a user listing."""
+        return self.repository.get_list_version(role, search_term)
+    
+    def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        role: Optional[Role] = None,
+        search_term: Optional[str] = None
+    ) -> Page[User]:
+        """Get one page of users ordered by ID, starting after the cursor."""
+        return self.repository.get_page(limit, cursor, role, search_term)
+
+    def suggest(self, term: str, limit: int, role: Optional[Role] = None) -> List[User]:
+        """Get autocomplete matches, from the cache when the same term was typed recently."""
+        role_key = role.value if role else ''
+        key = f"suggest:{role_key}:{limit}:{term.lower()}"
+        
+        cached = self.backend.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return [self._from_record(record) for record in cached["users"]]
+        
+        with self._lock:
+            self.misses += 1
+        
+        users = self.repository.suggest(term, limit, role)
+        self.backend.set(key, {"users": [self._to_record(user) for user in users]}, self.suggest_ttl)
+        return users
+    
+    def get_by_id(self, user_id: int) -> Optional[User]:
+        """Get a user by ID, from the cache when possible."""
+        record = self.backend.get(self._key(user_id))
+        if record is not None:
+            with self._lock:
+                self.hits += 1
+            return self._from_record(record)
+
+        with self._lock:
+            self.misses += 1
+
+        user = self.repository.get_by_id(user_id)
+        if user:
+            self._store(user)
+        return user
+
+    def get_by_ids(self, user_ids: List[int]) -> List[User]:
+        """Get users by ID, fetching every cache miss with one query."""
+        users = []
+        missing = []
+        for user_id in set(user_ids):
+            record = self.backend.get(self._key(user_id))
+            if record is not None:
+                users.append(self._from_record(record))
+            else:
+                missing.append(user_id)
+
+        with self._lock:
+            self.hits += len(users)
+            self.misses += len(missing)
+
+        for user in self.repository.get_by_ids(missing) if missing else []:
+            self._store(user)
+            users.append(user)
+        return users
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        """Get a user by email, with its password hash, always from the wrapped repository."""
+        return self.repository.get_by_email(email)
@@ -1,11 +1,75 @@
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-from sqlalchemy import and_, or_
-from sqlalchemy.orm import joinedload
-from app.application.ports import UserRepository, TaskRepository
+import logging
+from typing import List, Optional, Dict, Any, Set, Iterator
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, bindparam, func, update, delete, insert, select, exists, SmallInteger
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.orm import joinedload, selectinload
+from app.application.ports import (
+    UserRepository, TaskRepository, TaskAccess, TaskChange, TaskStats, TaskVersion, OutboxRepository, OutboxEvent
+)
+from app.application.pagination import Page, encode_cursor, decode_task_cursor, decode_user_cursor
+from app.application.task_query import TaskQuery
+from app.adapters.task_search import TaskSearch, create_task_search
+from app.adapters.user_search import UserSearch, create_user_search
 from app.domain.entity import User, Role, Task, TaskStatus, TaskPriority
 from app.infrastructure.database import db
 
+logger = logging.getLogger(__name__)
+
+# Compact codes stored for enum columns. The order is meaningful, so
+# priorities can be sorted and range-scanned. Never renumber an existing code.
+ORDINAL_CODES = {
+    Role: {
+        Role.DEVELOPER: 1,
+        Role.TECH_LEAD: 2,
+        Role.ADMIN: 3,
+    },
+    TaskStatus: {
+        TaskStatus.PENDING: 1,
+        TaskStatus.IN_PROGRESS: 2,
+        TaskStatus.BLOCKED: 3,
+        TaskStatus.IN_REVIEW: 4,
+        TaskStatus.COMPLETED: 5,
+    },
+    TaskPriority: {
+        TaskPriority.LOW: 1,
+        TaskPriority.MEDIUM: 2,
+        TaskPriority.HIGH: 3,
+        TaskPriority.URGENT: 4,
+    },
+}
+
+
+def version_tag(*parts) -> str:
+    """Join the values a representation depends on into an opaque version tag."""
+    return ':'.join(part.isoformat() if isinstance(part, datetime) else str(part) for part in parts)
+
+
+class OrdinalEnum(TypeDecorator):
+    """Stores a domain Enum as a SMALLINT code from ORDINAL_CODES."""
+    
+    impl = SmallInteger
+    cache_ok = True
+    
+    def __init__(self, enum_class):
+        super().__init__()
+        self.enum_class = enum_class
+        self._codes = ORDINAL_CODES[enum_class]
+        self._members = {code: member for member, code in self._codes.items()}
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        # Also accept the display label, e.g. "En Progreso"
+        return self._codes[self.enum_class(value)]
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._members[int(value)]
+
+
 class UserModel(db.Model):
     """SQLAlchemy model for users."""
     
@@ -14,8 +78,11 @@ class UserModel(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(255), nullable=False, unique=True)
-    role = db.Column(db.String(50), nullable=False)
+    role = db.Column(OrdinalEnum(Role), nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Bumped on every write, so cached responses embedding the user can be validated
+    updated_at = db.Column(db.DateTime, nullable=True, default=datetime.now, onupdate=datetime.now)
     
     # Relationship with tasks
     assigned_tasks = db.relationship('TaskUserModel', back_populates='user')
@@ -27,8 +94,9 @@ class UserModel(db.Model):
             id=entity.id,
             name=entity.name,
             email=entity.email,
-            role=entity.role.value if isinstance(entity.role, Role) else entity.role,
-            password_hash=entity.password_hash
+            role=entity.role,
+            password_hash=entity.password_hash,
+            token_version=entity.token_version
         )
     
     def to_entity(self) -> User:
@@ -37,8 +105,9 @@ class UserModel(db.Model):
             id=self.id,
             name=self.name,
             email=self.email,
-            role=Role(self.role) if self.role else Role.DEVELOPER,
-            password_hash=self.password_hash
+            role=self.role or Role.DEVELOPER,
+            password_hash=self.password_hash,
+            token_version=self.token_version or 0
         )
 
 
@@ -63,8 +132,8 @@ class TaskModel(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=True)
-    status = db.Column(db.String(50), nullable=False)
-    priority = db.Column(db.String(50), nullable=False)
+    status = db.Column(OrdinalEnum(TaskStatus), nullable=False)
+    priority = db.Column(OrdinalEnum(TaskPriority), nullable=False)
     created_at = db.Column(db.DateTime, nullable=False)
     updated_at = db.Column(db.DateTime, nullable=False)
     due_date = db.Column(db.DateTime, nullable=True)
@@ -80,39 +149,192 @@ class TaskModel(db.Model):
             id=entity.id,
             title=entity.title,
             description=entity.description,
-            status=entity.status.value if isinstance(entity.status, TaskStatus) else entity.status,
-            priority=entity.priority.value if isinstance(entity.priority, TaskPriority) else entity.priority,
+            status=entity.status,
+            priority=entity.priority,
             created_at=entity.created_at,
             updated_at=entity.updated_at,
             due_date=entity.due_date,
             creator_id=entity.creator_id
         )
     
-    def to_entity(self, include_users=True) -> Task:
-        """Convert model to entity."""
+    def to_entity(self, include_users=True, users: Optional[Dict[int, User]] = None) -> Task:
+        """Convert model to entity.
+        
+        `users` maps user IDs to entities already converted for the same
+        result, so an assignee shared by many tasks is only built once.
+        """
         # Get assigned users if needed
         assigned_users = []
         if include_users and self.assigned_users:
             for task_user in self.assigned_users:
-                assigned_users.append(task_user.user.to_entity())
+                user = users.get(task_user.user_id) if users is not None else None
+                if user is None:
+                    user = task_user.user.to_entity()
+                    if users is not None:
+                        users[task_user.user_id] = user
+                assigned_users.append(user)
         
         return Task(
             id=self.id,
             title=self.title,
             description=self.description,
-            status=TaskStatus(self.status) if self.status else TaskStatus.PENDING,
-            priority=TaskPriority(self.priority) if self.priority else TaskPriority.MEDIUM,
+            status=self.status or TaskStatus.PENDING,
+            priority=self.priority or TaskPriority.MEDIUM,
             created_at=self.created_at,
             updated_at=self.updated_at,
             due_date=self.due_date,
             assigned_users=assigned_users,
             creator_id=self.creator_id
         )
+    
+    @staticmethod
+    def to_entities(task_models) -> List[Task]:
+        """Convert a result set, sharing assignee entities between its tasks."""
+        users = {}
+        return [task_model.to_entity(users=users) for task_model in task_models]
+    
+    @classmethod
+    def entity_from_row(cls, row, assigned_users: List[User]) -> Task:
+        """Convert a raw `tasks` row (e.g. from RETURNING) to an entity."""
+        return Task(
+            id=row.id,
+            title=row.title,
+            description=row.description,
+            status=row.status or TaskStatus.PENDING,
+            priority=row.priority or TaskPriority.MEDIUM,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            due_date=row.due_date,
+            assigned_users=assigned_users,
+            creator_id=row.creator_id
+        )
+
+
+class TaskStatsModel(db.Model):
+    """Task count per status and priority, maintained by triggers (migration 0008)."""
+    
+    __tablename__ = 'task_stats'
+    
+    status = db.Column(OrdinalEnum(TaskStatus), primary_key=True)
+    priority = db.Column(OrdinalEnum(TaskPriority), primary_key=True)
+    task_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class TaskAssigneeStatsModel(db.Model):
+    """Count of tasks assigned to a user per status, maintained by triggers (migration 0008)."""
+    
+    __tablename__ = 'task_assignee_stats'
+    
+    user_id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(OrdinalEnum(TaskStatus), primary_key=True)
+    task_count = db.Column(db.Integer, nullable=False, default=0)
 
 
-class PostgreSQLUserRepository(UserRepository):
+class TaskChangeModel(db.Model):
+    """Latest change of each task; `seq` is NULL until the write is positioned after commit (migration 0010)."""
+    
+    __tablename__ = 'task_changes'
+    
+    task_id = db.Column(db.Integer, primary_key=True)
+    seq = db.Column(db.BigInteger, nullable=True, unique=True)
+    deleted = db.Column(db.Boolean, nullable=False, default=False)
+    changed_at = db.Column(db.DateTime, nullable=False)
+
+
+class TaskChangeSequenceModel(db.Model):
+    """Single row holding the last position handed out in the change feed."""
+    
+    __tablename__ = 'task_change_sequence'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    last_seq = db.Column(db.BigInteger, nullable=False)
+
+
+class OutboxEventModel(db.Model):
+    """SQLAlchemy model for events waiting to be delivered."""
+    
+    __tablename__ = 'outbox_events'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    event_type = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    # When the event may next be claimed; NULL once it has failed for good
+    available_at = db.Column(db.DateTime, nullable=True, default=datetime.now)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    
+    @classmethod
+    def from_entity(cls, entity: OutboxEvent) -> 'OutboxEventModel':
+        """Create a model from an entity."""
+        return cls(
+            event_type=entity.event_type,
+            payload=entity.payload,
+            created_at=entity.created_at,
+            available_at=entity.created_at,
+            attempts=entity.attempts
+        )
+    
+    def to_entity(self) -> OutboxEvent:
+        """Convert model to entity."""
+        return OutboxEvent(
+            id=self.id,
+            event_type=self.event_type,
+            payload=self.payload,
+            attempts=self.attempts,
+            created_at=self.created_at
+        )
+
+
+class UserStatements:
+    """User statement building shared by the synchronous and async repositories."""
+    
+    @staticmethod
+    def _filter(query, role: Optional[Role], search_term: Optional[str]):
+        """Apply the role and search term filters of user listings."""
+        if role:
+            query = query.filter(UserModel.role == role)
+        
+        if search_term:
+            search = f"%{search_term}%"
+            query = query.filter(
+                db.or_(
+                    UserModel.name.ilike(search),
+                    UserModel.email.ilike(search)
+                )
+            )
+        
+        return query
+    
+    @staticmethod
+    def _after_id(cursor: str):
+        """Predicate selecting the users that sort after a page cursor."""
+        return UserModel.id > decode_user_cursor(cursor)
+    
+    @staticmethod
+    def _to_page(user_models, limit: int) -> Page[User]:
+        """Build a page from `limit + 1` fetched user models."""
+        next_cursor = None
+        if len(user_models) > limit:
+            user_models = user_models[:limit]
+            next_cursor = encode_cursor([user_models[-1].id])
+        
+        return Page([user_model.to_entity() for user_model in user_models], next_cursor)
+
+
+class PostgreSQLUserRepository(UserStatements, UserRepository):
     """PostgreSQL implementation of user repository."""
     
+    def __init__(self, search: Optional[UserSearch] = None):
+        self._search = search
+    
+    @property
+    def search(self) -> UserSearch:
+        """Autocomplete strategy, chosen from the database dialect on first use."""
+        if self._search is None:
+            self._search = create_user_search(db.engine.dialect.name, UserModel.name, UserModel.email)
+        return self._search
+    
     def create(self, user: User) -> User:
         """Create a new user in the database."""
         user_model = UserModel.from_entity(user)
@@ -129,43 +351,238 @@ class PostgreSQLUserRepository(UserRepository):
         # Update fields
         user_model.name = user.name
         user_model.email = user.email
-        user_model.role = user.role.value if isinstance(user.role, Role) else user.role
+        user_model.role = user.role
+        # token_version is only changed by bump_token_version: the entity may be a stale copy
         
         db.session.commit()
         return user_model.to_entity()
     
+    def get_token_version(self, user_id: int) -> Optional[int]:
+        """Get the current token version of a user without loading the row."""
+        return db.session.query(UserModel.token_version).filter(UserModel.id == user_id).scalar()
+    
+    def bump_token_version(self, user_id: int) -> bool:
+        """Invalidate every token issued to a user."""
+        updated = UserModel.query.filter_by(id=user_id).update(
+            {UserModel.token_version: UserModel.token_version + 1}
+        )
+        db.session.commit()
+        return updated > 0
+    
     def get_all(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> List[User]:
         """Get all users, optionally filtered by role and search term."""
-        query = UserModel.query
+        query = self._filter(UserModel.query, role, search_term)
         
-        if role:
-            query = query.filter(UserModel.role == role.value)
+        return [user_model.to_entity() for user_model in query.all()]
+    
+    def get_list_version(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> str:
+        """Count and latest change of the matching users, read with one aggregate query."""
+        query = db.session.query(func.count(UserModel.id), func.max(UserModel.updated_at))
+        count, last_updated = self._filter(query, role, search_term).one()
+        return version_tag(count, last_updated)
+    
+    def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        role: Optional[Role] = None,
+        search_term: Optional[str] = None
+    ) -> Page[User]:
+        """Get one page of users ordered by ID, starting after the cursor."""
+        query = self._filter(UserModel.query, role, search_term)
         
-        if search_term:
-            search = f"%{search_term}%"
-            query = query.filter(
-                db.or_(
-                    UserModel.name.ilike(search),
-                    UserModel.email.ilike(search)
-                )
-            )
+        if cursor:
+            query = query.filter(self._after_id(cursor))
         
-        return [user_model.to_entity() for user_model in query.all()]
+        # Fetch one extra row to know whether another page follows
+        user_models = query.order_by(UserModel.id.asc()).limit(limit + 1).all()
+        return self._to_page(user_models, limit)
+    
+    def suggest(self, term: str, limit: int, role: Optional[Role] = None) -> List[User]:
+        """Get the top `limit` users matching a typed name or email, most relevant first."""
+        query = UserModel.query.filter(self.search.filter(term))
+        
+        if role:
+            query = query.filter(UserModel.role == role)
+        
+        user_models = query.order_by(*self.search.order_by(term), UserModel.id).limit(limit).all()
+        return [user_model.to_entity() for user_model in user_models]
     
     def get_by_id(self, user_id: int) -> Optional[User]:
         """Get a user by ID."""
         user_model = UserModel.query.get(user_id)
         return user_model.to_entity() if user_model else None
     
+    def get_by_ids(self, user_ids: List[int]) -> List[User]:
+        """Get every existing user among the given IDs with one query."""
+        if not user_ids:
+            return []
+        user_models = UserModel.query.filter(UserModel.id.in_(set(user_ids))).all()
+        return [user_model.to_entity() for user_model in user_models]
+    
     def get_by_email(self, email: str) -> Optional[User]:
         """Get a user by email."""
         user_model = UserModel.query.filter_by(email=email).first()
         return user_model.to_entity() if user_model else None
 
 
-class PostgreSQLTaskRepository(TaskRepository):
+class TaskStatements:
+    """Task statement building shared by the synchronous and async repositories.
+    
+    Subclasses provide the `search` strategy for their database dialect.
+    """
+    
+    search: TaskSearch
+    
+    def _criteria(self, spec: TaskQuery) -> list:
+        """Translate a TaskQuery into the WHERE clauses of a task statement."""
+        criteria = []
+        
+        if spec.task_ids is not None:
+            criteria.append(TaskModel.id.in_(spec.task_ids))
+        
+        if spec.assignee_id is not None:
+            criteria.append(TaskModel.assigned_users.any(TaskUserModel.user_id == spec.assignee_id))
+        
+        if spec.creator_id is not None:
+            criteria.append(TaskModel.creator_id == spec.creator_id)
+        
+        statuses = spec.effective_statuses()
+        if statuses is not None:
+            criteria.append(TaskModel.status.in_(statuses))
+        elif spec.exclude_statuses:
+            criteria.append(TaskModel.status.notin_(spec.exclude_statuses))
+        
+        if spec.priorities:
+            criteria.append(TaskModel.priority.in_(spec.priorities))
+        
+        if spec.due_after is not None:
+            criteria.append(TaskModel.due_date >= spec.due_after)
+        
+        if spec.due_before is not None:
+            criteria.append(TaskModel.due_date <= spec.due_before)
+        
+        if spec.updated_since is not None:
+            criteria.append(TaskModel.updated_at >= spec.updated_since)
+        
+        if spec.search:
+            criteria.append(self.search.filter(spec.search))
+        
+        return criteria
+    
+    def _rank(self, spec: Optional[TaskQuery]):
+        """Relevance expression for a text search, or None when results are not ranked."""
+        if spec is None or not spec.search:
+            return None
+        return self.search.rank(spec.search)
+    
+    def _ordered(self, statement, spec: TaskQuery):
+        """Apply the listing order: most relevant first for a text search, then newest first."""
+        rank = self._rank(spec)
+        if rank is not None:
+            statement = statement.order_by(rank.desc())
+        
+        return statement.order_by(TaskModel.created_at.desc(), TaskModel.id.desc())
+    
+    def check_cursor(self, cursor: str, query: Optional[TaskQuery] = None):
+        """Raise ValueError unless the cursor can continue a page of the query; reads nothing."""
+        self._after_cursor(cursor, self._rank(query))
+    
+    @staticmethod
+    def _after_cursor(cursor: str, rank):
+        """Keyset predicate selecting the rows that sort after a page cursor."""
+        values = decode_task_cursor(cursor, ranked=rank is not None)
+        last_created_at, last_id = values[-2:]
+        
+        # Keyset predicate for (created_at DESC, id DESC)
+        predicate = or_(
+            TaskModel.created_at < last_created_at,
+            and_(TaskModel.created_at == last_created_at, TaskModel.id < last_id)
+        )
+        if rank is not None:
+            # ... preceded by rank DESC
+            last_rank = values[0]
+            predicate = or_(rank < last_rank, and_(rank == last_rank, predicate))
+        return predicate
+    
+    @staticmethod
+    def _page_ordered(statement, rank):
+        """Order a page statement, selecting the rank alongside each task for a text search."""
+        if rank is not None:
+            statement = statement.add_columns(rank.label('rank')).order_by(rank.desc())
+        return statement.order_by(TaskModel.created_at.desc(), TaskModel.id.desc())
+    
+    @staticmethod
+    def _to_page(rows, limit: int, rank) -> Page[Task]:
+        """Build a page from `limit + 1` fetched rows (task models, or (model, rank) pairs)."""
+        if rank is not None:
+            task_models = [row[0] for row in rows]
+            ranks = [row[1] for row in rows]
+        else:
+            task_models = rows
+        
+        # The extra row only tells whether another page follows
+        next_cursor = None
+        if len(task_models) > limit:
+            task_models = task_models[:limit]
+            last = task_models[-1]
+            key = [last.created_at.isoformat(), last.id]
+            if rank is not None:
+                key.insert(0, ranks[limit - 1])
+            next_cursor = encode_cursor(key)
+        
+        return Page(TaskModel.to_entities(task_models), next_cursor)
+    
+    @staticmethod
+    def _version_statement(task_id: int):
+        """Status and update times of a task and its assignees, as one aggregate row."""
+        return (
+            select(TaskModel.status, TaskModel.updated_at, func.count(UserModel.id), func.max(UserModel.updated_at))
+            .select_from(TaskModel)
+            .outerjoin(TaskUserModel, TaskUserModel.task_id == TaskModel.id)
+            .outerjoin(UserModel, UserModel.id == TaskUserModel.user_id)
+            .where(TaskModel.id == task_id)
+            .group_by(TaskModel.id, TaskModel.status, TaskModel.updated_at)
+        )
+    
+    def _list_version_statement(self, spec: TaskQuery):
+        """Count and latest update time of the tasks matching a query."""
+        return select(func.count(TaskModel.id), func.max(TaskModel.updated_at)).where(*self._criteria(spec))
+    
+    @staticmethod
+    def _stats_statements():
+        """The non-zero task_stats and task_assignee_stats counters."""
+        return (
+            select(TaskStatsModel.status, TaskStatsModel.priority, TaskStatsModel.task_count)
+            .where(TaskStatsModel.task_count > 0),
+            select(TaskAssigneeStatsModel.user_id, TaskAssigneeStatsModel.status, TaskAssigneeStatsModel.task_count)
+            .where(TaskAssigneeStatsModel.task_count > 0)
+        )
+    
+    @staticmethod
+    def _to_stats(counts, assignee_counts) -> TaskStats:
+        return TaskStats(
+            {(row.status, row.priority): row.task_count for row in counts},
+            {(row.user_id, row.status): row.task_count for row in assignee_counts}
+        )
+
+
+class PostgreSQLTaskRepository(TaskStatements, TaskRepository):
     """PostgreSQL implementation of task repository."""
     
+    def __init__(self, search: Optional[TaskSearch] = None):
+        self._search = search
+    
+    @property
+    def search(self) -> TaskSearch:
+        """Text search strategy, chosen from the database dialect on first use."""
+        if self._search is None:
+            self._search = create_task_search(
+                db.engine.dialect.name,
+                [TaskModel.title, TaskModel.description]
+            )
+        return self._search
+    
     def create(self, task: Task) -> Task:
         """Create a new task in the database."""
         # Create the task model
@@ -179,7 +596,9 @@ class PostgreSQLTaskRepository(TaskRepository):
                 task_user = TaskUserModel(task_id=task_model.id, user_id=user.id)
                 db.session.add(task_user)
         
+        self._record_changes([task_model.id])
         db.session.commit()
+        self._position_changes()
         
         # Recargar el modelo para asegurar que incluya los usuarios actualizados
         refreshed_model = TaskModel.query.options(
@@ -188,6 +607,54 @@ class PostgreSQLTaskRepository(TaskRepository):
         
         return refreshed_model.to_entity()
     
+    def create_many(self, tasks: List[Task]) -> List[Task]:
+        """Create several tasks and their assignments in one transaction.
+        
+        Tasks are written with a single multi-row INSERT ... RETURNING and the
+        assignments with one batched INSERT, without reloading anything.
+        """
+        if not tasks:
+            return []
+        
+        rows = [
+            {
+                'title': task.title,
+                'description': task.description,
+                'status': task.status,
+                'priority': task.priority,
+                'created_at': task.created_at,
+                'updated_at': task.updated_at,
+                'due_date': task.due_date,
+                'creator_id': task.creator_id,
+            }
+            for task in tasks
+        ]
+        
+        try:
+            task_ids = db.session.execute(
+                insert(TaskModel).returning(TaskModel.id, sort_by_parameter_order=True),
+                rows
+            ).scalars().all()
+            
+            assignments = [
+                {'task_id': task_id, 'user_id': user.id}
+                for task_id, task in zip(task_ids, tasks)
+                for user in {user.id: user for user in task.assigned_users}.values()
+            ]
+            if assignments:
+                db.session.execute(insert(TaskUserModel), assignments)
+            
+            self._record_changes(task_ids)
+            db.session.commit()
+            self._position_changes()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        for task_id, task in zip(task_ids, tasks):
+            task.id = task_id
+        return tasks
+    
     def get_all(self, filters: Optional[Dict[str, Any]] = None) -> List[Task]:
         """Get all tasks, optionally filtered."""
         query = TaskModel.query.options(
@@ -199,7 +666,156 @@ class PostgreSQLTaskRepository(TaskRepository):
                 if hasattr(TaskModel, key):
                     query = query.filter(getattr(TaskModel, key) == value)
         
-        return [task_model.to_entity() for task_model in query.all()]
+        return TaskModel.to_entities(query.all())
+    
+    def _build_query(self, spec: Optional[TaskQuery] = None, eager_load=joinedload):
+        """Translate a TaskQuery into a single SQLAlchemy query.
+        
+        `eager_load` loads the assignees with the tasks; None leaves them out.
+        """
+        query = TaskModel.query
+        if eager_load is not None:
+            query = query.options(eager_load(TaskModel.assigned_users).joinedload(TaskUserModel.user))
+        
+        if spec is None:
+            return query
+        
+        return query.filter(*self._criteria(spec))
+    
+    def find(self, query: TaskQuery) -> List[Task]:
+        """Get all tasks matching a query specification, newest or most relevant first."""
+        if query.matches_nothing():
+            return []
+        
+        task_models = self._ordered(self._build_query(query), query).all()
+        
+        return TaskModel.to_entities(task_models)
+    
+    def iter_tasks(self, query: TaskQuery, chunk_size: int = 500) -> Iterator[Task]:
+        """Stream the tasks matching a query from a server-side cursor.
+        
+        Rows are fetched `chunk_size` at a time and assignees are loaded
+        with one extra query per chunk, so memory does not grow with the
+        size of the result.
+        """
+        if query.matches_nothing():
+            return
+        
+        # Joined eager loading of a collection cannot be combined with yield_per
+        statement = self._ordered(self._build_query(query, eager_load=selectinload), query).statement
+        
+        result = db.session.execute(statement, execution_options={'yield_per': chunk_size})
+        users = {}
+        for task_model in result.scalars():
+            yield task_model.to_entity(users=users)
+    
+    def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        query: Optional[TaskQuery] = None
+    ) -> Page[Task]:
+        """Get one page of tasks matching the query, starting after the cursor.
+        
+        Tasks come newest first, or most relevant first for a text search.
+        """
+        if query is not None and query.matches_nothing():
+            return Page([])
+        
+        statement = self._build_query(query)
+        rank = self._rank(query)
+        
+        if cursor:
+            statement = statement.filter(self._after_cursor(cursor, rank))
+        
+        rows = self._page_ordered(statement, rank).limit(limit + 1).all()
+        return self._to_page(rows, limit, rank)
+    
+    def get_version(self, task_id: int) -> Optional[TaskVersion]:
+        """Read the update time of a task and its assignees with one aggregate query."""
+        row = db.session.execute(self._version_statement(task_id)).first()
+        if row is None:
+            return None
+        
+        return TaskVersion(row[0], version_tag(row[1], row[2], row[3]))
+    
+    def get_list_version(self, query: TaskQuery) -> str:
+        """Count and latest change of the matching tasks, plus the latest change of any user.
+        
+        Every write to a task, including assignment changes, moves its
+        updated_at forward, and deleting a task changes the count.
+        """
+        if query.matches_nothing():
+            return version_tag(0, None, None)
+        
+        count, last_updated = db.session.execute(self._list_version_statement(query)).one()
+        users_updated = db.session.query(func.max(UserModel.updated_at)).scalar()
+        return version_tag(count, last_updated, users_updated)
+    
+    def _position_changes(self):
+        """Give every committed pending change the next feed positions, in a short transaction of its own.
+        
+        Writers call this after they commit, so the lock on the sequence row
+        is held only while positions are handed out, never for the length of
+        a write. Positions are handed out one step at a time under that lock,
+        so a change committed late still lands after every position a client
+        may already have read past. A step that fails leaves its changes
+        pending for the next write's step instead of failing the write.
+        """
+        pending = select(TaskChangeModel.task_id).where(TaskChangeModel.seq.is_(None))
+        if not db.session.execute(select(pending.exists())).scalar():
+            return
+        
+        try:
+            last_seq = db.session.execute(
+                select(TaskChangeSequenceModel.last_seq)
+                .where(TaskChangeSequenceModel.id == 1)
+                .with_for_update()
+            ).scalar_one()
+            task_ids = db.session.execute(
+                pending.order_by(TaskChangeModel.changed_at, TaskChangeModel.task_id)
+            ).scalars().all()
+            
+            if task_ids:
+                changes = TaskChangeModel.__table__
+                db.session.execute(
+                    update(changes)
+                    .where(changes.c.task_id == bindparam('change_task_id'), changes.c.seq.is_(None))
+                    .values(seq=bindparam('change_seq')),
+                    [
+                        {'change_task_id': task_id, 'change_seq': last_seq + position}
+                        for position, task_id in enumerate(task_ids, 1)
+                    ]
+                )
+                db.session.execute(
+                    update(TaskChangeSequenceModel)
+                    .where(TaskChangeSequenceModel.id == 1)
+                    .values(last_seq=last_seq + len(task_ids))
+                )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception("Could not position the pending task changes; the next write will retry")
+    
+    def get_changes(self, after: int, limit: int) -> List[TaskChange]:
+        """Get the latest change of each task positioned after `after`, from the seq index."""
+        rows = db.session.execute(
+            select(TaskChangeModel.task_id, TaskChangeModel.seq, TaskChangeModel.deleted)
+            .where(TaskChangeModel.seq > after)
+            .order_by(TaskChangeModel.seq)
+            .limit(limit)
+        ).all()
+        
+        return [TaskChange(row.task_id, row.seq, row.deleted) for row in rows]
+    
+    def get_stats(self) -> TaskStats:
+        """Read the counters kept by the task_stats triggers.
+        
+        At most one row per status and priority, and one per assignee and
+        status, is read however many tasks there are.
+        """
+        counts, assignee_counts = self._stats_statements()
+        return self._to_stats(db.session.execute(counts).all(), db.session.execute(assignee_counts).all())
     
     def get_by_id(self, task_id: int) -> Optional[Task]:
         """Get a task by ID."""
@@ -219,8 +835,8 @@ class PostgreSQLTaskRepository(TaskRepository):
         # Update task fields
         task_model.title = task.title
         task_model.description = task.description
-        task_model.status = task.status.value if isinstance(task.status, TaskStatus) else task.status
-        task_model.priority = task.priority.value if isinstance(task.priority, TaskPriority) else task.priority
+        task_model.status = task.status
+        task_model.priority = task.priority
         task_model.updated_at = task.updated_at
         task_model.due_date = task.due_date
         
@@ -234,7 +850,9 @@ class PostgreSQLTaskRepository(TaskRepository):
                 task_user = TaskUserModel(task_id=task.id, user_id=user.id)
                 db.session.add(task_user)
         
+        self._record_changes([task.id])
         db.session.commit()
+        self._position_changes()
         
         # Recargar el modelo para asegurar que incluya los usuarios actualizados
         refreshed_model = TaskModel.query.options(
@@ -243,6 +861,173 @@ class PostgreSQLTaskRepository(TaskRepository):
         
         return refreshed_model.to_entity()
     
+    # Columns that apply_changes is allowed to write
+    UPDATABLE_COLUMNS = {'title', 'description', 'status', 'priority', 'due_date', 'updated_at'}
+    
+    def apply_changes(
+        self,
+        task_id: int,
+        changes: Dict[str, Any],
+        assign_user_ids: Optional[Set[int]] = None,
+        unassign_user_ids: Optional[Set[int]] = None,
+        events: Optional[List[OutboxEvent]] = None
+    ) -> Task:
+        """Write only the given column changes and assignment diff in one transaction.
+        
+        The task row comes back through UPDATE ... RETURNING, assignments are
+        changed with one DELETE and one INSERT ... SELECT, and the assignees
+        are read back with a single query before committing. `events` are
+        added to the outbox before that same commit.
+        """
+        values = self._column_values(changes)
+        
+        try:
+            row = db.session.execute(
+                update(TaskModel)
+                .where(TaskModel.id == task_id)
+                .values(**values)
+                .returning(*TaskModel.__table__.columns)
+                .execution_options(synchronize_session=False)
+            ).first()
+            if row is None:
+                raise ValueError(f"Task with ID {task_id} not found")
+            
+            if unassign_user_ids:
+                db.session.execute(
+                    delete(TaskUserModel)
+                    .where(TaskUserModel.task_id == task_id, TaskUserModel.user_id.in_(unassign_user_ids))
+                    .execution_options(synchronize_session=False)
+                )
+            
+            if assign_user_ids:
+                # Only existing users that are not assigned yet are inserted
+                db.session.execute(
+                    insert(TaskUserModel).from_select(
+                        ['task_id', 'user_id'],
+                        select(db.literal(task_id), UserModel.id).where(
+                            UserModel.id.in_(assign_user_ids),
+                            ~exists().where(
+                                TaskUserModel.task_id == task_id,
+                                TaskUserModel.user_id == UserModel.id
+                            )
+                        )
+                    )
+                )
+            
+            user_models = db.session.execute(
+                select(UserModel)
+                .join(TaskUserModel, TaskUserModel.user_id == UserModel.id)
+                .where(TaskUserModel.task_id == task_id)
+                .order_by(UserModel.id)
+            ).scalars().all()
+            
+            missing = set(assign_user_ids or ()) - {user_model.id for user_model in user_models}
+            if missing:
+                raise ValueError(f"User with ID {min(missing)} not found")
+            
+            # Convert before committing, which expires the loaded models
+            assigned_users = [user_model.to_entity() for user_model in user_models]
+            self._record_changes([task_id])
+            self._add_events(events)
+            db.session.commit()
+            self._position_changes()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        return TaskModel.entity_from_row(row, assigned_users)
+    
+    @staticmethod
+    def _add_events(events: Optional[List[OutboxEvent]]):
+        """Stage outbox events in the current transaction."""
+        for event in events or []:
+            db.session.add(OutboxEventModel.from_entity(event))
+    
+    @staticmethod
+    def _record_changes(task_ids: List[int], deleted: bool = False):
+        """Mark tasks as changed in the current transaction.
+        
+        The change is left without a feed position; the caller runs
+        _position_changes once it has committed.
+        """
+        if not task_ids:
+            return
+        
+        now = datetime.now()
+        rows = [
+            {'task_id': task_id, 'seq': None, 'deleted': deleted, 'changed_at': now}
+            for task_id in set(task_ids)
+        ]
+        
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            upsert = (postgresql if dialect == 'postgresql' else sqlite).insert(TaskChangeModel)
+            db.session.execute(upsert.values(rows).on_conflict_do_update(
+                index_elements=[TaskChangeModel.task_id],
+                set_={'seq': None, 'deleted': deleted, 'changed_at': now}
+            ))
+        else:
+            db.session.execute(delete(TaskChangeModel).where(TaskChangeModel.task_id.in_([row['task_id'] for row in rows])))
+            db.session.execute(insert(TaskChangeModel), rows)
+    
+    def _column_values(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate column changes and fill in the update timestamp."""
+        unknown = set(changes) - self.UPDATABLE_COLUMNS
+        if unknown:
+            raise ValueError(f"Cannot update task fields: {sorted(unknown)}")
+        
+        values = dict(changes)
+        values.setdefault('updated_at', datetime.now())
+        return values
+    
+    def get_access(self, task_ids: List[int], user_id: int) -> Dict[int, TaskAccess]:
+        """Get access facts for every existing task among the IDs with one query."""
+        if not task_ids:
+            return {}
+        
+        is_assigned = exists().where(
+            TaskUserModel.task_id == TaskModel.id,
+            TaskUserModel.user_id == user_id
+        ).label('is_assigned')
+        rows = db.session.execute(
+            select(TaskModel.id, TaskModel.creator_id, TaskModel.status, is_assigned)
+            .where(TaskModel.id.in_(set(task_ids)))
+        ).all()
+        
+        return {
+            row.id: TaskAccess(row.id, row.creator_id, row.status, bool(row.is_assigned))
+            for row in rows
+        }
+    
+    def apply_changes_many(
+        self,
+        task_ids: List[int],
+        changes: Dict[str, Any],
+        events: Optional[List[OutboxEvent]] = None
+    ) -> List[int]:
+        """Write the same column changes to many tasks with one UPDATE ... RETURNING their IDs."""
+        if not task_ids:
+            return []
+        
+        values = self._column_values(changes)
+        try:
+            updated_ids = db.session.execute(
+                update(TaskModel)
+                .where(TaskModel.id.in_(set(task_ids)))
+                .values(**values)
+                .returning(TaskModel.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            self._record_changes(updated_ids)
+            self._add_events(events)
+            db.session.commit()
+            self._position_changes()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        return updated_ids
+    
     def delete(self, task_id: int) -> bool:
         """Delete a task from the database."""
         task_model = TaskModel.query.get(task_id)
@@ -250,7 +1035,9 @@ class PostgreSQLTaskRepository(TaskRepository):
             return False
         
         db.session.delete(task_model)
+        self._record_changes([task_id], deleted=True)
         db.session.commit()
+        self._position_changes()
         return True
     
     def get_by_user_id(self, user_id: int, filters: Optional[Dict[str, Any]] = None) -> List[Task]:
@@ -267,14 +1054,14 @@ class PostgreSQLTaskRepository(TaskRepository):
                 if hasattr(TaskModel, key):
                     query = query.filter(getattr(TaskModel, key) == value)
         
-        return [task_model.to_entity() for task_model in query.all()]
+        return TaskModel.to_entities(query.all())
     
     def get_by_status(self, status: TaskStatus, filters: Optional[Dict[str, Any]] = None) -> List[Task]:
         """Get all tasks with a specific status, optionally filtered."""
         query = TaskModel.query.options(
             joinedload(TaskModel.assigned_users).joinedload(TaskUserModel.user)
         ).filter_by(
-            status=status.value if isinstance(status, TaskStatus) else status
+            status=status
         )
         
         if filters:
@@ -282,14 +1069,14 @@ class PostgreSQLTaskRepository(TaskRepository):
                 if hasattr(TaskModel, key):
                     query = query.filter(getattr(TaskModel, key) == value)
         
-        return [task_model.to_entity() for task_model in query.all()]
+        return TaskModel.to_entities(query.all())
     
     def get_by_priority(self, priority: TaskPriority, filters: Optional[Dict[str, Any]] = None) -> List[Task]:
         """Get all tasks with a specific priority, optionally filtered."""
         query = TaskModel.query.options(
             joinedload(TaskModel.assigned_users).joinedload(TaskUserModel.user)
         ).filter_by(
-            priority=priority.value if isinstance(priority, TaskPriority) else priority
+            priority=priority
         )
         
         if filters:
@@ -297,7 +1084,7 @@ class PostgreSQLTaskRepository(TaskRepository):
                 if hasattr(TaskModel, key):
                     query = query.filter(getattr(TaskModel, key) == value)
         
-        return [task_model.to_entity() for task_model in query.all()]
+        return TaskModel.to_entities(query.all())
     
     def get_by_due_date(self, due_date: datetime, filters: Optional[Dict[str, Any]] = None) -> List[Task]:
         """Get all tasks with a specific due date, optionally filtered."""
@@ -310,7 +1097,7 @@ class PostgreSQLTaskRepository(TaskRepository):
                 if hasattr(TaskModel, key):
                     query = query.filter(getattr(TaskModel, key) == value)
         
-        return [task_model.to_entity() for task_model in query.all()]
+        return TaskModel.to_entities(query.all())
     
     def assign_user(self, task_id: int, user_id: int) -> Task:
         """Assign a user to a task."""
@@ -329,7 +1116,10 @@ class PostgreSQLTaskRepository(TaskRepository):
         if not existing:
             task_user = TaskUserModel(task_id=task_id, user_id=user_id)
             db.session.add(task_user)
+            task_model.updated_at = datetime.now()
+            self._record_changes([task_id])
             db.session.commit()
+            self._position_changes()
         
         # Recarga el modelo para incluir los usuarios actualizados
         refreshed_task = TaskModel.query.options(
@@ -346,12 +1136,65 @@ class PostgreSQLTaskRepository(TaskRepository):
             raise ValueError(f"Task with ID {task_id} not found")
         
         # Delete the assignment if it exists
-        TaskUserModel.query.filter_by(task_id=task_id, user_id=user_id).delete()
+        if TaskUserModel.query.filter_by(task_id=task_id, user_id=user_id).delete():
+            task_model.updated_at = datetime.now()
+            self._record_changes([task_id])
         db.session.commit()
+        self._position_changes()
         
         # Recarga el modelo para incluir los usuarios actualizados
         refreshed_task = TaskModel.query.options(
             joinedload(TaskModel.assigned_users).joinedload(TaskUserModel.user)
         ).get(task_id)
         
-        return refreshed_task.to_entity() 
\ No newline at end of file
+        return refreshed_task.to_entity()
+
+
+class PostgreSQLOutboxRepository(OutboxRepository):
+    """PostgreSQL implementation of outbox repository."""
+    
+    def claim_batch(self, limit: int, lease_seconds: float) -> List[OutboxEvent]:
+        """Claim due events in ID order, skipping rows locked by other workers."""
+        now = datetime.now()
+        try:
+            event_models = db.session.execute(
+                select(OutboxEventModel)
+                .where(OutboxEventModel.available_at <= now)
+                .order_by(OutboxEventModel.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            
+            # Lease the claimed events; they become due again if the worker dies
+            for event_model in event_models:
+                event_model.available_at = now + timedelta(seconds=lease_seconds)
+                event_model.attempts += 1
+            
+            events = [event_model.to_entity() for event_model in event_models]
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        return events
+    
+    def mark_delivered(self, event_ids: List[int]):
+        """Delete delivered events."""
+        if not event_ids:
+            return
+        db.session.execute(
+            delete(OutboxEventModel)
+            .where(OutboxEventModel.id.in_(event_ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+    
+    def mark_failed(self, event_id: int, error: str, retry_at: Optional[datetime]):
+        """Schedule a retry, or park the event for good when retry_at is None."""
+        db.session.execute(
+            update(OutboxEventModel)
+            .where(OutboxEventModel.id == event_id)
+            .values(available_at=retry_at, last_error=error)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
@@ -0,0 +1,72 @@
+from abc import ABC, abstractmethod
+from sqlalchemy import Double, and_, cast, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+# Text search configuration used to build tasks.search_vector (migration 0005).
+# Queries must use the same one so words are stemmed the same way.
+TEXT_SEARCH_CONFIG = 'spanish'
+
+
+class TaskSearch(ABC):
+    """Strategy that matches and ranks tasks by free text."""
+
+    @abstractmethod
+    def filter(self, text: str):
+        """SQL predicate for tasks matching the text."""
+        pass
+
+    @abstractmethod
+    def rank(self, text: str):
+        """SQL expression ranking matches (higher is better), or None if unranked."""
+        pass
+
+
+class PostgreSQLFullTextSearch(TaskSearch):
+    """Ranked search over the indexed tasks.search_vector column."""
+
+    search_vector = literal_column('tasks.search_vector', type_=TSVECTOR)
+
+    @staticmethod
+    def _ts_query(text: str):
+        # websearch syntax: plain words, "quoted phrases", OR and -exclusions
+        return func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, text)
+
+    def filter(self, text: str):
+        return self.search_vector.bool_op('@@')(self._ts_query(text))
+
+    def rank(self, text: str):
+        # ts_rank_cd returns real; as double precision the value round-trips
+        # exactly through a JSON cursor and compares equal on the next page
+        return cast(func.ts_rank_cd(self.search_vector, self._ts_query(text)), Double)
+
+
+class LikeTaskSearch(TaskSearch):
+    """Fallback for backends without full-text search: every word must appear
+    in one of the given columns. Results are not ranked."""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+
+    @staticmethod
+    def _pattern(word: str) -> str:
+        escaped = word.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f'%{escaped}%'
+
+    def filter(self, text: str):
+        return and_(*[
+            or_(*[column.ilike(self._pattern(word), escape='\\') for column in self.columns])
+            for word in text.split()
+        ])
+
+    def rank(self, text: str):
+        return None
+
+
+def create_task_search(dialect_name: str, columns) -> TaskSearch:
+    """Pick the search strategy supported by the database dialect.
+
+    `columns` are the text columns scanned by the fallback strategy.
+    """
+    if dialect_name == 'postgresql':
+        return PostgreSQLFullTextSearch()
+    return LikeTaskSearch(columns)
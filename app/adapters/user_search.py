@@ -0,0 +1,80 @@
+from abc import ABC, abstractmethod
+from typing import List
+from sqlalchemy import case, func, or_
+
+# Shorter terms have no trigram to match on and use the prefix indexes instead
+TRIGRAM_MIN_LENGTH = 3
+
+
+def _escape_like(term: str) -> str:
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class UserSearch(ABC):
+    """Strategy that matches and ranks users for autocomplete."""
+
+    def __init__(self, name_column, email_column):
+        self.name = name_column
+        self.email = email_column
+
+    def _prefix_match(self, term: str):
+        pattern = _escape_like(term.lower()) + '%'
+        return or_(
+            func.lower(self.name).like(pattern, escape='\\'),
+            func.lower(self.email).like(pattern, escape='\\')
+        )
+
+    @abstractmethod
+    def filter(self, term: str):
+        """SQL predicate for users matching the typed term."""
+        pass
+
+    @abstractmethod
+    def order_by(self, term: str) -> List:
+        """SQL ordering, most relevant first."""
+        pass
+
+
+class PostgreSQLTrigramUserSearch(UserSearch):
+    """Substring search served by the pg_trgm and prefix indexes (migration 0006).
+
+    Prefix matches rank first, then by trigram similarity to the name or email.
+    """
+
+    def filter(self, term: str):
+        if len(term) < TRIGRAM_MIN_LENGTH:
+            return self._prefix_match(term)
+
+        pattern = '%' + _escape_like(term) + '%'
+        return or_(
+            self.name.ilike(pattern, escape='\\'),
+            self.email.ilike(pattern, escape='\\')
+        )
+
+    def order_by(self, term: str) -> List:
+        return [
+            case((self._prefix_match(term), 0), else_=1),
+            func.greatest(func.similarity(self.name, term), func.similarity(self.email, term)).desc(),
+            self.name
+        ]
+
+
+class LikeUserSearch(UserSearch):
+    """Fallback for backends without pg_trgm: substring match, prefix matches first."""
+
+    def filter(self, term: str):
+        pattern = '%' + _escape_like(term) + '%'
+        return or_(
+            self.name.ilike(pattern, escape='\\'),
+            self.email.ilike(pattern, escape='\\')
+        )
+
+    def order_by(self, term: str) -> List:
+        return [case((self._prefix_match(term), 0), else_=1), self.name]
+
+
+def create_user_search(dialect_name: str, name_column, email_column) -> UserSearch:
+    """Pick the autocomplete strategy supported by the database dialect."""
+    if dialect_name == 'postgresql':
+        return PostgreSQLTrigramUserSearch(name_column, email_column)
+    return LikeUserSearch(name_column, email_column)
@@ -1,19 +1,25 @@
 from passlib.hash import bcrypt
 from app.application.ports import UserRepository
-from app.domain.entity import User
+from app.domain.entity import Principal, Role, User
 
 class AuthService:
     """Service for handling authentication and passwords."""
     
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, password_hasher=None):
         self.user_repository = user_repository
+        # Optional hasher exposing hash()/verify() that runs bcrypt off the request thread
+        self.password_hasher = password_hasher
     
     def hash_password(self, password: str) -> str:
         """Hash a password using bcrypt."""
+        if self.password_hasher:
+            return self.password_hasher.hash(password)
         return bcrypt.hash(password)
     
     def verify_password(self, password: str, password_hash: str) -> bool:
         """Verify a password against a hash."""
+        if self.password_hasher:
+            return self.password_hasher.verify(password, password_hash)
         return bcrypt.verify(password, password_hash)
     
     def authenticate(self, email: str, password: str) -> User:
@@ -26,4 +32,22 @@ class AuthService:
         if not self.verify_password(password, user.password_hash):
             raise ValueError("Invalid email or password")
         
-        return user 
\ No newline at end of file
+        return user
+
+
+class TokenClaims:
+    """The user an access token's verified claims stand for.
+    
+    Both the Flask and the ASGI app load the requesting user through
+    UserService.get_token_user / AsyncUserService.get_token_user, which apply
+    these claims the same way.
+    """
+    
+    def __init__(self, claims: dict, trust_claims: bool = False):
+        self.user_id = int(claims['sub'])
+        # Token version the user must still have; None for tokens issued without one
+        self.version = claims.get('ver')
+        # Fast path (AUTH_CLAIMS_PRINCIPAL): authorize from the claims without loading the user
+        self.principal = None
+        if trust_claims and 'role' in claims and self.version is not None:
+            self.principal = Principal(id=self.user_id, role=Role(claims['role']))
@@ -0,0 +1,178 @@
+import logging
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+from app.domain.entity import Role
+from app.domain.observer import (
+    AsyncSubject, AsyncTaskNotifier, CachedRoster, DigestCoalescer, EventBusFullError, TaskNotifier
+)
+from app.application.ports import OutboxEvent, OutboxRepository, TaskRepository, UserRepository
+from app.application.task_query import TaskQuery
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxProcessor:
+    """Delivers outbox events to the task notifier, outside of any request.
+
+    Events are claimed in batches. A failed event is retried with exponential
+    backoff and parked after `max_attempts`; an event whose worker dies is
+    claimed again once its lease expires, so observers may see an event more
+    than once.
+
+    By default completions go through an AsyncTaskNotifier to a
+    DigestCoalescer, so each tech lead gets one digest per window instead of
+    one message per task. An event is only marked delivered once the digest
+    that contains it has been sent. While the event bus is saturated no new
+    events are claimed and they keep waiting in the outbox.
+    """
+
+    def __init__(
+        self,
+        outbox_repository: OutboxRepository,
+        task_repository: TaskRepository,
+        user_repository: UserRepository,
+        task_notifier: Optional[TaskNotifier] = None,
+        batch_size: int = 100,
+        lease_seconds: float = 60,
+        max_attempts: int = 10,
+        retry_base_seconds: float = 5,
+        retry_max_seconds: float = 3600,
+        roster_ttl: float = 60,
+        digest_window: float = 5.0,
+        digest_max_tasks: int = 100,
+        max_pending: int = 1000
+    ):
+        self.outbox_repository = outbox_repository
+        self.task_repository = task_repository
+        self.user_repository = user_repository
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.roster = CachedRoster(lambda: self.user_repository.get_all(Role.TECH_LEAD), roster_ttl)
+
+        # Digest results (event ids, error) reported from the event bus threads
+        self._settled: queue.Queue = queue.Queue()
+        self.digest = None
+
+        if task_notifier is None:
+            task_notifier = AsyncTaskNotifier(max_queue=max_pending)
+            self.digest = DigestCoalescer(
+                max_wait=digest_window,
+                max_tasks=digest_max_tasks,
+                on_flush=lambda event_ids, error: self._settled.put((event_ids, error))
+            )
+            task_notifier.attach(self.digest)
+        self.task_notifier = task_notifier
+
+    @property
+    def is_async(self) -> bool:
+        """Whether delivery is confirmed later, once digests are sent."""
+        return isinstance(self.task_notifier, AsyncSubject)
+
+    def _retry_at(self, attempts: int) -> Optional[datetime]:
+        """When to retry after the given number of attempts, or None to give up."""
+        if attempts >= self.max_attempts:
+            return None
+        delay = min(self.retry_base_seconds * 2 ** (attempts - 1), self.retry_max_seconds)
+        return datetime.now() + timedelta(seconds=delay)
+
+    def _fail(self, event_id: int, attempts: int, error: Exception):
+        retry_at = self._retry_at(attempts)
+        logger.warning(
+            f"Outbox event {event_id} failed (attempt {attempts}): {error}"
+            + ("" if retry_at else "; giving up")
+        )
+        self.outbox_repository.mark_failed(event_id, str(error), retry_at)
+
+    def _deliver(self, event: OutboxEvent):
+        if event.event_type != OutboxEvent.TASKS_COMPLETED:
+            raise ValueError(f"Unknown outbox event type: {event.event_type}")
+
+        # Tasks deleted since the event was recorded are skipped
+        tasks = self.task_repository.find(TaskQuery(task_ids=event.payload["task_ids"]))
+
+        # Loaded here rather than on the bus thread, which has no database session
+        tech_leads = self.roster.get()
+
+        if self.is_async:
+            # The event id comes back through the digest's on_flush
+            self.task_notifier.notify_tasks_completion(tasks, tech_leads, token=(event.id, event.attempts))
+        elif len(tasks) == 1:
+            self.task_notifier.notify_task_completion(tasks[0], tech_leads)
+        elif tasks:
+            self.task_notifier.notify_tasks_completion(tasks, tech_leads)
+
+    def settle(self):
+        """Record the outcome of every digest sent since the last call."""
+        delivered = []
+        while True:
+            try:
+                tokens, error = self._settled.get_nowait()
+            except queue.Empty:
+                break
+            if error is None:
+                delivered.extend(event_id for event_id, _ in tokens)
+            else:
+                for event_id, attempts in tokens:
+                    self._fail(event_id, attempts, error)
+        if delivered:
+            self.outbox_repository.mark_delivered(delivered)
+
+    def process_batch(self) -> int:
+        """Deliver one batch of due events and return how many were claimed."""
+        self.settle()
+
+        # Backpressure: leave events in the outbox until the bus catches up
+        if self.is_async and self.task_notifier.is_saturated():
+            return 0
+
+        events = self.outbox_repository.claim_batch(self.batch_size, self.lease_seconds)
+        if not events:
+            return 0
+
+        delivered = []
+        for event in events:
+            try:
+                self._deliver(event)
+            except EventBusFullError as e:
+                # Not the event's fault: let it be claimed again soon
+                self.outbox_repository.mark_failed(
+                    event.id, str(e), datetime.now() + timedelta(seconds=self.retry_base_seconds)
+                )
+            except Exception as e:
+                self._fail(event.id, event.attempts, e)
+            else:
+                if not self.is_async:
+                    delivered.append(event.id)
+
+        self.outbox_repository.mark_delivered(delivered)
+        return len(events)
+
+    def drain(self):
+        """Send every pending digest now and record the outcome."""
+        if self.is_async:
+            self.task_notifier.join()
+        if self.digest is not None:
+            self.digest.flush()
+        self.settle()
+
+    def run(self, poll_interval: float = 1.0, stop: Optional[threading.Event] = None):
+        """Drain the outbox until `stop` is set, sleeping while it is empty."""
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                try:
+                    claimed = self.process_batch()
+                except Exception:
+                    logger.exception("Outbox batch failed")
+                    claimed = 0
+
+                # Keep draining while batches come back full
+                if claimed < self.batch_size:
+                    stop.wait(poll_interval)
+        finally:
+            self.drain()
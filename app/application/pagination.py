@@ -0,0 +1,104 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Generic, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class Page(Generic[T]):
+    """A single page of results from a keyset-paginated query."""
+
+    def __init__(self, items: List[T], next_cursor: Optional[str] = None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    def to_dict(self, serialize=None):
+        """Return the page as a response envelope."""
+        serialize = serialize or (lambda item: item.to_dict())
+        return {
+            "items": [serialize(item) for item in self.items],
+            "next_cursor": self.next_cursor
+        }
+
+
+class ChangePage(Generic[T]):
+    """Items changed since a change feed cursor, and the IDs of removed ones."""
+
+    def __init__(self, items: List[T], deleted_ids: List[int], cursor: str, has_more: bool = False):
+        self.items = items
+        self.deleted_ids = deleted_ids
+        self.cursor = cursor
+        self.has_more = has_more
+
+    def to_dict(self, serialize=None):
+        """Return the changes as a response envelope."""
+        serialize = serialize or (lambda item: item.to_dict())
+        return {
+            "items": [serialize(item) for item in self.items],
+            "deleted": self.deleted_ids,
+            "cursor": self.cursor,
+            "has_more": self.has_more
+        }
+
+
+def encode_cursor(key: List[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    raw = json.dumps(key, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(key, list):
+        raise ValueError("Invalid cursor")
+
+    return key
+
+
+def decode_task_cursor(cursor: str, ranked: bool = False) -> List[Any]:
+    """Decode a task listing cursor: the relevance for a ranked search, then created_at and id."""
+    values = decode_cursor(cursor)
+    if len(values) != (3 if ranked else 2) or not isinstance(values[-1], int):
+        raise ValueError("Invalid cursor")
+
+    try:
+        values[-2] = datetime.fromisoformat(values[-2])
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+    return values
+
+
+def decode_user_cursor(cursor: str) -> int:
+    """Decode a user listing cursor into the id of the last user of the page."""
+    values = decode_cursor(cursor)
+    if len(values) != 1 or not isinstance(values[0], int):
+        raise ValueError("Invalid cursor")
+
+    return values[0]
+
+
+def parse_page_size(value: Optional[str]) -> int:
+    """Parse and validate the `limit` query parameter."""
+    if value is None or value == '':
+        return DEFAULT_PAGE_SIZE
+
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError("limit must be an integer")
+
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    return limit
@@ -1,7 +1,97 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Iterator, Tuple
 from datetime import datetime
 from app.domain.entity import User, Role, Task, TaskStatus, TaskPriority
+from app.application.pagination import Page
+from app.application.task_query import TaskQuery
+
+class TaskAccess:
+    """The facts about a task needed to authorize a change by one user."""
+    
+    def __init__(self, task_id: int, creator_id: int, status: TaskStatus, is_assigned: bool):
+        self.task_id = task_id
+        self.creator_id = creator_id
+        self.status = status
+        self.is_assigned = is_assigned
+
+class TaskVersion:
+    """What a task's representation depends on, read without loading the task."""
+    
+    def __init__(self, status: TaskStatus, tag: str):
+        self.status = status
+        self.tag = tag
+
+class TaskChange:
+    """A task's latest change, at position `seq` of the change feed."""
+    
+    def __init__(self, task_id: int, seq: int, deleted: bool = False):
+        self.task_id = task_id
+        self.seq = seq
+        self.deleted = deleted
+
+class TaskStats:
+    """Task counts per status and priority, and per assignee and status."""
+    
+    def __init__(
+        self,
+        counts: Dict[Tuple[TaskStatus, TaskPriority], int],
+        assignee_counts: Dict[Tuple[int, TaskStatus], int]
+    ):
+        self.counts = counts
+        self.assignee_counts = assignee_counts
+    
+    def without_statuses(self, *statuses: TaskStatus) -> 'TaskStats':
+        """The same counts, leaving out tasks in the given statuses."""
+        return TaskStats(
+            {key: count for key, count in self.counts.items() if key[0] not in statuses},
+            {key: count for key, count in self.assignee_counts.items() if key[1] not in statuses}
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the counts as a response document."""
+        by_status = {status.value: 0 for status in TaskStatus}
+        by_priority = {priority.value: 0 for priority in TaskPriority}
+        for (status, priority), count in self.counts.items():
+            by_status[status.value] += count
+            by_priority[priority.value] += count
+        
+        by_assignee = {}
+        for (user_id, status), count in sorted(self.assignee_counts.items(), key=lambda item: item[0][0]):
+            entry = by_assignee.setdefault(user_id, {"user_id": user_id, "total": 0, "by_status": {}})
+            entry["total"] += count
+            entry["by_status"][status.value] = count
+        
+        return {
+            "total": sum(by_status.values()),
+            "by_status": by_status,
+            "by_priority": by_priority,
+            "by_assignee": list(by_assignee.values())
+        }
+
+class OutboxEvent:
+    """An event recorded in the same transaction as the change that caused it."""
+    
+    # Payload: {"task_ids": [...]} of tasks that have just been completed
+    TASKS_COMPLETED = 'tasks.completed'
+    
+    def __init__(
+        self,
+        event_type: str,
+        payload: Dict[str, Any],
+        id: Optional[int] = None,
+        attempts: int = 0,
+        created_at: Optional[datetime] = None
+    ):
+        self.id = id
+        self.event_type = event_type
+        self.payload = payload
+        self.attempts = attempts
+        self.created_at = created_at or datetime.now()
+    
+    @classmethod
+    def tasks_completed(cls, task_ids: List[int]) -> 'OutboxEvent':
+        """Event for one or more tasks moved to the completed status."""
+        return cls(cls.TASKS_COMPLETED, {"task_ids": list(task_ids)})
 
 class UserRepository(ABC):
     """Port for user repository."""
@@ -16,11 +106,37 @@ class UserRepository(ABC):
         """Get all users, optionally filtered by role and search term."""
         pass
     
+    @abstractmethod
+    def get_list_version(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> str:
+        """Tag that changes whenever the users matching the filters change."""
+        pass
+    
+    @abstractmethod
+    def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        role: Optional[Role] = None,
+        search_term: Optional[str] = None
+    ) -> Page[User]:
+        """Get one page of users ordered by ID, starting after the cursor."""
+        pass
+    
+    @abstractmethod
+    def suggest(self, term: str, limit: int, role: Optional[Role] = None) -> List[User]:
+        """Get the users whose name or email best match a typed term, most relevant first."""
+        pass
+    
     @abstractmethod
     def get_by_id(self, user_id: int) -> Optional[User]:
         """Get a user by ID."""
         pass
     
+    @abstractmethod
+    def get_by_ids(self, user_ids: List[int]) -> List[User]:
+        """Get every existing user among the given IDs."""
+        pass
+    
     @abstractmethod
     def get_by_email(self, email: str) -> Optional[User]:
         """Get a user by email."""
@@ -30,6 +146,16 @@ class UserRepository(ABC):
     def update(self, user: User) -> User:
         """Update a user in the repository."""
         pass
+    
+    @abstractmethod
+    def get_token_version(self, user_id: int) -> Optional[int]:
+        """Get the current token version of a user, or None if the user does not exist."""
+        pass
+    
+    @abstractmethod
+    def bump_token_version(self, user_id: int) -> bool:
+        """Invalidate every token issued to a user."""
+        pass
 
 class TaskRepository(ABC):
     """Port for task repository."""
@@ -39,11 +165,71 @@ class TaskRepository(ABC):
         """Create a new task in the repository."""
         pass
     
+    @abstractmethod
+    def create_many(self, tasks: List[Task]) -> List[Task]:
+        """Create several tasks and their assignments in one transaction."""
+        pass
+    
     @abstractmethod
     def get_all(self, filters: Optional[Dict[str, Any]] = None) -> List[Task]:
         """Get all tasks, optionally filtered."""
         pass
     
+    @abstractmethod
+    def find(self, query: TaskQuery) -> List[Task]:
+        """Get all tasks matching a query specification, newest first.
+        
+        When the query has a text search, the most relevant tasks come first.
+        """
+        pass
+    
+    @abstractmethod
+    def iter_tasks(self, query: TaskQuery, chunk_size: int = 500) -> Iterator[Task]:
+        """Yield the tasks `find` would return, reading `chunk_size` rows at a time."""
+        pass
+    
+    @abstractmethod
+    def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        query: Optional[TaskQuery] = None
+    ) -> Page[Task]:
+        """Get one page of tasks matching the query, starting after the cursor.
+        
+        Tasks come newest first, or most relevant first for a text search.
+        """
+        pass
+    
+    @abstractmethod
+    def check_cursor(self, cursor: str, query: Optional[TaskQuery] = None):
+        """Raise ValueError unless the cursor can continue a page of the query; reads nothing."""
+        pass
+    
+    @abstractmethod
+    def get_version(self, task_id: int) -> Optional[TaskVersion]:
+        """Version of a task and its assignees, or None if it does not exist."""
+        pass
+    
+    @abstractmethod
+    def get_list_version(self, query: TaskQuery) -> str:
+        """Tag that changes whenever the tasks matching the query change."""
+        pass
+    
+    @abstractmethod
+    def get_changes(self, after: int, limit: int) -> List[TaskChange]:
+        """Get the changes positioned after `after`, oldest first.
+        
+        Each task appears once, at the position of its latest change, and
+        a change never gets a position below one already returned.
+        """
+        pass
+    
+    @abstractmethod
+    def get_stats(self) -> TaskStats:
+        """Get task counts, in time independent of the number of tasks."""
+        pass
+    
     @abstractmethod
     def get_by_id(self, task_id: int) -> Optional[Task]:
         """Get a task by ID."""
@@ -54,6 +240,39 @@ class TaskRepository(ABC):
         """Update a task in the repository."""
         pass
     
+    @abstractmethod
+    def apply_changes(
+        self,
+        task_id: int,
+        changes: Dict[str, Any],
+        assign_user_ids: Optional[Set[int]] = None,
+        unassign_user_ids: Optional[Set[int]] = None,
+        events: Optional[List[OutboxEvent]] = None
+    ) -> Task:
+        """Write only the given column changes and assignment diff in one transaction.
+        
+        `events` are added to the outbox in that same transaction.
+        """
+        pass
+    
+    @abstractmethod
+    def get_access(self, task_ids: List[int], user_id: int) -> Dict[int, TaskAccess]:
+        """Get access facts for every existing task among the IDs, keyed by task ID."""
+        pass
+    
+    @abstractmethod
+    def apply_changes_many(
+        self,
+        task_ids: List[int],
+        changes: Dict[str, Any],
+        events: Optional[List[OutboxEvent]] = None
+    ) -> List[int]:
+        """Write the same column changes to many tasks at once and return the IDs updated.
+        
+        `events` are added to the outbox in the same transaction.
+        """
+        pass
+    
     @abstractmethod
     def delete(self, task_id: int) -> bool:
         """Delete a task from the repository."""
@@ -87,4 +306,115 @@ class TaskRepository(ABC):
     @abstractmethod
     def unassign_user(self, task_id: int, user_id: int) -> Task:
         """Unassign a user from a task."""
-        pass 
\ No newline at end of file
+        pass 
+
+
+class OutboxRepository(ABC):
+    """Port for the outbox of events waiting to be delivered."""
+    
+    @abstractmethod
+    def claim_batch(self, limit: int, lease_seconds: float) -> List[OutboxEvent]:
+        """Claim up to `limit` due events, hiding them from other workers for `lease_seconds`.
+        
+        An event that is neither delivered nor failed before its lease
+        expires is claimed again, so delivery is at-least-once.
+        """
+        pass
+    
+    @abstractmethod
+    def mark_delivered(self, event_ids: List[int]):
+        """Remove delivered events from the outbox."""
+        pass
+    
+    @abstractmethod
+    def mark_failed(self, event_id: int, error: str, retry_at: Optional[datetime]):
+        """Record a failed delivery, to be retried at `retry_at` or never if it is None."""
+        pass
+
+
+class AsyncUserRepository(ABC):
+    """Port for reading users without blocking an event loop.
+    
+    The read side of UserRepository, served by the ASGI app; writes go
+    through the synchronous port.
+    """
+    
+    @abstractmethod
+    async def get_all(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> List[User]:
+        """Get all users, optionally filtered by role and search term."""
+        pass
+    
+    @abstractmethod
+    async def get_list_version(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> str:
+        """Get a tag that changes whenever the filtered user listing changes."""
+        pass
+    
+    @abstractmethod
+    async def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        role: Optional[Role] = None,
+        search_term: Optional[str] = None
+    ) -> Page[User]:
+        """Get one page of users ordered by ID, starting after the cursor."""
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        """Get a user by ID."""
+        pass
+    
+    @abstractmethod
+    async def get_token_version(self, user_id: int) -> Optional[int]:
+        """Get the current token version of a user, or None if it does not exist."""
+        pass
+
+
+class AsyncTaskRepository(ABC):
+    """Port for reading tasks without blocking an event loop.
+    
+    The read side of TaskRepository, served by the ASGI app; writes go
+    through the synchronous port, which also records outbox events and
+    change feed positions.
+    """
+    
+    @abstractmethod
+    async def find(self, query: TaskQuery) -> List[Task]:
+        """Get all tasks matching a query specification, newest or most relevant first."""
+        pass
+    
+    @abstractmethod
+    async def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        query: Optional[TaskQuery] = None
+    ) -> Page[Task]:
+        """Get one page of tasks matching the query, starting after the cursor."""
+        pass
+    
+    @abstractmethod
+    def check_cursor(self, cursor: str, query: Optional[TaskQuery] = None):
+        """Raise ValueError unless the cursor can continue a page of the query; reads nothing."""
+        pass
+    
+    @abstractmethod
+    async def get_version(self, task_id: int) -> Optional[TaskVersion]:
+        """Get the status and version tag of a task, or None if it does not exist."""
+        pass
+    
+    @abstractmethod
+    async def get_list_version(self, query: TaskQuery) -> str:
+        """Get a tag that changes whenever the tasks matching a query change."""
+        pass
+    
+    @abstractmethod
+    async def get_stats(self) -> TaskStats:
+        """Get task counts per status and priority, and per assignee and status."""
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, task_id: int) -> Optional[Task]:
+        """Get a task by ID."""
+        pass
@@ -1,7 +1,8 @@
-from typing import List, Optional
-from app.domain.entity import User, Role
-from app.application.ports import UserRepository
-from app.application.auth_service import AuthService
+from typing import List, Optional, Union
+from app.domain.entity import Principal, User, Role
+from app.application.ports import AsyncUserRepository, UserRepository
+from app.application.auth_service import AuthService, TokenClaims
+from app.application.pagination import Page
 
 class UserService:
     """Service for handling users."""
@@ -42,20 +43,103 @@ class UserService:
             user.name = name
         if email:
             user.email = email
-        if role:
+        role_changed = role and role != user.role
+        if role_changed:
             user.role = role
         
         # Save and return updated user
-        return self.user_repository.update(user)
+        updated_user = self.user_repository.update(user)
+        if role_changed:
+            # Tokens carry the role claim, so a role change must invalidate them.
+            # The increment runs in SQL, never from the possibly stale entity.
+            self.user_repository.bump_token_version(user_id)
+            updated_user.token_version += 1
+        return updated_user
     
     def get_all_users(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> List[User]:
         """Get all users with optional filtering."""
         return self.user_repository.get_all(role, search_term)
     
+    def get_users_version(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> str:
+        """Get a tag that changes whenever the filtered user listing changes."""
+        return self.user_repository.get_list_version(role, search_term)
+    
+    def get_users_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        role: Optional[Role] = None,
+        search_term: Optional[str] = None
+    ) -> Page[User]:
+        """Get one page of users with optional filtering."""
+        return self.user_repository.get_page(limit, cursor, role, search_term)
+    
+    def suggest_users(self, term: str, limit: int, role: Optional[Role] = None) -> List[User]:
+        """Get the users best matching a partially typed name or email."""
+        term = term.strip()
+        if not term:
+            return []
+        return self.user_repository.suggest(term, limit, role)
+    
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get a user by ID."""
         return self.user_repository.get_by_id(user_id)
     
+    def get_token_version(self, user_id: int) -> Optional[int]:
+        """Get the current token version of a user."""
+        return self.user_repository.get_token_version(user_id)
+    
+    def get_token_user(self, token: TokenClaims) -> Optional[Union[User, Principal]]:
+        """Get the user a token stands for, or None if the token was revoked or the user is gone."""
+        # The version is read from the database, not the per-process user cache,
+        # so revocations and role changes apply on the next request in every worker
+        if token.version is not None and self.get_token_version(token.user_id) != token.version:
+            return None
+        return token.principal or self.get_user_by_id(token.user_id)
+    
+    def revoke_tokens(self, user_id: int) -> bool:
+        """Invalidate every token issued to a user."""
+        return self.user_repository.bump_token_version(user_id)
+    
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get a user by email."""
-        return self.user_repository.get_by_email(email) 
\ No newline at end of file
+        return self.user_repository.get_by_email(email) 
+
+
+class AsyncUserService:
+    """User reads for the ASGI app; writes stay on UserService."""
+    
+    def __init__(self, user_repository: AsyncUserRepository):
+        self.user_repository = user_repository
+    
+    async def get_all_users(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> List[User]:
+        """Get all users with optional filtering."""
+        return await self.user_repository.get_all(role, search_term)
+    
+    async def get_users_version(self, role: Optional[Role] = None, search_term: Optional[str] = None) -> str:
+        """Get a tag that changes whenever the filtered user listing changes."""
+        return await self.user_repository.get_list_version(role, search_term)
+    
+    async def get_users_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        role: Optional[Role] = None,
+        search_term: Optional[str] = None
+    ) -> Page[User]:
+        """Get one page of users with optional filtering."""
+        return await self.user_repository.get_page(limit, cursor, role, search_term)
+    
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        """Get a user by ID."""
+        return await self.user_repository.get_by_id(user_id)
+    
+    async def get_token_version(self, user_id: int) -> Optional[int]:
+        """Get the current token version of a user."""
+        return await self.user_repository.get_token_version(user_id)
+    
+    async def get_token_user(self, token: TokenClaims) -> Optional[Union[User, Principal]]:
+        """Get the user a token stands for, with the same rules as UserService.get_token_user."""
+        if token.version is not None and await self.get_token_version(token.user_id) != token.version:
+            return None
+        return token.principal or await self.get_user_by_id(token.user_id)
@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Iterable, Optional, Set
+from app.domain.entity import TaskStatus, TaskPriority
+
+
+class TaskQuery:
+    """Specification of the tasks to fetch from a TaskRepository.
+
+    Every predicate that is set is combined with AND, so repositories can
+    translate the whole specification into a single statement.
+    """
+
+    def __init__(
+        self,
+        assignee_id: Optional[int] = None,
+        creator_id: Optional[int] = None,
+        statuses: Optional[Iterable[TaskStatus]] = None,
+        exclude_statuses: Optional[Iterable[TaskStatus]] = None,
+        priorities: Optional[Iterable[TaskPriority]] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        search: Optional[str] = None,
+        task_ids: Optional[Iterable[int]] = None
+    ):
+        self.assignee_id = assignee_id
+        self.creator_id = creator_id
+        self.statuses: Optional[Set[TaskStatus]] = set(statuses) if statuses else None
+        self.exclude_statuses: Set[TaskStatus] = set(exclude_statuses or [])
+        self.priorities: Optional[Set[TaskPriority]] = set(priorities) if priorities else None
+        self.due_after = due_after
+        self.due_before = due_before
+        self.updated_since = updated_since
+        # Free text matched against title and description; results are ranked by relevance
+        self.search = search.strip() if search and search.strip() else None
+        self.task_ids: Optional[Set[int]] = set(task_ids) if task_ids is not None else None
+
+    def hide_statuses(self, *statuses: TaskStatus) -> 'TaskQuery':
+        """Exclude the given statuses from the result."""
+        self.exclude_statuses.update(statuses)
+        if self.statuses is not None:
+            self.statuses -= set(statuses)
+        return self
+
+    def matches_nothing(self) -> bool:
+        """Whether the query can be answered as empty without touching storage."""
+        if self.statuses is not None and not self.statuses:
+            return True
+        if self.task_ids is not None and not self.task_ids:
+            return True
+        if self.due_after and self.due_before and self.due_after > self.due_before:
+            return True
+        return False
+
+    def effective_statuses(self) -> Optional[Set[TaskStatus]]:
+        """Statuses to include, or None when every status not excluded matches."""
+        if self.statuses is None:
+            return None
+        return self.statuses - self.exclude_statuses
@@ -1,21 +1,65 @@
-from typing import List, Optional, Dict, Any
+from enum import Enum
+from typing import List, Optional, Dict, Any, Union, Iterator
 from datetime import datetime
 from app.domain.entity import Task, User, TaskStatus, TaskPriority, Role
-from app.domain.observer import TaskNotifier, TaskCompletionObserver
 from app.domain.factory import TaskFactoryProvider
-from app.application.ports import TaskRepository, UserRepository
+from app.domain.observer import TaskEvent, TaskNotifier
+from app.application.ports import AsyncTaskRepository, TaskRepository, UserRepository, TaskAccess, TaskStats, OutboxEvent
+from app.application.pagination import ChangePage, Page, decode_cursor, encode_cursor
+from app.application.task_query import TaskQuery
+
+
+class TransitionOutcome(Enum):
+    """What a bulk transition did to one task."""
+    UPDATED = "updated"
+    NOT_FOUND = "not_found"
+    FORBIDDEN = "forbidden"
+
+
+class TransitionResult:
+    """Outcome of a bulk transition for one task, with the reason when it was not updated."""
+    
+    def __init__(self, outcome: TransitionOutcome, error: Optional[str] = None):
+        self.outcome = outcome
+        self.error = error
+
+
+def hides_completed(user: Optional[User]) -> bool:
+    """Whether completed tasks are hidden from a user (only Tech Leads see them)."""
+    return user is not None and not user.has_permission("view_all_completed_tasks")
+
+
+def scope_task_query(query: Optional[TaskQuery], requesting_user: Optional[User]) -> TaskQuery:
+    """Apply role-based visibility rules to a task query."""
+    query = query or TaskQuery()
+    
+    # Only Tech Leads should see completed tasks, hide them inside the query for other roles
+    if hides_completed(requesting_user):
+        query.hide_statuses(TaskStatus.COMPLETED)
+    
+    return query
+
 
 class TaskService:
     """Service for handling tasks."""
     
-    def __init__(self, task_repository: TaskRepository, user_repository: UserRepository):
+    def __init__(
+        self,
+        task_repository: TaskRepository,
+        user_repository: UserRepository,
+        task_notifier: Optional[TaskNotifier] = None
+    ):
         self.task_repository = task_repository
         self.user_repository = user_repository
-        
-        # Initialize the task notifier and observer
-        self.task_notifier = TaskNotifier()
-        self.task_completion_observer = TaskCompletionObserver()
-        self.task_notifier.attach(self.task_completion_observer)
+        # Live task events, sent once each change is committed
+        self.task_notifier = task_notifier
+    
+    def _publish(self, event_type: str, tasks: List[Task], user_id: Optional[int] = None):
+        """Notify observers about committed task changes."""
+        if self.task_notifier is None:
+            return
+        for task in tasks:
+            self.task_notifier.notify_task_event(TaskEvent(event_type, task, user_id))
     
     def create_task(
         self,
@@ -27,19 +71,20 @@ class TaskService:
         creator_id: int
     ) -> Task:
         """Create a new task using the Factory pattern."""
-        # Validate that the creator exists
-        creator = self.user_repository.get_by_id(creator_id)
-        if not creator:
+        # Validate the creator and assigned users with a single lookup
+        users = {
+            user.id: user
+            for user in self.user_repository.get_by_ids([creator_id, *assigned_user_ids])
+        }
+        if creator_id not in users:
             raise ValueError(f"Creator with ID {creator_id} not found")
         
         # Get assigned users
         assigned_users = []
         for user_id in assigned_user_ids:
-            user = self.user_repository.get_by_id(user_id)
-            if user:
-                assigned_users.append(user)
-            else:
+            if user_id not in users:
                 raise ValueError(f"User with ID {user_id} not found")
+            assigned_users.append(users[user_id])
         
         # Use the factory to create a task with the appropriate priority
         factory = TaskFactoryProvider.get_factory(priority)
@@ -51,43 +96,142 @@ class TaskService:
             creator_id=creator_id
         )
         
-        return self.task_repository.create(task)
+        task = self.task_repository.create(task)
+        self._publish(TaskEvent.CREATED, [task])
+        return task
+    
+    def create_tasks_bulk(self, items: List[Dict[str, Any]], creator_id: int) -> List[Union[Task, ValueError]]:
+        """Create many tasks at once using the Factory pattern.
+        
+        Each item holds the keyword arguments of create_task except creator_id.
+        Returns, for each item in order, the created task or the error that
+        rejected it; valid items are created even if others are rejected.
+        """
+        user_ids = {creator_id}
+        for item in items:
+            user_ids.update(item['assigned_user_ids'])
+        users = {user.id: user for user in self.user_repository.get_by_ids(list(user_ids))}
+        
+        if creator_id not in users:
+            raise ValueError(f"Creator with ID {creator_id} not found")
+        
+        results: List[Union[Task, ValueError]] = []
+        new_tasks = []
+        for item in items:
+            missing = [user_id for user_id in item['assigned_user_ids'] if user_id not in users]
+            if missing:
+                results.append(ValueError(f"User with ID {missing[0]} not found"))
+                continue
+            
+            factory = TaskFactoryProvider.get_factory(item['priority'])
+            task = factory.create_task(
+                title=item['title'],
+                description=item['description'],
+                due_date=item.get('due_date'),
+                assigned_users=[users[user_id] for user_id in item['assigned_user_ids']],
+                creator_id=creator_id
+            )
+            results.append(task)
+            new_tasks.append(task)
+        
+        created_tasks = self.task_repository.create_many(new_tasks)
+        self._publish(TaskEvent.CREATED, created_tasks)
+        
+        created = iter(created_tasks)
+        return [next(created) if isinstance(result, Task) else result for result in results]
+    
+    def _scope_query(self, query: Optional[TaskQuery], requesting_user: Optional[User]) -> TaskQuery:
+        """Apply role-based visibility rules to a task query."""
+        return scope_task_query(query, requesting_user)
     
     def get_tasks(
         self,
-        status: Optional[TaskStatus] = None,
-        priority: Optional[TaskPriority] = None,
-        user_id: Optional[int] = None,
-        due_date: Optional[datetime] = None,
+        query: Optional[TaskQuery] = None,
         requesting_user: Optional[User] = None
     ) -> List[Task]:
-        """Get tasks with optional filtering."""
-        filters = {}
+        """Get tasks matching a query, as visible to the requesting user."""
+        return self.task_repository.find(self._scope_query(query, requesting_user))
+    
+    def iter_tasks(
+        self,
+        query: Optional[TaskQuery] = None,
+        requesting_user: Optional[User] = None,
+        chunk_size: int = 500
+    ) -> Iterator[Task]:
+        """Stream tasks matching a query, as visible to the requesting user."""
+        return self.task_repository.iter_tasks(self._scope_query(query, requesting_user), chunk_size)
+    
+    def get_tasks_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        query: Optional[TaskQuery] = None,
+        requesting_user: Optional[User] = None
+    ) -> Page[Task]:
+        """Get one page of tasks matching a query, as visible to the requesting user."""
+        return self.task_repository.get_page(limit, cursor, self._scope_query(query, requesting_user))
+    
+    def check_page_cursor(self, cursor: str, query: Optional[TaskQuery] = None):
+        """Raise ValueError if the cursor cannot continue a page of the query's tasks."""
+        self.task_repository.check_cursor(cursor, query)
+    
+    def get_tasks_version(self, query: Optional[TaskQuery] = None, requesting_user: Optional[User] = None) -> str:
+        """Get a tag that changes whenever the tasks visible to the user for a query change."""
+        return self.task_repository.get_list_version(self._scope_query(query, requesting_user))
+    
+    def get_task_version(self, task_id: int, user: Optional[User] = None) -> Optional[str]:
+        """Get the version tag of a task, or None if the user cannot see it."""
+        version = self.task_repository.get_version(task_id)
+        if version is None:
+            return None
         
-        # If user doesn't have permission to view completed tasks and we're not explicitly 
-        # requesting completed tasks, filter them out
+        if version.status == TaskStatus.COMPLETED and user and not user.has_permission("view_all_completed_tasks"):
+            return None
+        
+        return version.tag
+    
+    def get_task_changes(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        requesting_user: Optional[User] = None
+    ) -> ChangePage[Task]:
+        """Get the tasks changed since the cursor, as visible to the requesting user.
+        
+        Without a cursor the feed starts from the beginning. Deleted tasks,
+        and tasks the user can no longer see, come back as tombstones.
+        """
+        after = 0
+        if cursor:
+            key = decode_cursor(cursor)
+            if len(key) != 1 or not isinstance(key[0], int):
+                raise ValueError("Invalid cursor")
+            after = key[0]
+        
+        changes = self.task_repository.get_changes(after, limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        
+        live_ids = [change.task_id for change in changes if not change.deleted]
+        tasks = self.task_repository.find(
+            self._scope_query(TaskQuery(task_ids=live_ids), requesting_user)
+        ) if live_ids else []
+        
+        visible_ids = {task.id for task in tasks}
+        deleted_ids = [change.task_id for change in changes if change.task_id not in visible_ids]
+        
+        last_seq = changes[-1].seq if changes else after
+        return ChangePage(tasks, deleted_ids, encode_cursor([last_seq]), has_more)
+    
+    def get_task_stats(self, requesting_user: Optional[User] = None) -> TaskStats:
+        """Get task counts, as visible to the requesting user."""
+        stats = self.task_repository.get_stats()
+        
+        # Completed tasks are only counted for users allowed to see them
         if requesting_user and not requesting_user.has_permission("view_all_completed_tasks"):
-            if status == TaskStatus.COMPLETED:
-                # Only Tech Leads should see completed tasks, return empty list for other roles
-                return []
-        
-        # Apply provided filters
-        if user_id:
-            tasks = self.task_repository.get_by_user_id(user_id, filters)
-        elif status:
-            tasks = self.task_repository.get_by_status(status, filters)
-        elif priority:
-            tasks = self.task_repository.get_by_priority(priority, filters)
-        elif due_date:
-            tasks = self.task_repository.get_by_due_date(due_date, filters)
-        else:
-            tasks = self.task_repository.get_all(filters)
-        
-        # Filter out completed tasks for non-Tech Leads when getting all tasks
-        if not status and requesting_user and not requesting_user.has_permission("view_all_completed_tasks"):
-            tasks = [task for task in tasks if task.status != TaskStatus.COMPLETED]
-            
-        return tasks
+            stats = stats.without_statuses(TaskStatus.COMPLETED)
+        
+        return stats
     
     def get_task_by_id(self, task_id: int, user: Optional[User] = None) -> Optional[Task]:
         """Get a task by ID."""
@@ -121,20 +265,18 @@ class TaskService:
             if not is_assigned and not is_admin_or_lead:
                 raise ValueError("You don't have permission to mark this task as completed")
         
-        # Update the task status
-        old_status = task.status
-        task.update_status(status)
-        updated_task = self.task_repository.update(task)
+        # Record the completion for the outbox worker in the same transaction
+        events = []
+        if status == TaskStatus.COMPLETED and task.status != TaskStatus.COMPLETED:
+            events.append(OutboxEvent.tasks_completed([task_id]))
         
-        # Notify observers if task is completed
-        if status == TaskStatus.COMPLETED and old_status != TaskStatus.COMPLETED:
-            # Get all tech leads
-            tech_leads = self.user_repository.get_all(Role.TECH_LEAD)
-            
-            # Notify the observer
-            self.task_notifier.notify_task_completion(updated_task, tech_leads)
-        
-        return updated_task
+        # Update the task status, writing only the changed columns
+        task.update_status(status)
+        task = self.task_repository.apply_changes(
+            task_id, {'status': task.status, 'updated_at': task.updated_at}, events=events
+        )
+        self._publish(TaskEvent.COMPLETED if events else TaskEvent.UPDATED, [task])
+        return task
     
     def update_task_priority(self, task_id: int, priority: TaskPriority, user: User) -> Task:
         """Update the priority of a task."""
@@ -150,7 +292,94 @@ class TaskService:
             raise ValueError("You don't have permission to update this task's priority")
         
         task.update_priority(priority)
-        return self.task_repository.update(task)
+        task = self.task_repository.apply_changes(
+            task_id, {'priority': task.priority, 'updated_at': task.updated_at}
+        )
+        self._publish(TaskEvent.UPDATED, [task])
+        return task
+    
+    def _check_transition(
+        self,
+        access: TaskAccess,
+        user: User,
+        status: Optional[TaskStatus],
+        priority: Optional[TaskPriority]
+    ) -> Optional[str]:
+        """Return why the user may not apply a transition to a task, or None if allowed."""
+        is_creator = access.creator_id == user.id
+        is_admin_or_lead = user.role in [Role.ADMIN, Role.TECH_LEAD]
+        
+        if status is not None:
+            if not (access.is_assigned or is_creator or is_admin_or_lead):
+                return "You don't have permission to update this task"
+            if status == TaskStatus.COMPLETED and not user.has_permission("complete_any_task"):
+                if not access.is_assigned and not is_admin_or_lead:
+                    return "You don't have permission to mark this task as completed"
+        
+        if priority is not None and not (is_creator or is_admin_or_lead):
+            return "You don't have permission to update this task's priority"
+        
+        return None
+    
+    def transition_tasks(
+        self,
+        task_ids: List[int],
+        user: User,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None
+    ) -> Dict[int, TransitionResult]:
+        """Set the status and/or priority of many tasks at once.
+        
+        Permissions for the whole set are checked with one query and the
+        change is applied with one set-based update. Returns the result for
+        each task ID, in the order given.
+        """
+        if status is None and priority is None:
+            raise ValueError("Status or priority is required")
+        
+        task_ids = list(dict.fromkeys(task_ids))
+        access = self.task_repository.get_access(task_ids, user.id)
+        
+        results: Dict[int, TransitionResult] = {}
+        allowed = []
+        for task_id in task_ids:
+            if task_id not in access:
+                results[task_id] = TransitionResult(TransitionOutcome.NOT_FOUND, f"Task with ID {task_id} not found")
+                continue
+            
+            error = self._check_transition(access[task_id], user, status, priority)
+            if error is None:
+                allowed.append(task_id)
+            else:
+                results[task_id] = TransitionResult(TransitionOutcome.FORBIDDEN, error)
+        
+        changes: Dict[str, Any] = {'updated_at': datetime.now()}
+        if status is not None:
+            changes['status'] = status
+        if priority is not None:
+            changes['priority'] = priority
+        
+        # One outbox event for every task that is being completed now
+        events = []
+        completed = []
+        if status == TaskStatus.COMPLETED:
+            completed = [task_id for task_id in allowed if access[task_id].status != TaskStatus.COMPLETED]
+            if completed:
+                events.append(OutboxEvent.tasks_completed(completed))
+        
+        updated = set(self.task_repository.apply_changes_many(allowed, changes, events=events))
+        for task_id in allowed:
+            # A task deleted since its permissions were read is not updated
+            results[task_id] = TransitionResult(TransitionOutcome.UPDATED) if task_id in updated else \
+                TransitionResult(TransitionOutcome.NOT_FOUND, f"Task with ID {task_id} not found")
+        
+        # The updated tasks are only loaded when someone listens for them
+        if self.task_notifier is not None and updated:
+            completed = set(completed)
+            for task in self.task_repository.find(TaskQuery(task_ids=updated)):
+                self._publish(TaskEvent.COMPLETED if task.id in completed else TaskEvent.UPDATED, [task])
+        
+        return {task_id: results[task_id] for task_id in task_ids}
     
     def assign_user_to_task(self, task_id: int, user_id: int, assigning_user: User) -> Task:
         """Assign a user to a task."""
@@ -169,7 +398,9 @@ class TaskService:
         if not (is_creator or is_admin_or_lead):
             raise ValueError("You don't have permission to assign users to this task")
         
-        return self.task_repository.assign_user(task_id, user_id)
+        task = self.task_repository.assign_user(task_id, user_id)
+        self._publish(TaskEvent.ASSIGNED, [task], user_id)
+        return task
     
     def unassign_user_from_task(self, task_id: int, user_id: int, assigning_user: User) -> Task:
         """Unassign a user from a task."""
@@ -185,7 +416,9 @@ class TaskService:
         if not (is_creator or is_admin_or_lead or is_self_unassign):
             raise ValueError("You don't have permission to unassign users from this task")
         
-        return self.task_repository.unassign_user(task_id, user_id)
+        task = self.task_repository.unassign_user(task_id, user_id)
+        self._publish(TaskEvent.UNASSIGNED, [task], user_id)
+        return task
     
     def update_task(self, task_id: int, updates: Dict[str, Any], user: User) -> Task:
         """Update multiple fields of a task at once."""
@@ -207,49 +440,85 @@ class TaskService:
             if not is_assigned:
                 raise ValueError("You don't have permission to update this task's status")
         
-        # Update basic fields directly
-        if 'title' in updates:
-            task.title = updates['title']
-        
-        if 'description' in updates:
-            task.description = updates['description']
-        
-        if 'due_date' in updates:
-            task.due_date = updates['due_date']
+        # Collect only the columns whose value actually changes
+        changes = {}
+        for field in ('title', 'description', 'due_date', 'status', 'priority'):
+            if field in updates and updates[field] != getattr(task, field):
+                changes[field] = updates[field]
         
-        # Handle status updates with notification logic
-        if 'status' in updates:
-            old_status = task.status
-            new_status = updates['status']
-            task.update_status(new_status)
-            
-            # Handle completion notification logic
-            if new_status == TaskStatus.COMPLETED and old_status != TaskStatus.COMPLETED:
-                # Get all tech leads for notification
-                tech_leads = self.user_repository.get_all(Role.TECH_LEAD)
-                # Notify the observer
-                self.task_notifier.notify_task_completion(task, tech_leads)
-        
-        # Handle priority updates
-        if 'priority' in updates:
-            task.update_priority(updates['priority'])
-        
-        # Handle assigned users updates
+        # Assignment changes are applied as a diff against the current assignees
+        assign_user_ids = set()
+        unassign_user_ids = set()
         if 'assigned_user_ids' in updates:
-            # Get current assigned user IDs
             current_user_ids = {assigned_user.id for assigned_user in task.assigned_users}
             new_user_ids = set(updates['assigned_user_ids'])
-            
-            # Users to remove
-            for user_id in current_user_ids - new_user_ids:
-                self.task_repository.unassign_user(task_id, user_id)
-            
-            # Users to add
-            for user_id in new_user_ids - current_user_ids:
-                # Verify user exists
-                if not self.user_repository.get_by_id(user_id):
-                    raise ValueError(f"User with ID {user_id} not found")
-                self.task_repository.assign_user(task_id, user_id)
-        
-        # Save the updated task
-        return self.task_repository.update(task) 
\ No newline at end of file
+            assign_user_ids = new_user_ids - current_user_ids
+            unassign_user_ids = current_user_ids - new_user_ids
+        
+        if not (changes or assign_user_ids or unassign_user_ids):
+            return task
+        
+        # Only changed columns are in `changes`, so this is a new completion
+        events = []
+        if changes.get('status') == TaskStatus.COMPLETED:
+            events.append(OutboxEvent.tasks_completed([task_id]))
+        
+        task = self.task_repository.apply_changes(
+            task_id, changes, assign_user_ids, unassign_user_ids, events=events
+        )
+        self._publish(TaskEvent.COMPLETED if events else TaskEvent.UPDATED, [task])
+        return task
+
+
+class AsyncTaskService:
+    """Task reads for the ASGI app, with the same visibility rules as TaskService.
+    
+    Writes stay on TaskService, which records outbox events, change feed
+    positions and live events in the same transaction.
+    """
+    
+    def __init__(self, task_repository: AsyncTaskRepository):
+        self.task_repository = task_repository
+    
+    async def get_tasks(self, query: Optional[TaskQuery] = None, requesting_user: Optional[User] = None) -> List[Task]:
+        """Get tasks matching a query, as visible to the requesting user."""
+        return await self.task_repository.find(scope_task_query(query, requesting_user))
+    
+    async def get_tasks_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        query: Optional[TaskQuery] = None,
+        requesting_user: Optional[User] = None
+    ) -> Page[Task]:
+        """Get one page of tasks matching a query, as visible to the requesting user."""
+        return await self.task_repository.get_page(limit, cursor, scope_task_query(query, requesting_user))
+    
+    def check_page_cursor(self, cursor: str, query: Optional[TaskQuery] = None):
+        """Raise ValueError if the cursor cannot continue a page of the query's tasks."""
+        self.task_repository.check_cursor(cursor, query)
+    
+    async def get_tasks_version(self, query: Optional[TaskQuery] = None, requesting_user: Optional[User] = None) -> str:
+        """Get a tag that changes whenever the tasks visible to the user for a query change."""
+        return await self.task_repository.get_list_version(scope_task_query(query, requesting_user))
+    
+    async def get_task_version(self, task_id: int, user: Optional[User] = None) -> Optional[str]:
+        """Get the version tag of a task, or None if the user cannot see it."""
+        version = await self.task_repository.get_version(task_id)
+        if version is None or (version.status == TaskStatus.COMPLETED and hides_completed(user)):
+            return None
+        return version.tag
+    
+    async def get_task_by_id(self, task_id: int, user: Optional[User] = None) -> Optional[Task]:
+        """Get a task by ID, or None if the user cannot see it."""
+        task = await self.task_repository.get_by_id(task_id)
+        if task and task.status == TaskStatus.COMPLETED and hides_completed(user):
+            return None
+        return task
+    
+    async def get_task_stats(self, requesting_user: Optional[User] = None) -> TaskStats:
+        """Get task counts, as visible to the requesting user."""
+        stats = await self.task_repository.get_stats()
+        if hides_completed(requesting_user):
+            stats = stats.without_statuses(TaskStatus.COMPLETED)
+        return stats
@@ -0,0 +1,44 @@
+from contextlib import asynccontextmanager
+from typing import Optional
+from flask import Flask
+
+from app import create_app
+from app.infrastructure.async_database import async_database_url, create_async_session_factory
+from app.adapters.async_postgresql_repository import AsyncPostgreSQLUserRepository, AsyncPostgreSQLTaskRepository
+from app.application.service import AsyncUserService
+from app.application.task_service import AsyncTaskService
+from app.adapters.api.asgi import AsyncApi
+
+
+def create_asgi_app(flask_app: Optional[Flask] = None):
+    """Create the ASGI application.
+    
+    Hot read endpoints are served natively on the event loop with async
+    repositories; every other request goes to the Flask app, run on a
+    thread pool. Requires the optional ASGI packages (starlette, a2wsgi,
+    an ASGI server and an async database driver).
+    """
+    from a2wsgi import WSGIMiddleware
+    
+    flask_app = flask_app or create_app()
+    config = flask_app.config
+    
+    session_factory = create_async_session_factory(
+        config['ASYNC_DATABASE_URL'] or async_database_url(config['SQLALCHEMY_DATABASE_URI']),
+        pool_size=config['ASYNC_DB_POOL_SIZE'],
+        max_overflow=config['ASYNC_DB_MAX_OVERFLOW']
+    )
+    
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        # Close pooled connections on shutdown
+        await session_factory.kw['bind'].dispose()
+    
+    api = AsyncApi(
+        flask_app,
+        AsyncTaskService(AsyncPostgreSQLTaskRepository(session_factory)),
+        AsyncUserService(AsyncPostgreSQLUserRepository(session_factory)),
+        fallback=WSGIMiddleware(flask_app, workers=config['ASGI_WSGI_THREADS'])
+    )
+    return api.router(lifespan=lifespan)
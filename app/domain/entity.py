@@ -23,13 +23,16 @@ class TaskPriority(Enum):
 class User:
     """User entity."""
     
-    def __init__(self, id=None, name="", email="", role=Role.DEVELOPER, password=None, password_hash=None):
+    __slots__ = ('id', 'name', 'email', 'role', 'password', 'password_hash', 'token_version')
+    
+    def __init__(self, id=None, name="", email="", role=Role.DEVELOPER, password=None, password_hash=None, token_version=0):
         self.id = id
         self.name = name
         self.email = email
         self.role = role
         self.password = password  # Used only for password setting, never stored
         self.password_hash = password_hash  # Stored password hash
+        self.token_version = token_version  # Bumped to invalidate issued tokens
     
     def to_dict(self):
         return {
@@ -56,9 +59,27 @@ class User:
             
         return False
 
+class Principal:
+    """Authenticated caller built from verified token claims, without loading the user."""
+    
+    __slots__ = ('id', 'role')
+    
+    def __init__(self, id, role):
+        self.id = id
+        self.role = role
+    
+    def has_permission(self, action: str, resource: Optional[object] = None) -> bool:
+        """Check if the principal has permission to perform an action on a resource."""
+        return User.has_permission(self, action, resource)
+
 class Task:
     """Task entity."""
     
+    __slots__ = (
+        'id', 'title', 'description', 'status', 'priority',
+        'created_at', 'updated_at', 'due_date', 'assigned_users', 'creator_id'
+    )
+    
     def __init__(
         self,
         id=None,
@@ -77,10 +98,15 @@ class Task:
         self.description = description
         self.status = status
         self.priority = priority
-        self.created_at = created_at if created_at else datetime.now()
-        self.updated_at = updated_at if updated_at else datetime.now()
+        # Only new tasks are stamped; tasks loaded from storage keep their times
+        if created_at is None or updated_at is None:
+            now = datetime.now()
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
         self.due_date = due_date
-        self.assigned_users = assigned_users if assigned_users else []
+        self.assigned_users = assigned_users if assigned_users is not None else []
         self.creator_id = creator_id
     
     def to_dict(self, include_users=True):
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Set
+from typing import Any, Callable, List, Optional, Set
 import logging
+import queue
+import threading
+import time
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -35,6 +38,107 @@ class Subject(ABC):
             observer.update(self, *args, **kwargs)
 
 
+class EventBusFullError(RuntimeError):
+    """Raised when an AsyncSubject's queue stays full for longer than its put timeout."""
+
+
+# Queued by AsyncSubject.stop() to end the dispatcher thread
+_STOP = object()
+
+
+class AsyncSubject(Subject):
+    """Subject that hands notifications to observers on a background thread.
+    
+    Notifications wait in a bounded queue. When it is full, notify() blocks
+    for at most `put_timeout` seconds and then raises EventBusFullError, so
+    producers slow down instead of growing the queue without limit.
+    """
+    
+    def __init__(self, max_queue: int = 1000, put_timeout: float = 0.5):
+        super().__init__()
+        self.max_queue = max_queue
+        self.put_timeout = put_timeout
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def pending(self) -> int:
+        """Number of notifications waiting to be dispatched."""
+        return self._queue.qsize()
+    
+    def is_saturated(self, high_water: float = 0.8) -> bool:
+        """Whether the queue is at least `high_water` full."""
+        return self.pending >= self.max_queue * high_water
+    
+    def start(self):
+        """Start the dispatcher thread if it is not running."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._dispatch, name="event-bus", daemon=True)
+                self._thread.start()
+    
+    def notify(self, *args, **kwargs):
+        """Queue a notification for all observers."""
+        self.start()
+        try:
+            self._queue.put((args, kwargs), timeout=self.put_timeout)
+        except queue.Full:
+            raise EventBusFullError(f"Event bus is full ({self.max_queue} pending notifications)")
+    
+    def _dispatch(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                args, kwargs = item
+                for observer in list(self._observers):
+                    try:
+                        observer.update(self, *args, **kwargs)
+                    except Exception:
+                        logger.exception(f"Observer {type(observer).__name__} failed")
+            finally:
+                self._queue.task_done()
+    
+    def join(self):
+        """Block until every queued notification has been dispatched."""
+        self._queue.join()
+    
+    def stop(self):
+        """Dispatch what is queued, then stop the dispatcher thread."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+
+class CachedRoster:
+    """Recipient list loaded on demand and reused for `ttl` seconds.
+    
+    Saves running the same roster query for every notification.
+    """
+    
+    def __init__(self, load: Callable[[], List[Any]], ttl: float = 60):
+        self.load = load
+        self.ttl = ttl
+        self._members: Optional[List[Any]] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+    
+    def get(self) -> List[Any]:
+        """Return the cached members, reloading them once the TTL has passed."""
+        with self._lock:
+            if self._members is None or time.monotonic() >= self._expires_at:
+                self._members = list(self.load())
+                self._expires_at = time.monotonic() + self.ttl
+            return self._members
+    
+    def invalidate(self):
+        """Force the next get() to reload the roster."""
+        with self._lock:
+            self._members = None
+
+
 class TaskCompletionObserver(Observer):
     """Observer for task completion events."""
     
@@ -46,13 +150,151 @@ class TaskCompletionObserver(Observer):
             logger.info(f"Task '{task.title}' (ID: {task.id}) has been completed!")
             
             # Simulate email sending to tech leads
-            for user in kwargs.get('tech_leads', []):
+            for user in kwargs.get('tech_leads') or []:
                 logger.info(f"Sending email notification to Tech Lead: {user.name} <{user.email}>")
+        
+        tasks = kwargs.get('tasks')
+        if tasks:
+            # Log one notification for the whole batch
+            task_list = ", ".join(f"'{task.title}' (ID: {task.id})" for task in tasks)
+            logger.info(f"{len(tasks)} tasks have been completed: {task_list}")
+            
+            # Simulate a single email per tech lead covering every task
+            for user in kwargs.get('tech_leads') or []:
+                logger.info(f"Sending email notification to Tech Lead: {user.name} <{user.email}> for {len(tasks)} tasks")
                 
 
+class TaskEvent:
+    """A change to a task, published to live subscribers once it is committed."""
+    
+    CREATED = 'created'
+    UPDATED = 'updated'
+    ASSIGNED = 'assigned'
+    UNASSIGNED = 'unassigned'
+    COMPLETED = 'completed'
+    
+    __slots__ = ('event_type', 'task', 'user_id')
+    
+    def __init__(self, event_type: str, task, user_id: Optional[int] = None):
+        self.event_type = event_type
+        self.task = task
+        # The user assigned or unassigned, for assignment events
+        self.user_id = user_id
+
+
 class TaskNotifier(Subject):
     """Subject class for task notifications."""
     
-    def notify_task_completion(self, task, tech_leads):
+    def notify_task_event(self, event: TaskEvent):
+        """Notify observers about a created or changed task.
+        
+        Completion observers ignore these: they only look at `task`/`tasks`.
+        """
+        self.notify(event=event)
+    
+    def notify_task_completion(self, task, tech_leads=None, **context):
         """Notify observers about task completion."""
-        self.notify(task=task, tech_leads=tech_leads) 
\ No newline at end of file
+        self.notify(task=task, tech_leads=tech_leads, **context)
+    
+    def notify_tasks_completion(self, tasks, tech_leads=None, **context):
+        """Notify observers about several tasks completed at once."""
+        self.notify(tasks=tasks, tech_leads=tech_leads, **context)
+
+
+class AsyncTaskNotifier(AsyncSubject, TaskNotifier):
+    """Task notifier whose observers run on the event bus thread."""
+
+
+class DigestCoalescer(Observer):
+    """Observer that batches completed tasks and sends each recipient one digest.
+    
+    A window opens with the first task and closes after `max_wait` seconds
+    or once `max_tasks` tasks are collected, whichever comes first. Digests
+    go to the most recent `tech_leads` passed with a notification, or to the
+    roster when none was passed. Each notification may carry a `token`; the
+    tokens of a window are passed to `on_flush` with the error, if any, once
+    its digests have been sent.
+    """
+    
+    def __init__(
+        self,
+        roster: Optional[CachedRoster] = None,
+        send_digest: Optional[Callable[[Any, List[Any]], None]] = None,
+        max_wait: float = 5.0,
+        max_tasks: int = 100,
+        on_flush: Optional[Callable[[List[Any], Optional[Exception]], None]] = None
+    ):
+        self.roster = roster
+        self.send_digest = send_digest or self._log_digest
+        self.max_wait = max_wait
+        self.max_tasks = max_tasks
+        self.on_flush = on_flush
+        self._tasks: List[Any] = []
+        self._tokens: List[Any] = []
+        self._recipients: Optional[List[Any]] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        # Only one window is sent at a time, in order
+        self._send_lock = threading.Lock()
+    
+    @staticmethod
+    def _log_digest(recipient, tasks):
+        task_list = ", ".join(f"'{task.title}' (ID: {task.id})" for task in tasks)
+        logger.info(f"Sending digest to Tech Lead: {recipient.name} <{recipient.email}> for {len(tasks)} completed tasks: {task_list}")
+    
+    def update(self, subject, *args, **kwargs):
+        """Add the completed task(s) to the current window."""
+        tasks = list(kwargs.get('tasks') or [])
+        if kwargs.get('task'):
+            tasks.append(kwargs['task'])
+        
+        with self._lock:
+            self._tasks.extend(tasks)
+            if kwargs.get('tech_leads') is not None:
+                self._recipients = list(kwargs['tech_leads'])
+            if 'token' in kwargs:
+                self._tokens.append(kwargs['token'])
+            
+            window_full = len(self._tasks) >= self.max_tasks
+            if not window_full and self._timer is None:
+                self._timer = threading.Timer(self.max_wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        
+        if window_full:
+            self.flush()
+    
+    @property
+    def pending(self) -> int:
+        """Number of tasks waiting in the current window."""
+        with self._lock:
+            return len(self._tasks)
+    
+    def flush(self):
+        """Close the current window and send its digests now."""
+        with self._send_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                tasks, self._tasks = self._tasks, []
+                tokens, self._tokens = self._tokens, []
+                recipients = self._recipients
+            
+            if not tasks and not tokens:
+                return
+            
+            error = None
+            try:
+                if tasks:
+                    if recipients is None:
+                        recipients = self.roster.get() if self.roster else []
+                    for recipient in recipients:
+                        self.send_digest(recipient, tasks)
+            except Exception as e:
+                logger.exception("Sending notification digests failed")
+                error = e
+            
+            if self.on_flush:
+                self.on_flush(tokens, error)
+
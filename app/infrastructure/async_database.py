@@ -0,0 +1,32 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Async driver used for each database backend
+ASYNC_DRIVERS = {
+    'postgresql': 'asyncpg',
+    'sqlite': 'aiosqlite',
+}
+
+
+def async_database_url(url: str) -> str:
+    """The same database URL with the async driver of its backend."""
+    scheme, rest = url.split('://', 1)
+    backend = 'postgresql' if scheme == 'postgres' else scheme.split('+')[0]
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return f"{backend}+{driver}://{rest}"
+
+
+def create_async_session_factory(url: str, pool_size: int = 20, max_overflow: int = 10) -> async_sessionmaker:
+    """Build the engine and session factory used by the async repositories.
+    
+    Requires SQLAlchemy's asyncio extra (greenlet) and the driver package
+    of the database (asyncpg or aiosqlite).
+    """
+    options = {}
+    if not url.startswith('sqlite'):
+        options = {'pool_size': pool_size, 'max_overflow': max_overflow, 'pool_pre_ping': True}
+    
+    engine = create_async_engine(url, **options)
+    # Entities are built before the session closes, so nothing is reloaded after commit
+    return async_sessionmaker(engine, expire_on_commit=False)
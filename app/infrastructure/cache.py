@@ -0,0 +1,117 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class CacheBackend(ABC):
+    """Key/value store used by the caching repositories."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a value, or None if it is missing or expired."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any], ttl: float):
+        """Store a value for `ttl` seconds."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove a value if present."""
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Remove every value."""
+        pass
+
+
+class InMemoryLRUCache(CacheBackend):
+    """Process-local, bounded LRU cache with per-entry expiry."""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """Redis-backed cache shared by every worker process."""
+
+    def __init__(self, url: str, prefix: str = "taskmanager:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("The redis cache backend requires the 'redis' package to be installed")
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float):
+        self._client.set(self.prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+
+    def delete(self, key: str):
+        self._client.delete(self.prefix + key)
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self.prefix + "*"):
+            self._client.delete(key)
+
+
+def create_cache_backend(backend: str, max_size: int = 1024, url: Optional[str] = None) -> Optional[CacheBackend]:
+    """Build the cache backend named in the configuration, or None if caching is disabled."""
+    if backend in (None, "", "none"):
+        return None
+
+    if backend == "memory":
+        return InMemoryLRUCache(max_size)
+
+    if backend == "redis":
+        if not url:
+            raise ValueError("The redis cache backend requires a URL")
+        return RedisCache(url)
+
+    raise ValueError(f"Unknown cache backend: {backend}")
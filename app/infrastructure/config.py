@@ -18,4 +18,103 @@ class Config:
     # JWT configuration
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', SECRET_KEY)
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
-    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30) 
\ No newline at end of file
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    
+    # Build the request principal from token claims instead of loading the user
+    # (the token version is still checked against the database on every request)
+    AUTH_CLAIMS_PRINCIPAL = os.getenv('AUTH_CLAIMS_PRINCIPAL', 'false').lower() == 'true'
+    
+    # Password hashing pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR = os.getenv('PASSWORD_HASH_EXECUTOR', 'thread')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+    PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', '32'))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', '10'))
+    
+    # Production server (gunicorn -c gunicorn.conf.py wsgi:app)
+    WEB_WORKERS = int(os.getenv('WEB_WORKERS', str((os.cpu_count() or 1) * 2 + 1)))
+    WEB_THREADS = int(os.getenv('WEB_THREADS', '4'))
+    WEB_TIMEOUT = int(os.getenv('WEB_TIMEOUT', '30'))
+    # Seconds workers get to finish in-flight requests on reload or shutdown
+    WEB_GRACEFUL_TIMEOUT = int(os.getenv('WEB_GRACEFUL_TIMEOUT', '30'))
+    # Restart each worker after this many requests (0 never), with jitter
+    WEB_MAX_REQUESTS = int(os.getenv('WEB_MAX_REQUESTS', '1000'))
+    
+    # Shared Redis for the user cache and live events. With several server
+    # workers they default to it, or are disabled when it is not set:
+    # per-process memory backends would differ between workers
+    REDIS_URL = os.getenv('REDIS_URL')
+    
+    # User lookup cache ("memory", "redis" or "none")
+    USER_CACHE_BACKEND = os.getenv(
+        'USER_CACHE_BACKEND',
+        'memory' if WEB_WORKERS == 1 else ('redis' if REDIS_URL else 'none')
+    )
+    USER_CACHE_MAX_SIZE = int(os.getenv('USER_CACHE_MAX_SIZE', '1024'))
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', '60'))
+    USER_CACHE_REDIS_URL = os.getenv('USER_CACHE_REDIS_URL', REDIS_URL)
+    # Seconds an autocomplete result is reused for the same typed term
+    USER_SUGGEST_CACHE_TTL = int(os.getenv('USER_SUGGEST_CACHE_TTL', '30'))
+    
+    # Outbox worker (flask --app wsgi outbox-worker)
+    OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '100'))
+    OUTBOX_POLL_INTERVAL = float(os.getenv('OUTBOX_POLL_INTERVAL', '1'))
+    OUTBOX_LEASE_SECONDS = float(os.getenv('OUTBOX_LEASE_SECONDS', '60'))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '10'))
+    
+    # Completion digests: each tech lead gets one message per window
+    # (keep the window well below OUTBOX_LEASE_SECONDS)
+    NOTIFY_DIGEST_WINDOW = float(os.getenv('NOTIFY_DIGEST_WINDOW', '5'))
+    NOTIFY_DIGEST_MAX_TASKS = int(os.getenv('NOTIFY_DIGEST_MAX_TASKS', '100'))
+    NOTIFY_QUEUE_SIZE = int(os.getenv('NOTIFY_QUEUE_SIZE', '1000'))
+    TECH_LEAD_ROSTER_TTL = float(os.getenv('TECH_LEAD_ROSTER_TTL', '60'))
+    
+    # Database connections one instance may hold across all its workers;
+    # each worker's pool gets an even share
+    DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', '80'))
+    
+    # Database pool; size and overflow override the share derived above
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE')) if os.getenv('DB_POOL_SIZE') else None
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW')) if os.getenv('DB_MAX_OVERFLOW') else None
+    # Seconds a request waits for a free connection before failing
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+    # Replace connections older than this many seconds (-1 never)
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    # Log pool counters every this many seconds (0 never) and checkouts slower than DB_POOL_SLOW_CHECKOUT
+    DB_POOL_REPORT_INTERVAL = float(os.getenv('DB_POOL_REPORT_INTERVAL', '60'))
+    DB_POOL_SLOW_CHECKOUT = float(os.getenv('DB_POOL_SLOW_CHECKOUT', '0.1'))
+    
+    # Response JSON encoder ("auto" uses orjson when installed, "orjson" or "stdlib")
+    JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto')
+    
+    # Live task events on /tasks/events ("memory", "redis" for several workers, or "none")
+    LIVE_EVENTS_BACKEND = os.getenv(
+        'LIVE_EVENTS_BACKEND',
+        'memory' if WEB_WORKERS == 1 else ('redis' if REDIS_URL else 'none')
+    )
+    LIVE_EVENTS_REDIS_URL = os.getenv('LIVE_EVENTS_REDIS_URL', REDIS_URL)
+    # Seconds to wait on Redis, and events queued for it, before dropping them
+    LIVE_EVENTS_REDIS_TIMEOUT = float(os.getenv('LIVE_EVENTS_REDIS_TIMEOUT', '1'))
+    LIVE_EVENTS_PUBLISH_QUEUE = int(os.getenv('LIVE_EVENTS_PUBLISH_QUEUE', '1000'))
+    # Frames buffered per subscriber before it is dropped as too slow
+    LIVE_EVENTS_QUEUE_SIZE = int(os.getenv('LIVE_EVENTS_QUEUE_SIZE', '100'))
+    # Open streams per process; each one holds a worker thread, so by default
+    # half of a worker's threads are left for other requests
+    LIVE_EVENTS_MAX_SUBSCRIBERS = int(os.getenv('LIVE_EVENTS_MAX_SUBSCRIBERS', str(max(1, WEB_THREADS // 2))))
+    LIVE_EVENTS_HEARTBEAT = float(os.getenv('LIVE_EVENTS_HEARTBEAT', '15'))
+    
+    # ASGI mode (uvicorn asgi:app): async reads use their own pool, derived
+    # from DATABASE_URL with the asyncpg/aiosqlite driver unless set here
+    ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL')
+    ASYNC_DB_POOL_SIZE = int(os.getenv('ASYNC_DB_POOL_SIZE', '20'))
+    ASYNC_DB_MAX_OVERFLOW = int(os.getenv('ASYNC_DB_MAX_OVERFLOW', '10'))
+    # Threads running the Flask app for requests not served natively
+    ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', '10'))
+    
+    # Per-request SQL profiling: share of requests profiled (0 off, 1 every
+    # request), and runs of one statement shape in a request flagged as N+1
+    QUERY_PROFILER_SAMPLE_RATE = float(os.getenv('QUERY_PROFILER_SAMPLE_RATE', '0'))
+    QUERY_PROFILER_REPEAT_THRESHOLD = int(os.getenv('QUERY_PROFILER_REPEAT_THRESHOLD', '5'))
+    
+    # Rows fetched per round trip when streaming task listings
+    STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', '500'))
@@ -1,12 +1,59 @@
+import click
+from typing import Tuple
 from flask_sqlalchemy import SQLAlchemy
+from app.infrastructure.pool_monitor import MonitoredQueuePool, PoolMonitor
 
 # SQLAlchemy instance
 db = SQLAlchemy()
 
+def worker_pool_size(workers: int, threads: int, max_connections: int) -> Tuple[int, int]:
+    """Pool size and overflow for one server worker process.
+
+    The workers split `max_connections` evenly. Each one keeps a pooled
+    connection per thread, up to its share, and may open the rest of its
+    share as overflow.
+    """
+    share = max(1, max_connections // max(1, workers))
+    pool_size = min(max(1, threads), share)
+    return pool_size, share - pool_size
+
 def init_db(app):
-    """Initialize the database with the app."""
+    """Initialize the database with the app.
+
+    The schema is managed by versioned migrations, applied with
+    `flask --app wsgi migrate` as a separate deployment step.
+    """
+    config = app.config
+    # SQLite uses its own pools, which take no size
+    if not config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        pool_size, max_overflow = worker_pool_size(
+            config['WEB_WORKERS'],
+            config['WEB_THREADS'],
+            config['DB_MAX_CONNECTIONS']
+        )
+        config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'poolclass': MonitoredQueuePool,
+            'pool_size': pool_size if config['DB_POOL_SIZE'] is None else config['DB_POOL_SIZE'],
+            'max_overflow': max_overflow if config['DB_MAX_OVERFLOW'] is None else config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+            'pool_recycle': config['DB_POOL_RECYCLE'],
+            'pool_pre_ping': config['DB_POOL_PRE_PING'],
+            **config.get('SQLALCHEMY_ENGINE_OPTIONS', {}),
+        }
     db.init_app(app)
-    
-    # Create tables
+
+    pool_monitor = PoolMonitor(config['DB_POOL_REPORT_INTERVAL'], config['DB_POOL_SLOW_CHECKOUT'])
     with app.app_context():
-        db.create_all() 
\ No newline at end of file
+        pool_monitor.attach(db.engine)
+    app.extensions['pool_monitor'] = pool_monitor
+
+    @app.cli.command('migrate')
+    def migrate_command():
+        """Apply pending database migrations."""
+        from app.infrastructure.migrations import upgrade
+
+        applied = upgrade(db.engine)
+        for name in applied:
+            click.echo(f"Applied {name}")
+        if not applied:
+            click.echo("Database is up to date")
@@ -0,0 +1,295 @@
+import json
+import logging
+import os
+import queue
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriberLimitError(RuntimeError):
+    """Raised when a new subscription would exceed the broker's subscriber limit."""
+
+
+class BrokerMessage:
+    """An event ready to be written to subscribers.
+
+    `frame` is sent to subscribers allowed `permission` (everyone when it is
+    None); the others get `fallback`, or nothing when it is None. Frames are
+    encoded once by the publisher, never per subscriber.
+    """
+
+    __slots__ = ('frame', 'permission', 'fallback')
+
+    def __init__(self, frame: str, permission: Optional[str] = None, fallback: Optional[str] = None):
+        self.frame = frame
+        self.permission = permission
+        self.fallback = fallback
+
+    def encode(self) -> str:
+        return json.dumps([self.frame, self.permission, self.fallback])
+
+    @classmethod
+    def decode(cls, raw) -> 'BrokerMessage':
+        return cls(*json.loads(raw))
+
+
+class Subscription:
+    """One subscriber's bounded queue of frames.
+
+    Messages are offered without blocking. A subscriber whose queue is full
+    is marked as overflowed and dropped by the broker, so a slow consumer
+    never holds up publishers; it is expected to reconnect and resync.
+    """
+
+    def __init__(self, broker: 'EventBroker', allows: Callable[[str], bool], max_queue: int):
+        self.broker = broker
+        self.allows = allows
+        self.overflowed = False
+        self.closed = False
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+
+    def offer(self, message: BrokerMessage) -> bool:
+        """Queue the frame this subscriber may see; False if the queue is full."""
+        if message.permission is None or self.allows(message.permission):
+            frame = message.frame
+        else:
+            frame = message.fallback
+        if frame is None:
+            return True
+
+        try:
+            self._queue.put_nowait(frame)
+            return True
+        except queue.Full:
+            self.overflowed = True
+            return False
+
+    def get(self, timeout: float, max_frames: int = 1) -> List[str]:
+        """Wait up to `timeout` seconds for a frame, then take up to `max_frames` queued ones.
+
+        Returns an empty list if nothing arrived in time.
+        """
+        try:
+            frames = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        while len(frames) < max_frames:
+            try:
+                frames.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return frames
+
+    def shut_down(self):
+        """End the stream soon: mark it closed and wake up a reader waiting for frames."""
+        self.closed = True
+        try:
+            self._queue.put_nowait('')
+        except queue.Full:
+            pass
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class FanoutBackend(ABC):
+    """Carries published messages to the broker of every process."""
+
+    @abstractmethod
+    def start(self, dispatch: Callable[[BrokerMessage], None]):
+        """Start delivering messages to `dispatch`."""
+        pass
+
+    @abstractmethod
+    def publish(self, message: BrokerMessage):
+        """Send a message to every process, including this one."""
+        pass
+
+    def close(self):
+        """Stop delivering messages."""
+        pass
+
+
+class InMemoryFanout(FanoutBackend):
+    """Delivers messages within this process only."""
+
+    def __init__(self):
+        self._dispatch: Optional[Callable[[BrokerMessage], None]] = None
+
+    def start(self, dispatch: Callable[[BrokerMessage], None]):
+        self._dispatch = dispatch
+
+    def publish(self, message: BrokerMessage):
+        if self._dispatch is not None:
+            self._dispatch(message)
+
+
+class RedisFanout(FanoutBackend):
+    """Delivers messages to every worker process through a Redis pub/sub channel.
+
+    Each process listens on a background thread. Writers only queue their
+    messages: another thread publishes them, so a slow or unreachable Redis
+    never blocks a request. Messages published while the connection is down,
+    or beyond `max_pending`, are lost; subscribers resync on reconnect.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        channel: str = "taskmanager:task-events",
+        retry_seconds: float = 1.0,
+        timeout: float = 1.0,
+        max_pending: int = 1000
+    ):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("The redis event backend requires the 'redis' package to be installed")
+
+        self.channel = channel
+        self.retry_seconds = retry_seconds
+        self.dropped = 0
+        self._client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self._pending: "queue.Queue[BrokerMessage]" = queue.Queue(maxsize=max_pending)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._publisher: Optional[threading.Thread] = None
+        self._dispatch: Optional[Callable[[BrokerMessage], None]] = None
+
+    def start(self, dispatch: Callable[[BrokerMessage], None]):
+        self._dispatch = dispatch
+        self._start_threads()
+        # Threads do not survive a fork: workers of a preloading server start their own
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._start_threads)
+
+    def _start_threads(self):
+        self._thread = threading.Thread(target=self._listen, args=(self._dispatch,), name="event-fanout", daemon=True)
+        self._thread.start()
+        self._publisher = threading.Thread(target=self._send_pending, name="event-publisher", daemon=True)
+        self._publisher.start()
+
+    def _listen(self, dispatch: Callable[[BrokerMessage], None]):
+        while not self._stop.is_set():
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                while not self._stop.is_set():
+                    item = pubsub.get_message(timeout=1.0)
+                    if item is not None:
+                        dispatch(BrokerMessage.decode(item['data']))
+            except Exception:
+                logger.exception("Event fan-out connection failed; reconnecting")
+                self._stop.wait(self.retry_seconds)
+            finally:
+                pubsub.close()
+
+    def _send_pending(self):
+        while not self._stop.is_set():
+            try:
+                message = self._pending.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            try:
+                self._client.publish(self.channel, message.encode())
+            except Exception:
+                self.dropped += 1
+                logger.exception("Could not publish a task event to Redis; dropping it")
+
+    def publish(self, message: BrokerMessage):
+        try:
+            self._pending.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Dropping task event: {self._pending.maxsize} events already waiting for Redis")
+
+    def close(self):
+        self._stop.set()
+
+
+class EventBroker:
+    """In-process fan-out of published messages to subscriber queues."""
+
+    def __init__(self, backend: FanoutBackend, max_queue: int = 100, max_subscribers: int = 100):
+        self.backend = backend
+        self.max_queue = max_queue
+        self.max_subscribers = max_subscribers
+        self.dropped = 0
+        self.closed = False
+        self._subscribers: Set[Subscription] = set()
+        # Immutable copy read by dispatch() without taking the lock
+        self._snapshot: Tuple[Subscription, ...] = ()
+        self._lock = threading.Lock()
+        backend.start(self.dispatch)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._snapshot)
+
+    def subscribe(self, allows: Callable[[str], bool]) -> Subscription:
+        """Register a subscriber; `allows(permission)` decides which frames it gets."""
+        with self._lock:
+            if self.closed:
+                raise SubscriberLimitError("The server is shutting down, reconnect to another worker")
+            if len(self._subscribers) >= self.max_subscribers:
+                raise SubscriberLimitError("Too many event stream subscribers, try again later")
+            subscription = Subscription(self, allows, self.max_queue)
+            self._subscribers.add(subscription)
+            self._snapshot = tuple(self._subscribers)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+            self._snapshot = tuple(self._subscribers)
+
+    def publish(self, message: BrokerMessage):
+        """Send a message to the subscribers of every process."""
+        self.backend.publish(message)
+
+    def dispatch(self, message: BrokerMessage):
+        """Offer a message to this process's subscribers, dropping those that are full."""
+        for subscription in self._snapshot:
+            if not subscription.offer(message):
+                self.dropped += 1
+                logger.warning(f"Dropping slow event subscriber ({self.max_queue} frames pending)")
+                self.unsubscribe(subscription)
+
+    def shut_down_subscribers(self):
+        """Refuse new subscribers and end every open stream, so a stopping worker can drain.
+
+        Takes no lock: it may run in a signal handler.
+        """
+        self.closed = True
+        for subscription in self._snapshot:
+            subscription.shut_down()
+
+    def close(self):
+        self.backend.close()
+
+
+def create_event_broker(
+    backend: str,
+    url: Optional[str] = None,
+    max_queue: int = 100,
+    max_subscribers: int = 100,
+    timeout: float = 1.0,
+    max_pending: int = 1000
+) -> Optional[EventBroker]:
+    """Build the event broker named in the configuration, or None if live events are disabled."""
+    if backend in (None, "", "none"):
+        return None
+
+    if backend == "memory":
+        return EventBroker(InMemoryFanout(), max_queue, max_subscribers)
+
+    if backend == "redis":
+        if not url:
+            raise ValueError("The redis event backend requires a URL")
+        return EventBroker(RedisFanout(url, timeout=timeout, max_pending=max_pending), max_queue, max_subscribers)
+
+    raise ValueError(f"Unknown event backend: {backend}")
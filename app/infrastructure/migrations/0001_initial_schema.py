@@ -0,0 +1,37 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text
+
+
+def upgrade(connection):
+    """Create the original users, tasks and task_users tables if they do not exist yet."""
+    metadata = MetaData()
+
+    Table(
+        'users', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(100), nullable=False),
+        Column('email', String(255), nullable=False, unique=True),
+        Column('role', String(50), nullable=False),
+        Column('password_hash', String(255), nullable=False),
+    )
+
+    Table(
+        'tasks', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('title', String(200), nullable=False),
+        Column('description', Text, nullable=True),
+        Column('status', String(50), nullable=False),
+        Column('priority', String(50), nullable=False),
+        Column('created_at', DateTime, nullable=False),
+        Column('updated_at', DateTime, nullable=False),
+        Column('due_date', DateTime, nullable=True),
+        Column('creator_id', Integer, ForeignKey('users.id'), nullable=False),
+    )
+
+    Table(
+        'task_users', metadata,
+        Column('task_id', Integer, ForeignKey('tasks.id'), primary_key=True),
+        Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
+    )
+
+    # Databases created by the old db.create_all() on boot already have these
+    metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,10 @@
+from sqlalchemy import inspect, text
+
+
+def upgrade(connection):
+    """Add users.token_version, used to invalidate issued tokens."""
+    columns = {column['name'] for column in inspect(connection).get_columns('users')}
+    if 'token_version' not in columns:
+        connection.execute(text(
+            'ALTER TABLE users ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0'
+        ))
@@ -0,0 +1,28 @@
+from sqlalchemy import text
+
+# Each index matches a predicate or ordering used by the repositories
+INDEXES = [
+    # Keyset pagination and default listing order: ORDER BY created_at DESC, id DESC
+    'CREATE INDEX IF NOT EXISTS ix_tasks_created_at_id ON tasks (created_at, id)',
+    # Default listing for roles that cannot see completed tasks
+    "CREATE INDEX IF NOT EXISTS ix_tasks_open_created_at_id ON tasks (created_at, id) WHERE status <> 'Completada'",
+    # Status / priority filters, still in listing order
+    'CREATE INDEX IF NOT EXISTS ix_tasks_status_created_at_id ON tasks (status, created_at, id)',
+    'CREATE INDEX IF NOT EXISTS ix_tasks_priority_created_at_id ON tasks (priority, created_at, id)',
+    # creator_id filter and the tasks.creator_id foreign key
+    'CREATE INDEX IF NOT EXISTS ix_tasks_creator_id ON tasks (creator_id)',
+    # Due-date ranges only ever match tasks that have a due date
+    'CREATE INDEX IF NOT EXISTS ix_tasks_due_date ON tasks (due_date) WHERE due_date IS NOT NULL',
+    # updated_since filter
+    'CREATE INDEX IF NOT EXISTS ix_tasks_updated_at ON tasks (updated_at)',
+    # Tasks assigned to a user; the primary key only covers (task_id, user_id)
+    'CREATE INDEX IF NOT EXISTS ix_task_users_user_id_task_id ON task_users (user_id, task_id)',
+    # Tech lead roster fetched on every completion
+    'CREATE INDEX IF NOT EXISTS ix_users_role ON users (role)',
+]
+
+
+def upgrade(connection):
+    """Create the secondary indexes used by the task and user query paths."""
+    for statement in INDEXES:
+        connection.execute(text(statement))
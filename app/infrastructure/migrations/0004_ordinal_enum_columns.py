@@ -0,0 +1,72 @@
+from sqlalchemy import text
+
+# Frozen copy of the label -> code mapping at the time of this migration.
+# Later changes to ORDINAL_CODES must not change what this migration does.
+CODES = {
+    ('users', 'role'): {
+        'Desarrollador': 1,
+        'Líder Técnico': 2,
+        'Administrador': 3,
+    },
+    ('tasks', 'status'): {
+        'Pendiente': 1,
+        'En Progreso': 2,
+        'Bloqueada': 3,
+        'En Revisión': 4,
+        'Completada': 5,
+    },
+    ('tasks', 'priority'): {
+        'Baja': 1,
+        'Media': 2,
+        'Alta': 3,
+        'Urgente': 4,
+    },
+}
+
+# Indexes over the converted columns, rebuilt once the columns are SMALLINT
+DROPPED_INDEXES = [
+    'ix_tasks_open_created_at_id',
+    'ix_tasks_status_created_at_id',
+    'ix_tasks_priority_created_at_id',
+    'ix_users_role',
+]
+
+INDEXES = [
+    # 5 = Completada
+    'CREATE INDEX IF NOT EXISTS ix_tasks_open_created_at_id ON tasks (created_at, id) WHERE status <> 5',
+    'CREATE INDEX IF NOT EXISTS ix_tasks_status_created_at_id ON tasks (status, created_at, id)',
+    'CREATE INDEX IF NOT EXISTS ix_tasks_priority_created_at_id ON tasks (priority, created_at, id)',
+    'CREATE INDEX IF NOT EXISTS ix_users_role ON users (role)',
+]
+
+
+def _case(column, codes):
+    """SQL expression mapping each stored label to its code."""
+    branches = ' '.join(
+        f"WHEN '{label}' THEN {code}" for label, code in codes.items()
+    )
+    return f'CASE {column} {branches} END'
+
+
+def upgrade(connection):
+    """Store role, status and priority as SMALLINT codes instead of labels."""
+    for name in DROPPED_INDEXES:
+        connection.execute(text(f'DROP INDEX IF EXISTS {name}'))
+
+    for (table, column), codes in CODES.items():
+        expression = _case(column, codes)
+        if connection.dialect.name == 'postgresql':
+            connection.execute(text(
+                f'ALTER TABLE {table} ALTER COLUMN {column} TYPE SMALLINT USING {expression}'
+            ))
+        else:
+            # Backends without ALTER COLUMN ... TYPE: copy into a new column and swap
+            connection.execute(text(
+                f'ALTER TABLE {table} ADD COLUMN {column}_code SMALLINT NOT NULL DEFAULT 0'
+            ))
+            connection.execute(text(f'UPDATE {table} SET {column}_code = {expression}'))
+            connection.execute(text(f'ALTER TABLE {table} DROP COLUMN {column}'))
+            connection.execute(text(f'ALTER TABLE {table} RENAME COLUMN {column}_code TO {column}'))
+
+    for statement in INDEXES:
+        connection.execute(text(statement))
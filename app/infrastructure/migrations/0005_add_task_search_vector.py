@@ -0,0 +1,27 @@
+from sqlalchemy import text
+
+# Must match TEXT_SEARCH_CONFIG in app.adapters.task_search
+TEXT_SEARCH_CONFIG = 'spanish'
+
+
+def upgrade(connection):
+    """Add the full-text search column and its GIN index to tasks.
+
+    Only PostgreSQL gets the index; other backends search with LIKE and
+    need no schema change.
+    """
+    if connection.dialect.name != 'postgresql':
+        return
+
+    # A generated column is maintained by PostgreSQL on every insert and update.
+    # Title matches weigh more than description matches when ranking.
+    connection.execute(text(f"""
+        ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(description, '')), 'B')
+        ) STORED
+    """))
+    connection.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)'
+    ))
@@ -0,0 +1,23 @@
+from sqlalchemy import text
+
+INDEXES = [
+    # Substring (ILIKE '%term%') matches for terms of 3 or more characters
+    'CREATE INDEX IF NOT EXISTS ix_users_name_trgm ON users USING GIN (name gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING GIN (email gin_trgm_ops)',
+    # Prefix (lower(x) LIKE 'term%') matches, used for shorter terms and ranking
+    'CREATE INDEX IF NOT EXISTS ix_users_name_prefix ON users (lower(name) text_pattern_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_users_email_prefix ON users (lower(email) text_pattern_ops)',
+]
+
+
+def upgrade(connection):
+    """Add the trigram and prefix indexes behind user autocomplete.
+
+    Only PostgreSQL gets them; other backends fall back to unindexed LIKE.
+    """
+    if connection.dialect.name != 'postgresql':
+        return
+
+    connection.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    for statement in INDEXES:
+        connection.execute(text(statement))
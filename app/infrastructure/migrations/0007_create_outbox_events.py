@@ -0,0 +1,24 @@
+from sqlalchemy import JSON, Column, DateTime, Integer, MetaData, String, Table, Text, text
+
+
+def upgrade(connection):
+    """Create the outbox table drained by the background worker."""
+    metadata = MetaData()
+
+    Table(
+        'outbox_events', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('event_type', String(100), nullable=False),
+        Column('payload', JSON, nullable=False),
+        Column('created_at', DateTime, nullable=False),
+        Column('available_at', DateTime, nullable=True),
+        Column('attempts', Integer, nullable=False, server_default='0'),
+        Column('last_error', Text, nullable=True),
+    )
+    metadata.create_all(connection, checkfirst=True)
+
+    # Workers poll for due events; parked events (available_at NULL) stay out of the index
+    connection.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_outbox_events_available_at ON outbox_events (available_at, id) '
+        'WHERE available_at IS NOT NULL'
+    ))
@@ -0,0 +1,119 @@
+from sqlalchemy import Column, Integer, MetaData, PrimaryKeyConstraint, SmallInteger, Table, text
+
+# Frozen status and priority codes at the time of this migration (see 0004)
+STATUS_CODES = range(1, 6)
+PRIORITY_CODES = range(1, 5)
+
+# Statements run by each trigger. OLD and NEW are the changed tasks or
+# task_users row; the same SQL is valid on PostgreSQL and SQLite.
+_ASSIGNEES = 'SELECT user_id FROM task_users WHERE task_id = {row}.id'
+
+TRIGGERS = {
+    'task_stats_insert': ('AFTER INSERT ON tasks', None, [
+        'UPDATE task_stats SET task_count = task_count + 1 '
+        'WHERE status = NEW.status AND priority = NEW.priority',
+    ]),
+    'task_stats_update': (
+        'AFTER UPDATE OF status, priority ON tasks',
+        'OLD.status <> NEW.status OR OLD.priority <> NEW.priority',
+        [
+            'UPDATE task_stats SET task_count = task_count - 1 '
+            'WHERE status = OLD.status AND priority = OLD.priority',
+            'UPDATE task_stats SET task_count = task_count + 1 '
+            'WHERE status = NEW.status AND priority = NEW.priority',
+            'UPDATE task_assignee_stats SET task_count = task_count - 1 '
+            f'WHERE status = OLD.status AND user_id IN ({_ASSIGNEES.format(row="OLD")})',
+            'INSERT INTO task_assignee_stats (user_id, status, task_count) '
+            'SELECT user_id, NEW.status, 0 FROM task_users WHERE task_id = NEW.id '
+            'ON CONFLICT DO NOTHING',
+            'UPDATE task_assignee_stats SET task_count = task_count + 1 '
+            f'WHERE status = NEW.status AND user_id IN ({_ASSIGNEES.format(row="NEW")})',
+        ]
+    ),
+    'task_stats_delete': ('AFTER DELETE ON tasks', None, [
+        'UPDATE task_stats SET task_count = task_count - 1 '
+        'WHERE status = OLD.status AND priority = OLD.priority',
+        # Assignments are normally deleted first, and counted out by task_assignee_stats_delete
+        'UPDATE task_assignee_stats SET task_count = task_count - 1 '
+        f'WHERE status = OLD.status AND user_id IN ({_ASSIGNEES.format(row="OLD")})',
+    ]),
+    'task_assignee_stats_insert': ('AFTER INSERT ON task_users', None, [
+        'INSERT INTO task_assignee_stats (user_id, status, task_count) '
+        'SELECT NEW.user_id, status, 0 FROM tasks WHERE id = NEW.task_id '
+        'ON CONFLICT DO NOTHING',
+        'UPDATE task_assignee_stats SET task_count = task_count + 1 '
+        'WHERE user_id = NEW.user_id AND status = (SELECT status FROM tasks WHERE id = NEW.task_id)',
+    ]),
+    'task_assignee_stats_delete': ('AFTER DELETE ON task_users', None, [
+        # No-op when the task itself is already gone
+        'UPDATE task_assignee_stats SET task_count = task_count - 1 '
+        'WHERE user_id = OLD.user_id AND status = (SELECT status FROM tasks WHERE id = OLD.task_id)',
+    ]),
+}
+
+
+def _create_trigger(connection, name, event, condition, statements):
+    when = f' WHEN ({condition})' if condition else ''
+    body = ''.join(f'{statement}; ' for statement in statements)
+
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text(
+            f'CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS '
+            f'$$ BEGIN {body}RETURN NULL; END $$'
+        ))
+        connection.execute(text(f'DROP TRIGGER IF EXISTS {name} ON {event.split()[-1]}'))
+        connection.execute(text(f'CREATE TRIGGER {name} {event} FOR EACH ROW{when} EXECUTE FUNCTION {name}()'))
+    else:
+        connection.execute(text(f'DROP TRIGGER IF EXISTS {name}'))
+        connection.execute(text(f'CREATE TRIGGER {name} {event} FOR EACH ROW{when} BEGIN {body}END'))
+
+
+def upgrade(connection):
+    """Create task counters kept current by triggers in the writing transaction."""
+    metadata = MetaData()
+
+    # One row per (status, priority) pair, so totals are sums over at most 20 rows
+    Table(
+        'task_stats', metadata,
+        Column('status', SmallInteger, nullable=False),
+        Column('priority', SmallInteger, nullable=False),
+        Column('task_count', Integer, nullable=False, server_default='0'),
+        PrimaryKeyConstraint('status', 'priority'),
+    )
+    Table(
+        'task_assignee_stats', metadata,
+        Column('user_id', Integer, nullable=False),
+        Column('status', SmallInteger, nullable=False),
+        Column('task_count', Integer, nullable=False, server_default='0'),
+        PrimaryKeyConstraint('user_id', 'status'),
+    )
+    metadata.create_all(connection, checkfirst=True)
+
+    # Triggers first: on PostgreSQL creating them locks out writers until the
+    # backfill below commits, so no change is missed or counted twice
+    for name, (event, condition, statements) in TRIGGERS.items():
+        _create_trigger(connection, name, event, condition, statements)
+
+    connection.execute(text('DELETE FROM task_stats'))
+    connection.execute(text('DELETE FROM task_assignee_stats'))
+
+    counts = {
+        (row.status, row.priority): row.task_count
+        for row in connection.execute(text(
+            'SELECT status, priority, COUNT(*) AS task_count FROM tasks GROUP BY status, priority'
+        ))
+    }
+    connection.execute(
+        text('INSERT INTO task_stats (status, priority, task_count) VALUES (:status, :priority, :task_count)'),
+        [
+            {'status': status, 'priority': priority, 'task_count': counts.get((status, priority), 0)}
+            for status in STATUS_CODES
+            for priority in PRIORITY_CODES
+        ]
+    )
+    connection.execute(text(
+        'INSERT INTO task_assignee_stats (user_id, status, task_count) '
+        'SELECT task_users.user_id, tasks.status, COUNT(*) FROM task_users '
+        'JOIN tasks ON tasks.id = task_users.task_id '
+        'GROUP BY task_users.user_id, tasks.status'
+    ))
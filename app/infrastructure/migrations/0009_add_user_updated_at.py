@@ -0,0 +1,12 @@
+from sqlalchemy import inspect, text
+
+
+def upgrade(connection):
+    """Record when each user last changed, so responses embedding users can be validated."""
+    columns = {column['name'] for column in inspect(connection).get_columns('users')}
+    if 'updated_at' not in columns:
+        connection.execute(text('ALTER TABLE users ADD COLUMN updated_at TIMESTAMP'))
+        connection.execute(text('UPDATE users SET updated_at = CURRENT_TIMESTAMP'))
+
+    # max(updated_at) is read by every conditional GET
+    connection.execute(text('CREATE INDEX IF NOT EXISTS ix_users_updated_at ON users (updated_at)'))
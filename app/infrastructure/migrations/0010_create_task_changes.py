@@ -0,0 +1,40 @@
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Integer, MetaData, Table, text
+
+
+def upgrade(connection):
+    """Create the task change feed and give every existing task a position in it."""
+    metadata = MetaData()
+
+    # One row per task, at the position of its latest change. Rows of deleted
+    # tasks stay behind as tombstones, so there is no foreign key.
+    Table(
+        'task_changes', metadata,
+        Column('task_id', Integer, primary_key=True),
+        Column('seq', BigInteger, nullable=True, unique=True),
+        Column('deleted', Boolean, nullable=False, server_default='0'),
+        Column('changed_at', DateTime, nullable=False),
+    )
+    Table(
+        'task_change_sequence', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('last_seq', BigInteger, nullable=False),
+    )
+    metadata.create_all(connection, checkfirst=True)
+
+    # Changes written since the last feed read, waiting for a position
+    connection.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_task_changes_pending ON task_changes (changed_at, task_id) '
+        'WHERE seq IS NULL'
+    ))
+
+    if connection.execute(text('SELECT COUNT(*) FROM task_change_sequence')).scalar():
+        return
+
+    connection.execute(text(
+        'INSERT INTO task_changes (task_id, seq, deleted, changed_at) '
+        'SELECT id, ROW_NUMBER() OVER (ORDER BY updated_at, id), false, updated_at FROM tasks'
+    ))
+    connection.execute(text(
+        'INSERT INTO task_change_sequence (id, last_seq) '
+        'SELECT 1, COALESCE(MAX(seq), 0) FROM task_changes'
+    ))
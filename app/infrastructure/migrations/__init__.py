@@ -0,0 +1,78 @@
+"""Versioned schema migrations.
+
+Each migration is a module in this package named ``NNNN_description.py``
+that defines ``upgrade(connection)``. Migrations run in version order, each
+in its own transaction, and applied versions are recorded in the
+``schema_migrations`` table.
+"""
+import importlib
+import pkgutil
+import re
+from datetime import datetime
+from typing import List, Tuple
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select, text
+
+# Arbitrary key for the PostgreSQL advisory lock held while migrating
+_LOCK_KEY = 8151623
+
+_metadata = MetaData()
+schema_migrations = Table(
+    'schema_migrations',
+    _metadata,
+    Column('version', Integer, primary_key=True),
+    Column('name', String(255), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+def available_migrations() -> List[Tuple[int, str]]:
+    """List (version, module name) of every migration, in order."""
+    migrations = []
+    for module in pkgutil.iter_modules(__path__):
+        match = re.match(r'^(\d{4})_\w+$', module.name)
+        if match:
+            migrations.append((int(match.group(1)), module.name))
+    return sorted(migrations)
+
+
+def applied_versions(engine) -> set:
+    """Versions already recorded in the database."""
+    with engine.begin() as connection:
+        schema_migrations.create(connection, checkfirst=True)
+        return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations(engine) -> List[Tuple[int, str]]:
+    """Migrations that have not been applied yet."""
+    applied = applied_versions(engine)
+    return [migration for migration in available_migrations() if migration[0] not in applied]
+
+
+def upgrade(engine) -> List[str]:
+    """Apply every pending migration and return the names applied."""
+    applied = []
+    is_postgresql = engine.dialect.name == 'postgresql'
+
+    with engine.connect() as lock_connection:
+        # Serialize concurrent migrators (e.g. several containers starting at once)
+        if is_postgresql:
+            lock_connection.execute(text('SELECT pg_advisory_lock(:key)'), {'key': _LOCK_KEY})
+            lock_connection.commit()
+
+        try:
+            for version, name in pending_migrations(engine):
+                module = importlib.import_module(f'{__name__}.{name}')
+                with engine.begin() as connection:
+                    module.upgrade(connection)
+                    connection.execute(schema_migrations.insert().values(
+                        version=version,
+                        name=name,
+                        applied_at=datetime.now()
+                    ))
+                applied.append(name)
+        finally:
+            if is_postgresql:
+                lock_connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': _LOCK_KEY})
+                lock_connection.commit()
+
+    return applied
@@ -0,0 +1,59 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from passlib.hash import bcrypt
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """Raised when too much password work is already queued."""
+
+
+def _hash(password: str) -> str:
+    return bcrypt.hash(password)
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    return bcrypt.verify(password, password_hash)
+
+
+class BoundedPasswordHasher:
+    """Runs bcrypt on a dedicated pool with a bounded queue.
+
+    At most `max_workers` hashes run at once and at most `max_queue` more may
+    wait. Beyond that, calls fail immediately with PasswordHasherBusyError so
+    a login burst cannot hold every request worker on CPU-bound work.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 32, timeout: float = 10.0, use_processes: bool = False):
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._executor = executor_class(max_workers=max_workers)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusyError("Too many authentication requests, try again later")
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise PasswordHasherBusyError("Timed out waiting for password hashing")
+
+    def hash(self, password: str) -> str:
+        """Hash a password using bcrypt."""
+        return self._run(_hash, password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """Verify a password against a hash."""
+        return self._run(_verify, password, password_hash)
+
+    def shutdown(self):
+        """Stop the pool, waiting for running work to finish."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMonitor:
+    """Counters for one process's database connection pool.
+
+    Checkout waits and timeouts are timed by MonitoredQueuePool; connections
+    in use and new physical connections come from the pool's events. A
+    summary is logged at most every `report_interval` seconds (never when 0),
+    and slow checkouts and timeouts are logged as they happen.
+    """
+
+    def __init__(
+        self,
+        report_interval: float = 60.0,
+        slow_checkout: float = 0.1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.report_interval = report_interval
+        self.slow_checkout = slow_checkout
+        self.clock = clock
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._last_report = clock()
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine):
+        """Start counting the engine's pool events, and its checkout waits if the pool is monitored."""
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        if isinstance(engine.pool, MonitoredQueuePool):
+            engine.pool.monitor = self
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.in_use -= 1
+
+    def record_checkout(self, wait: float, overflow: bool):
+        """Count a checkout that waited `wait` seconds, `overflow` if the pool was past its size."""
+        with self._lock:
+            self.checkouts += 1
+            self.overflow_checkouts += overflow
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            report_due = self.report_interval > 0 and self.clock() - self._last_report >= self.report_interval
+            if report_due:
+                self._last_report = self.clock()
+
+        if wait >= self.slow_checkout:
+            logger.warning(f"Slow database connection checkout: waited {wait * 1000:.1f} ms ({self.in_use} others in use)")
+        if report_due:
+            self.report()
+
+    def record_timeout(self, wait: float):
+        with self._lock:
+            self.timeouts += 1
+        logger.warning(f"Database connection checkout timed out after {wait:.1f} s ({self.in_use} in use)")
+
+    def stats(self) -> dict:
+        """Return the pool counters for monitoring."""
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "avg_wait_ms": round(self.total_wait * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3)
+            }
+
+    def report(self):
+        """Log the counters as one key=value line."""
+        logger.info("Database pool " + " ".join(f"{key}={value}" for key, value in self.stats().items()))
+
+
+class MonitoredQueuePool(QueuePool):
+    """QueuePool that times each checkout for its PoolMonitor.
+
+    The wait includes opening a new connection when the pool has none idle.
+    """
+
+    monitor: Optional[PoolMonitor] = None
+
+    def _do_get(self):
+        if self.monitor is None:
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.monitor.record_timeout(time.perf_counter() - started)
+            raise
+        self.monitor.record_checkout(time.perf_counter() - started, self.checkedout() > self.size())
+        return connection
+
+    def recreate(self):
+        # Engine.dispose() replaces the pool; keep reporting to the same monitor
+        pool = super().recreate()
+        pool.monitor = self.monitor
+        return pool
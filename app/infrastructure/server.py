@@ -0,0 +1,26 @@
+from typing import List, Mapping
+
+
+def worker_settings_errors(config: Mapping) -> List[str]:
+    """Settings that cannot work with the server's worker processes and threads."""
+    errors = []
+
+    # Memory backends live in one process: other workers would keep serving stale
+    # users and never see each other's task events
+    if config['WEB_WORKERS'] > 1:
+        for key in ('USER_CACHE_BACKEND', 'LIVE_EVENTS_BACKEND'):
+            if config[key] == 'memory':
+                errors.append(
+                    f"{key}=memory only works with WEB_WORKERS=1 (got {config['WEB_WORKERS']}); "
+                    f"use redis (REDIS_URL) or none"
+                )
+
+    # Every open event stream holds one of the worker's threads until the client leaves
+    if config['LIVE_EVENTS_BACKEND'] not in (None, '', 'none') and \
+            config['LIVE_EVENTS_MAX_SUBSCRIBERS'] >= config['WEB_THREADS']:
+        errors.append(
+            f"LIVE_EVENTS_MAX_SUBSCRIBERS ({config['LIVE_EVENTS_MAX_SUBSCRIBERS']}) must be lower than "
+            f"WEB_THREADS ({config['WEB_THREADS']}), or event streams can take every thread of a worker"
+        )
+
+    return errors
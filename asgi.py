@@ -0,0 +1,4 @@
+from app.asgi import create_asgi_app
+
+# Serve with an ASGI server, e.g. `uvicorn asgi:app --host 0.0.0.0 --port 5000`
+app = create_asgi_app()
@@ -0,0 +1,142 @@
+"""Memory and construction time of loaded task lists.
+
+Compares dict-backed copies of the previous entities, with one user object
+per assignment, against the slotted entities with assignees shared across
+the result set (as TaskModel.to_entities builds them).
+
+    python -m benchmarks.entities [--tasks 50000] [--users 20] [--assignees 3]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+from app.domain.entity import Role, Task, TaskPriority, TaskStatus, User
+
+
+class DictUser:
+    def __init__(self, id=None, name="", email="", role=Role.DEVELOPER, password=None, password_hash=None, token_version=0):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.role = role
+        self.password = password
+        self.password_hash = password_hash
+        self.token_version = token_version
+
+
+class DictTask:
+    def __init__(
+        self,
+        id=None,
+        title="",
+        description="",
+        status=TaskStatus.PENDING,
+        priority=TaskPriority.MEDIUM,
+        created_at=None,
+        updated_at=None,
+        due_date=None,
+        assigned_users=None,
+        creator_id=None
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.status = status
+        self.priority = priority
+        self.created_at = created_at if created_at else datetime.now()
+        self.updated_at = updated_at if updated_at else datetime.now()
+        self.due_date = due_date
+        self.assigned_users = assigned_users if assigned_users else []
+        self.creator_id = creator_id
+
+
+def make_rows(count: int, users: int, assignees: int):
+    """Plain tuples standing in for database rows."""
+    now = datetime.now()
+    statuses = list(TaskStatus)
+    priorities = list(TaskPriority)
+    user_rows = [
+        (i, f"Usuario {i}", f"user{i}@example.com", Role.DEVELOPER, "hash", 0)
+        for i in range(users)
+    ]
+    return [
+        (
+            i, f"Tarea {i}", "Descripción", statuses[i % len(statuses)], priorities[i % len(priorities)],
+            now, now, None, 1, [user_rows[(i + k) % users] for k in range(assignees)]
+        )
+        for i in range(count)
+    ]
+
+
+def load_dict_entities(rows):
+    return [
+        DictTask(
+            id=row[0], title=row[1], description=row[2], status=row[3], priority=row[4],
+            created_at=row[5], updated_at=row[6], due_date=row[7], creator_id=row[8],
+            assigned_users=[
+                DictUser(id=u[0], name=u[1], email=u[2], role=u[3], password_hash=u[4], token_version=u[5])
+                for u in row[9]
+            ]
+        )
+        for row in rows
+    ]
+
+
+def load_slotted_entities(rows):
+    users = {}
+
+    def user(u):
+        entity = users.get(u[0])
+        if entity is None:
+            entity = users[u[0]] = User(id=u[0], name=u[1], email=u[2], role=u[3], password_hash=u[4], token_version=u[5])
+        return entity
+
+    return [
+        Task(
+            id=row[0], title=row[1], description=row[2], status=row[3], priority=row[4],
+            created_at=row[5], updated_at=row[6], due_date=row[7], creator_id=row[8],
+            assigned_users=[user(u) for u in row[9]]
+        )
+        for row in rows
+    ]
+
+
+def measure(load, rows):
+    """Return (seconds, bytes allocated) to build the entity list."""
+    gc.collect()
+    start = time.perf_counter()
+    load(rows)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    entities = load(rows)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entities
+    return elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=50000)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--assignees', type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.tasks, args.users, args.assignees)
+    print(f"{args.tasks} tasks, {args.assignees} assignees each out of {args.users} users")
+
+    baseline = None
+    for name, load in (("dict entities", load_dict_entities), ("slotted entities", load_slotted_entities)):
+        elapsed, size = measure(load, rows)
+        baseline = baseline or (elapsed, size)
+        print(
+            f"  {name:<18} {elapsed / args.tasks * 1e6:7.2f} µs/task  {size / args.tasks:8.0f} B/task"
+            f"  ({baseline[0] / elapsed:.2f}x time, {baseline[1] / size:.2f}x memory)"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Per-item cost of turning tasks into a JSON response body.
+
+Compares the entities' to_dict() with Flask's default encoder (the
+previous behaviour) against the precomputed serializers with each
+available JSON backend.
+
+    python -m benchmarks.serialization [--items 1000] [--repeat 20]
+"""
+import argparse
+import timeit
+from datetime import datetime, timedelta
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.adapters.api.serializers import OrjsonProvider, serialize_task
+from app.domain.entity import Role, Task, TaskPriority, TaskStatus, User
+
+
+def make_tasks(count: int):
+    users = [
+        User(id=i, name=f"Usuario {i}", email=f"user{i}@example.com", role=Role.DEVELOPER)
+        for i in range(1, 4)
+    ]
+    now = datetime.now()
+    return [
+        Task(
+            id=i,
+            title=f"Tarea {i}",
+            description="Descripción de la tarea " * 4,
+            status=list(TaskStatus)[i % len(TaskStatus)],
+            priority=list(TaskPriority)[i % len(TaskPriority)],
+            created_at=now,
+            updated_at=now,
+            due_date=now + timedelta(days=i % 30),
+            creator_id=1,
+            assigned_users=users[:i % 3 + 1]
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    tasks = make_tasks(args.items)
+    stdlib = DefaultJSONProvider(app)
+
+    cases = {
+        "to_dict + stdlib": lambda: stdlib.dumps([task.to_dict() for task in tasks]),
+        "serialize_task + stdlib": lambda: stdlib.dumps([serialize_task(task) for task in tasks]),
+    }
+    try:
+        orjson_provider = OrjsonProvider(app)
+        cases["serialize_task + orjson"] = lambda: orjson_provider.dumps_bytes([serialize_task(task) for task in tasks])
+    except ImportError:
+        print("orjson is not installed; skipping the orjson backend")
+
+    baseline = None
+    print(f"{args.items} tasks, best of {args.repeat}")
+    for name, case in cases.items():
+        per_item = min(timeit.repeat(case, number=1, repeat=args.repeat)) / args.items * 1e6
+        baseline = baseline or per_item
+        print(f"  {name:<30} {per_item:8.2f} µs/item  {baseline / per_item:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
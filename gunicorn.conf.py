@@ -0,0 +1,73 @@
+import os
+import signal
+from app.infrastructure.config import Config
+from app.infrastructure.server import worker_settings_errors
+
+# Production server: gunicorn -c gunicorn.conf.py wsgi:app
+#
+# The app is loaded once in the master and forked into the workers, which
+# share its imported code copy-on-write. Signals to the master:
+#   HUP   start fresh workers with the reloaded settings, then stop the old ones
+#   TERM  stop accepting connections and let workers drain for graceful_timeout
+#   TTIN / TTOU  add or remove a worker
+# With preloading, deploying new code means restarting the master (or
+# USR2 to start a new master, then TERM to the old one).
+
+# Refuse to start with settings that cannot work across these workers and threads
+_errors = worker_settings_errors({key: getattr(Config, key) for key in dir(Config) if key.isupper()})
+if _errors:
+    raise RuntimeError("Invalid server settings: " + "; ".join(_errors))
+
+bind = os.getenv('WEB_BIND', '0.0.0.0:5000')
+workers = Config.WEB_WORKERS
+# Threaded workers, so a slow request holds one thread instead of a whole process
+worker_class = 'gthread'
+threads = Config.WEB_THREADS
+preload_app = True
+
+timeout = Config.WEB_TIMEOUT
+graceful_timeout = Config.WEB_GRACEFUL_TIMEOUT
+keepalive = 5
+max_requests = Config.WEB_MAX_REQUESTS
+max_requests_jitter = Config.WEB_MAX_REQUESTS // 10
+
+# Worker heartbeats go to tmpfs, so a slow container disk cannot stall them
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """Drop database connections inherited from the master; each worker opens its own pool."""
+    from app.infrastructure.database import db
+
+    with server.app.wsgi().app_context():
+        db.engine.dispose(close=False)
+
+
+def _shut_down_event_streams(worker):
+    # Open event streams would otherwise keep a stopping worker busy until graceful_timeout
+    broker = worker.wsgi.extensions.get('event_broker')
+    if broker is not None:
+        broker.shut_down_subscribers()
+
+
+def post_worker_init(worker):
+    """End event streams as soon as the worker is asked to stop (TERM on shutdown or HUP)."""
+    handle_exit = worker.handle_exit
+
+    def drain(sig, frame):
+        _shut_down_event_streams(worker)
+        handle_exit(sig, frame)
+
+    signal.signal(signal.SIGTERM, drain)
+    # As gunicorn does: let in-flight requests finish their system calls
+    signal.siginterrupt(signal.SIGTERM, False)
+
+
+def post_request(worker, req, environ, resp):
+    """End event streams once the worker stops taking requests, e.g. after max_requests."""
+    if not worker.alive:
+        _shut_down_event_streams(worker)
@@ -3,6 +3,13 @@ import api from './api';
 export const taskService = {
   async getTasks(filters = {}) {
     const response = await api.get('/tasks', { params: filters });
+    // Paginated requests (limit/cursor) return { items, next_cursor }
+    return Array.isArray(response.data) ? response.data : response.data.items;
+  },
+
+  async getTaskChanges(since = null) {
+    // Returns { items, deleted, cursor, has_more }
+    const response = await api.get('/tasks/changes', { params: since ? { since } : {} });
     return response.data;
   },
 
@@ -3,6 +3,12 @@ import api from './api';
 export const userService = {
   async getUsers(filters = {}) {
     const response = await api.get('/users', { params: filters });
+    // Paginated requests (limit/cursor) return { items, next_cursor }
+    return Array.isArray(response.data) ? response.data : response.data.items;
+  },
+
+  async autocompleteUsers(q, limit = 10) {
+    const response = await api.get('/users/autocomplete', { params: { q, limit } });
     return response.data;
   },
 
@@ -6,7 +6,9 @@ export const useTaskStore = defineStore('tasks', {
     tasks: [],
     currentTask: null,
     loading: false,
-    error: null
+    error: null,
+    // Change feed position of `tasks`; null when `tasks` is not a full, synced copy
+    syncCursor: null
   }),
 
   actions: {
@@ -17,6 +19,7 @@ export const useTaskStore = defineStore('tasks', {
       try {
         const tasks = await taskService.getTasks(filters);
         this.tasks = tasks;
+        this.syncCursor = null;
         return tasks;
       } catch (error) {
         this.error = error.response?.data?.error || 'Failed to fetch tasks';
@@ -26,6 +29,40 @@ export const useTaskStore = defineStore('tasks', {
       }
     },
 
+    async syncTasks() {
+      this.loading = true;
+      this.error = null;
+      
+      try {
+        // The first sync downloads every task; later ones only what changed
+        if (this.syncCursor === null) {
+          this.tasks = [];
+        }
+        
+        let cursor = this.syncCursor;
+        let page;
+        do {
+          page = await taskService.getTaskChanges(cursor);
+          
+          const deleted = new Set(page.deleted);
+          const changed = new Map(page.items.map(task => [task.id, task]));
+          this.tasks = this.tasks
+            .filter(task => !deleted.has(task.id) && !changed.has(task.id))
+            .concat(page.items);
+          
+          cursor = page.cursor;
+        } while (page.has_more);
+        
+        this.syncCursor = cursor;
+        return this.tasks;
+      } catch (error) {
+        this.error = error.response?.data?.error || 'Failed to sync tasks';
+        throw error;
+      } finally {
+        this.loading = false;
+      }
+    },
+
     async fetchTaskById(id) {
       this.loading = true;
       this.error = null;
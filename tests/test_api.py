@@ -115,6 +115,34 @@ def admin_token(mock_users):
         algorithm="HS256"
     )
 
+@pytest.fixture(scope="session")
+def sqlite_app(tmp_path_factory):
+    """The real application on a migrated SQLite file database.
+    
+    Created once: the controllers' blueprints can only be registered on one app.
+    """
+    from app import create_app
+    from app.infrastructure.config import Config
+    from app.infrastructure.database import db
+    from app.infrastructure.migrations import upgrade
+    
+    database_url = f"sqlite:///{tmp_path_factory.mktemp('db') / 'app.db'}"
+    with patch.object(Config, "SQLALCHEMY_DATABASE_URI", database_url), \
+            patch.object(Config, "JWT_SECRET_KEY", "test_secret_key_with_enough_length_for_hs256"):
+        real_app = create_app()
+    real_app.config["TESTING"] = True
+    with real_app.app_context():
+        upgrade(db.engine)
+    return real_app
+
+def create_and_login(client, name, role):
+    """Create a user through the API and return its id and authorization header."""
+    email = f"{name.lower()}@example.com"
+    created = client.post("/users", json={"name": name, "email": email, "role": role.value, "password": "secret"})
+    assert created.status_code == 201
+    login = client.post("/auth/login", json={"email": email, "password": "secret"})
+    return created.json["id"], {"Authorization": f"Bearer {login.json['access_token']}"}
+
 # Test 1: Login endpoint - successful login
 def test_login_success(client, mock_user_repository, mock_auth_service, mock_users):
     """Test successful login with valid credentials."""
@@ -348,4 +376,1019 @@ def test_create_task_validation_error(client, mock_user_repository, mock_users,
             # Assert
             assert response.status_code == 400
             data = json.loads(response.data)
-            assert "error" in data 
\ No newline at end of file
+            assert "error" in data 
+
+# Test 9: Pagination - cursors round-trip and reject garbage
+def test_cursor_round_trip():
+    """Test that page cursors decode to the key they were built from."""
+    from app.application.pagination import encode_cursor, decode_cursor, parse_page_size
+    
+    key = ["2024-04-25T10:00:00", 42]
+    assert decode_cursor(encode_cursor(key)) == key
+    assert parse_page_size(None) == 20
+    
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(ValueError):
+        parse_page_size("1000")
+
+# Test 10: Pagination - completed tasks are hidden in the query for developers
+def test_tasks_page_hides_completed_for_developer(mock_task_repository, mock_user_repository, mock_users):
+    """Test that the paginated task listing pushes the completed filter to the repository."""
+    from app.application.pagination import Page
+    
+    mock_task_repository.get_page.return_value = Page([])
+    task_service = TaskService(mock_task_repository, mock_user_repository)
+    
+    task_service.get_tasks_page(limit=5, requesting_user=mock_users["developer"])
+    
+    _, _, query = mock_task_repository.get_page.call_args[0]
+    assert query.exclude_statuses == {TaskStatus.COMPLETED}
+
+# Test 11: Task query - role hiding removes completed from an explicit status set
+def test_task_query_hides_completed_status():
+    """Test that hiding completed tasks narrows the requested status set."""
+    from app.application.task_query import TaskQuery
+    
+    query = TaskQuery(statuses=[TaskStatus.COMPLETED, TaskStatus.PENDING]).hide_statuses(TaskStatus.COMPLETED)
+    assert query.effective_statuses() == {TaskStatus.PENDING}
+    assert not query.matches_nothing()
+    
+    only_completed = TaskQuery(statuses=[TaskStatus.COMPLETED]).hide_statuses(TaskStatus.COMPLETED)
+    assert only_completed.matches_nothing()
+
+# Test 12: User cache - lookups are served from the cache and refreshed on update
+def test_cached_user_repository_hits_and_invalidation(mock_user_repository, mock_users):
+    """Test that repeated user lookups hit the cache and updates replace the entry."""
+    from app.adapters.cached_user_repository import CachedUserRepository
+    from app.infrastructure.cache import InMemoryLRUCache
+    
+    developer = mock_users["developer"]
+    mock_user_repository.get_by_id.return_value = developer
+    repository = CachedUserRepository(mock_user_repository, InMemoryLRUCache(max_size=1), ttl=60)
+    
+    assert repository.get_by_id(developer.id).email == developer.email
+    assert repository.get_by_id(developer.id).email == developer.email
+    assert mock_user_repository.get_by_id.call_count == 1
+    assert repository.stats()["hits"] == 1
+    
+    renamed = User(id=developer.id, name="Renamed", email=developer.email, role=developer.role, password_hash="hash3")
+    mock_user_repository.update.return_value = renamed
+    repository.update(renamed)
+    assert repository.get_by_id(developer.id).name == "Renamed"
+    
+    # A second user evicts the first from a cache of size one
+    mock_user_repository.get_by_id.return_value = mock_users["admin"]
+    repository.get_by_id(mock_users["admin"].id)
+    assert repository.backend.evictions == 1
+
+# Test 13: Claims principal - permissions match the full user entity
+def test_principal_permissions_match_user(mock_users):
+    """Test that a principal built from token claims has the same permissions as its user."""
+    from app.domain.entity import Principal
+    
+    for user in mock_users.values():
+        principal = Principal(id=user.id, role=user.role)
+        for action in ["view_all_completed_tasks", "complete_any_task"]:
+            assert principal.has_permission(action) == user.has_permission(action)
+
+# Test 14: Password hashing - a full queue fails fast instead of waiting
+def test_password_hasher_rejects_when_queue_is_full():
+    """Test that password work beyond the concurrency and queue limits is rejected immediately."""
+    import threading
+    from app.infrastructure.password_hasher import BoundedPasswordHasher, PasswordHasherBusyError
+    
+    hasher = BoundedPasswordHasher(max_workers=1, max_queue=0, timeout=5)
+    release = threading.Event()
+    worker = threading.Thread(target=hasher._run, args=(release.wait,))
+    worker.start()
+    
+    try:
+        with pytest.raises(PasswordHasherBusyError):
+            hasher.hash("password123")
+    finally:
+        release.set()
+        worker.join()
+    
+    assert hasher.verify("password123", hasher.hash("password123"))
+    hasher.shutdown()
+
+# Test 15: Task update - only changed fields and the assignment diff reach the repository
+def test_update_task_applies_only_changes(mock_task_repository, mock_user_repository, mock_users, mock_tasks):
+    """Test that updating a task writes the changed columns and assignment diff in one call."""
+    task = mock_tasks["pending"]
+    mock_task_repository.get_by_id.return_value = task
+    mock_task_repository.apply_changes.return_value = task
+    task_service = TaskService(mock_task_repository, mock_user_repository)
+    
+    task_service.update_task(
+        task.id,
+        {"title": "New title", "description": task.description, "assigned_user_ids": [mock_users["admin"].id]},
+        mock_users["admin"]
+    )
+    
+    mock_task_repository.apply_changes.assert_called_once_with(
+        task.id, {"title": "New title"}, {mock_users["admin"].id}, {mock_users["developer"].id}, events=[]
+    )
+    mock_task_repository.assign_user.assert_not_called()
+    mock_task_repository.update.assert_not_called()
+
+# Test 16: Bulk task creation - one user lookup, one insert, per-item results
+def test_create_tasks_bulk_reports_each_item(mock_task_repository, mock_user_repository, mock_users):
+    """Test that bulk creation validates users with one query and keeps factory priorities."""
+    mock_user_repository.get_by_ids.return_value = [mock_users["tech_lead"], mock_users["developer"]]
+    mock_task_repository.create_many.side_effect = lambda tasks: tasks
+    task_service = TaskService(mock_task_repository, mock_user_repository)
+    
+    items = [
+        {"title": "A", "description": "a", "priority": TaskPriority.URGENT, "assigned_user_ids": [3]},
+        {"title": "B", "description": "b", "priority": TaskPriority.LOW, "assigned_user_ids": [99]},
+    ]
+    results = task_service.create_tasks_bulk(items, mock_users["tech_lead"].id)
+    
+    assert results[0].priority == TaskPriority.URGENT
+    assert results[0].assigned_users == [mock_users["developer"]]
+    assert isinstance(results[1], ValueError)
+    mock_user_repository.get_by_ids.assert_called_once()
+    mock_task_repository.create_many.assert_called_once_with([results[0]])
+
+# Test 17: Bulk transitions - one permission query, one update, one outbox event
+def test_transition_tasks_records_one_event(mock_task_repository, mock_user_repository, mock_users, mock_tasks):
+    """Test that completing several tasks checks permissions per task and records one completion event."""
+    from app.application.ports import TaskAccess, OutboxEvent
+    from app.application.task_service import TransitionOutcome
+    
+    developer = mock_users["developer"]
+    mock_task_repository.get_access.return_value = {
+        1: TaskAccess(1, mock_users["tech_lead"].id, TaskStatus.PENDING, is_assigned=True),
+        3: TaskAccess(3, mock_users["admin"].id, TaskStatus.PENDING, is_assigned=False),
+    }
+    mock_task_repository.apply_changes_many.return_value = [1]
+    task_service = TaskService(mock_task_repository, mock_user_repository)
+    
+    results = task_service.transition_tasks([1, 3, 4], developer, status=TaskStatus.COMPLETED)
+    
+    assert [results[task_id].outcome for task_id in (1, 3, 4)] == [
+        TransitionOutcome.UPDATED, TransitionOutcome.FORBIDDEN, TransitionOutcome.NOT_FOUND
+    ]
+    assert results[1].error is None
+    assert "permission" in results[3].error
+    assert mock_task_repository.apply_changes_many.call_args[0][0] == [1]
+    
+    # Notifications are left to the outbox worker, written with the same update
+    (event,) = mock_task_repository.apply_changes_many.call_args[1]["events"]
+    assert event.event_type == OutboxEvent.TASKS_COMPLETED
+    assert event.payload == {"task_ids": [1]}
+    mock_user_repository.get_all.assert_not_called()
+
+# Test 18: Migrations - apply in order, create the indexes and are idempotent
+def test_migrations_apply_once():
+    """Test that migrations build the schema with its indexes and are not re-applied."""
+    from sqlalchemy import create_engine, inspect
+    from app.infrastructure.migrations import available_migrations, pending_migrations, upgrade
+    
+    engine = create_engine("sqlite://")
+    
+    applied = upgrade(engine)
+    assert applied == [name for _, name in available_migrations()]
+    assert pending_migrations(engine) == []
+    assert upgrade(engine) == []
+    
+    index_names = {index["name"] for index in inspect(engine).get_indexes("tasks")}
+    assert {"ix_tasks_created_at_id", "ix_tasks_open_created_at_id"} <= index_names
+    assert "token_version" in {column["name"] for column in inspect(engine).get_columns("users")}
+
+
+
+# Test 19: Ordinal enums - existing labels are converted to codes and read back as enums
+def test_ordinal_enum_migration_converts_labels():
+    """Test that stored labels become SMALLINT codes that map back to the domain enums."""
+    import importlib
+    from datetime import datetime
+    from sqlalchemy import create_engine, text
+    from app.adapters.postgresql_repository import OrdinalEnum
+    from app.infrastructure.migrations import available_migrations, schema_migrations, upgrade
+    from app.domain.entity import TaskStatus, TaskPriority
+    
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        # Build the label schema as it was before migration 0004
+        schema_migrations.create(connection)
+        for version, name in available_migrations():
+            if version < 4:
+                importlib.import_module(f"app.infrastructure.migrations.{name}").upgrade(connection)
+                connection.execute(schema_migrations.insert().values(version=version, name=name, applied_at=datetime.now()))
+        connection.execute(text("INSERT INTO users (id, name, email, role, password_hash) VALUES (1, 'Lead', 'lead@example.com', 'Líder Técnico', 'x')"))
+        connection.execute(text(
+            "INSERT INTO tasks (id, title, status, priority, created_at, updated_at, creator_id) "
+            "VALUES (1, 'Task', 'En Revisión', 'Urgente', '2024-01-01', '2024-01-01', 1)"
+        ))
+    
+    assert "0004_ordinal_enum_columns" in upgrade(engine)
+    
+    with engine.begin() as connection:
+        assert connection.execute(text("SELECT role FROM users")).scalar() == 2
+        assert tuple(connection.execute(text("SELECT status, priority FROM tasks")).one()) == (4, 4)
+    
+    status = OrdinalEnum(TaskStatus)
+    assert status.process_bind_param(TaskStatus.COMPLETED, None) == 5
+    assert status.process_bind_param("En Progreso", None) == 2
+    assert status.process_result_value(3, None) is TaskStatus.BLOCKED
+    assert OrdinalEnum(TaskPriority).process_result_value(2, None) is TaskPriority.MEDIUM
+
+# Test 20: Task search - blank text is ignored and the fallback escapes wildcards
+def test_task_search_fallback_escapes_wildcards():
+    """Test that the LIKE fallback matches every word literally in any text column."""
+    from sqlalchemy import column
+    from app.application.task_query import TaskQuery
+    from app.adapters.task_search import LikeTaskSearch, PostgreSQLFullTextSearch, create_task_search
+    
+    assert TaskQuery(search="   ").search is None
+    assert TaskQuery(search=" login ").search == "login"
+    
+    assert LikeTaskSearch._pattern("50%_off") == "%50\\%\\_off%"
+    
+    search = create_task_search("sqlite", [column("title"), column("description")])
+    assert isinstance(search, LikeTaskSearch)
+    assert search.rank("login") is None
+    assert len(search.filter("login page").clauses) == 2
+    assert isinstance(create_task_search("postgresql", []), PostgreSQLFullTextSearch)
+
+# Test 21: User autocomplete - repeated terms are served from the cache
+def test_user_autocomplete_is_cached(mock_user_repository, mock_users):
+    """Test that the same typed term reaches the repository once and blank terms never do."""
+    from app.adapters.cached_user_repository import CachedUserRepository
+    from app.infrastructure.cache import InMemoryLRUCache
+    
+    mock_user_repository.suggest.return_value = [mock_users["developer"]]
+    repository = CachedUserRepository(mock_user_repository, InMemoryLRUCache(), ttl=60, suggest_ttl=30)
+    user_service = UserService(repository, AuthService(repository))
+    
+    assert user_service.suggest_users("  ", 10) == []
+    assert [user.id for user in user_service.suggest_users("Dev", 10)] == [mock_users["developer"].id]
+    assert [user.id for user in user_service.suggest_users("dev ", 10)] == [mock_users["developer"].id]
+    mock_user_repository.suggest.assert_called_once_with("Dev", 10, None)
+    
+    user_service.suggest_users("dev", 10, Role.DEVELOPER)
+    assert mock_user_repository.suggest.call_count == 2
+
+# Test 22: Outbox worker - delivered events are removed and failures are retried with backoff
+def test_outbox_processor_retries_failures(mock_task_repository, mock_user_repository, mock_users, mock_tasks):
+    """Test that the outbox worker notifies once per event and reschedules failed deliveries."""
+    from app.application.outbox import OutboxProcessor
+    from app.application.ports import OutboxEvent
+    
+    outbox_repository = Mock()
+    outbox_repository.claim_batch.return_value = [
+        OutboxEvent(OutboxEvent.TASKS_COMPLETED, {"task_ids": [1]}, id=10, attempts=1),
+        OutboxEvent(OutboxEvent.TASKS_COMPLETED, {"task_ids": [2]}, id=11, attempts=3),
+    ]
+    mock_task_repository.find.side_effect = [[mock_tasks["pending"]], RuntimeError("mail server down")]
+    mock_user_repository.get_all.return_value = [mock_users["tech_lead"]]
+    notifier = Mock()
+    processor = OutboxProcessor(
+        outbox_repository, mock_task_repository, mock_user_repository,
+        task_notifier=notifier, max_attempts=3
+    )
+    
+    assert processor.process_batch() == 2
+    
+    notifier.notify_task_completion.assert_called_once_with(mock_tasks["pending"], [mock_users["tech_lead"]])
+    mock_user_repository.get_all.assert_called_once_with(Role.TECH_LEAD)
+    outbox_repository.mark_delivered.assert_called_once_with([10])
+    # The third failed attempt parks the event instead of scheduling a retry
+    outbox_repository.mark_failed.assert_called_once_with(11, "mail server down", None)
+    
+    assert processor._retry_at(1) is not None
+
+# Test 23: Notification digests - one digest per recipient per window, bounded event bus
+def test_digest_coalescer_and_event_bus_backpressure(mock_users, mock_tasks):
+    """Test that completions are coalesced per recipient and a full event bus pushes back."""
+    from app.domain.observer import AsyncSubject, CachedRoster, DigestCoalescer, EventBusFullError
+    
+    roster_loads = []
+    roster = CachedRoster(lambda: roster_loads.append(1) or [mock_users["tech_lead"], mock_users["admin"]], ttl=60)
+    sent = []
+    flushed = []
+    digest = DigestCoalescer(
+        roster,
+        send_digest=lambda recipient, tasks: sent.append((recipient.id, [task.id for task in tasks])),
+        max_wait=60,
+        max_tasks=3,
+        on_flush=lambda tokens, error: flushed.append((tokens, error))
+    )
+    
+    digest.update(None, task=mock_tasks["pending"], token="a")
+    digest.update(None, tasks=[mock_tasks["completed"]], token="b")
+    assert sent == []
+    digest.update(None, tasks=[mock_tasks["pending"]], token="c")  # third task closes the window
+    
+    task_ids = [mock_tasks["pending"].id, mock_tasks["completed"].id, mock_tasks["pending"].id]
+    assert sent == [(mock_users["tech_lead"].id, task_ids), (mock_users["admin"].id, task_ids)]
+    assert flushed == [(["a", "b", "c"], None)]
+    assert len(roster_loads) == 1
+    
+    # A bus whose dispatcher never runs fills up and rejects further notifications
+    bus = AsyncSubject(max_queue=1, put_timeout=0.01)
+    bus.start = lambda: None
+    bus.notify(task=mock_tasks["pending"])
+    assert bus.is_saturated()
+    with pytest.raises(EventBusFullError):
+        bus.notify(task=mock_tasks["pending"])
+
+# Test 24: Streaming - tasks are serialized lazily into NDJSON or a JSON array
+def test_stream_response_formats(app, mock_tasks):
+    """Test that streamed task listings produce valid NDJSON and JSON arrays."""
+    from app.adapters.api.streaming import stream_response, requested_stream_format
+    
+    tasks = [mock_tasks["pending"], mock_tasks["completed"]]
+    expected = [task.to_dict() for task in tasks]
+    
+    with app.test_request_context("/tasks?stream=1"):
+        assert requested_stream_format() == "json"
+        response = stream_response(iter(tasks), "json", batch=1)
+        assert response.is_streamed
+        assert json.loads(response.get_data()) == expected
+    
+    with app.test_request_context("/tasks", headers={"Accept": "application/x-ndjson"}):
+        assert requested_stream_format() == "ndjson"
+        body = stream_response(iter(tasks), "ndjson").get_data(as_text=True)
+        assert [json.loads(line) for line in body.splitlines()] == expected
+    
+    with app.test_request_context("/tasks?stream=json"):
+        assert json.loads(stream_response(iter([]), "json").get_data()) == []
+
+# Test 25: Serializers - precomputed serializers match to_dict with every JSON backend
+def test_serializers_match_to_dict(app, mock_users, mock_tasks):
+    """Test that the fast serializers and JSON providers produce the same documents."""
+    from app.adapters.api.serializers import create_json_provider, serialize, serialize_task, serialize_user
+    
+    task = mock_tasks["pending"]
+    task.assigned_users = [mock_users["developer"], {"id": 99}]
+    assert serialize_task(task) == task.to_dict()
+    assert serialize_task(task, include_users=False) == task.to_dict(include_users=False)
+    assert serialize_user(mock_users["admin"]) == mock_users["admin"].to_dict()
+    assert serialize(mock_users["admin"]) == mock_users["admin"].to_dict()
+    
+    for backend in ("stdlib", "auto"):
+        provider = create_json_provider(app, backend)
+        with app.test_request_context():
+            response = provider.response([serialize_task(task)])
+        assert response.mimetype == "application/json"
+        assert json.loads(response.get_data()) == [task.to_dict()]
+        assert provider.loads(provider.dumps({"ids": [1, 2]})) == {"ids": [1, 2]}
+
+# Test 26: Entities - slotted entities keep stored timestamps and share assignees
+def test_slotted_entities_share_assignees(mock_users):
+    """Test that entities have no instance dict and loaded tasks share assignee entities."""
+    from app.adapters.postgresql_repository import TaskModel, TaskUserModel, UserModel
+    
+    with pytest.raises(AttributeError):
+        mock_users["developer"].nickname = "dev"
+    
+    stored_at = datetime(2024, 1, 1)
+    assert Task(title="Stored", created_at=stored_at, updated_at=stored_at).created_at == stored_at
+    new_task = Task(title="New")
+    assert new_task.created_at == new_task.updated_at
+    
+    developer = UserModel.from_entity(mock_users["developer"])
+    task_models = [
+        TaskModel(
+            id=task_id, title="Task", status=TaskStatus.PENDING, priority=TaskPriority.LOW,
+            created_at=stored_at, updated_at=stored_at, creator_id=1,
+            assigned_users=[TaskUserModel(user_id=developer.id, user=developer)]
+        )
+        for task_id in (1, 2)
+    ]
+    first, second = TaskModel.to_entities(task_models)
+    assert first.assigned_users[0] is second.assigned_users[0]
+    assert first.assigned_users[0].email == mock_users["developer"].email
+
+# Test 27: Task stats - triggers keep the counters current and hidden statuses are left out
+def test_task_stats_counters_follow_writes():
+    """Test that the stats tables track inserts, status changes, assignments and deletes."""
+    from sqlalchemy import create_engine, text
+    from app.application.ports import TaskStats
+    from app.infrastructure.migrations import upgrade
+    
+    engine = create_engine("sqlite://")
+    upgrade(engine)
+    
+    def counts(connection):
+        task_counts = dict(connection.execute(text(
+            "SELECT status * 10 + priority, task_count FROM task_stats WHERE task_count > 0"
+        )).all())
+        assignee_counts = dict(connection.execute(text(
+            "SELECT user_id * 10 + status, task_count FROM task_assignee_stats WHERE task_count > 0"
+        )).all())
+        return task_counts, assignee_counts
+    
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO users (id, name, email, role, password_hash) VALUES (1, 'Dev', 'dev@example.com', 1, 'x')"))
+        for task_id, priority in ((1, 2), (2, 3)):
+            connection.execute(text(
+                "INSERT INTO tasks (id, title, status, priority, created_at, updated_at, creator_id) "
+                f"VALUES ({task_id}, 'Task', 1, {priority}, '2024-01-01', '2024-01-01', 1)"
+            ))
+        connection.execute(text("INSERT INTO task_users (task_id, user_id) VALUES (1, 1), (2, 1)"))
+        assert counts(connection) == ({12: 1, 13: 1}, {11: 2})
+        
+        connection.execute(text("UPDATE tasks SET status = 5 WHERE id = 1"))
+        connection.execute(text("UPDATE tasks SET title = 'Renamed' WHERE id = 2"))
+        assert counts(connection) == ({52: 1, 13: 1}, {11: 1, 15: 1})
+        
+        connection.execute(text("DELETE FROM task_users WHERE task_id = 2"))
+        connection.execute(text("DELETE FROM task_users WHERE task_id = 1"))
+        connection.execute(text("DELETE FROM tasks WHERE id = 1"))
+        assert counts(connection) == ({13: 1}, {})
+    
+    stats = TaskStats(
+        {(TaskStatus.PENDING, TaskPriority.HIGH): 2, (TaskStatus.COMPLETED, TaskPriority.HIGH): 1},
+        {(7, TaskStatus.PENDING): 1, (7, TaskStatus.COMPLETED): 1}
+    ).without_statuses(TaskStatus.COMPLETED).to_dict()
+    assert stats["total"] == 2
+    assert stats["by_priority"][TaskPriority.HIGH.value] == 2
+    assert stats["by_status"][TaskStatus.COMPLETED.value] == 0
+    assert stats["by_assignee"] == [{"user_id": 7, "total": 1, "by_status": {TaskStatus.PENDING.value: 1}}]
+
+# Test 28: Conditional GET - version probes give strong ETags and matching requests get 304
+def test_conditional_get_uses_version_probe(app, mock_task_repository, mock_user_repository, mock_users):
+    """Test that ETags follow the version tag and hidden tasks get no version."""
+    from app.application.ports import TaskVersion
+    from app.adapters.api.conditional import make_etag, not_modified, tag
+    
+    task_service = TaskService(mock_task_repository, mock_user_repository)
+    mock_task_repository.get_version.return_value = TaskVersion(TaskStatus.COMPLETED, "2024-01-01T00:00:00:1:")
+    assert task_service.get_task_version(1, mock_users["tech_lead"]) == "2024-01-01T00:00:00:1:"
+    assert task_service.get_task_version(1, mock_users["developer"]) is None
+    mock_task_repository.get_by_id.assert_not_called()
+    
+    with app.test_request_context("/tasks/1"):
+        etag = make_etag("v1", Role.TECH_LEAD)
+        assert etag != make_etag("v2", Role.TECH_LEAD)
+        assert not_modified(etag) is None
+        response = tag(app.response_class("{}"), etag)
+        assert response.headers["ETag"] == f'"{etag}"'
+        assert response.headers["Cache-Control"] == "private, no-cache"
+    
+    with app.test_request_context("/tasks/1", headers={"If-None-Match": f'"other", "{etag}"'}):
+        response = not_modified(etag)
+        assert response.status_code == 304
+        assert response.get_data() == b""
+    
+    with app.test_request_context("/tasks/1?status=Pendiente"):
+        assert make_etag("v1", Role.TECH_LEAD) != etag
+
+# Test 29: Change feed - changed tasks since the cursor, with tombstones for removed ones
+def test_task_changes_since_cursor(mock_task_repository, mock_user_repository, mock_users, mock_tasks):
+    """Test that the change feed pages by position and hides tasks the user cannot see."""
+    from app.application.ports import TaskChange
+    from app.application.pagination import decode_cursor, encode_cursor
+    
+    task_service = TaskService(mock_task_repository, mock_user_repository)
+    pending, completed = mock_tasks["pending"], mock_tasks["completed"]
+    mock_task_repository.get_changes.return_value = [
+        TaskChange(pending.id, 11), TaskChange(completed.id, 12), TaskChange(99, 13, deleted=True)
+    ]
+    mock_task_repository.find.return_value = [pending]
+    
+    page = task_service.get_task_changes(limit=5, cursor=encode_cursor([10]), requesting_user=mock_users["developer"])
+    
+    mock_task_repository.get_changes.assert_called_once_with(10, 6)
+    query = mock_task_repository.find.call_args[0][0]
+    assert query.task_ids == {pending.id, completed.id}
+    assert TaskStatus.COMPLETED in query.exclude_statuses
+    assert page.to_dict(lambda task: task.id) == {
+        "items": [pending.id],
+        "deleted": [completed.id, 99],
+        "cursor": encode_cursor([13]),
+        "has_more": False
+    }
+    
+    mock_task_repository.get_changes.return_value = []
+    assert decode_cursor(task_service.get_task_changes(limit=5, cursor=encode_cursor([13])).cursor) == [13]
+    with pytest.raises(ValueError):
+        task_service.get_task_changes(limit=5, cursor=encode_cursor(["x"]))
+
+# Test 30: Live events - visibility per subscriber and slow subscribers dropped without blocking
+def test_live_events_fan_out(mock_task_repository, mock_user_repository, mock_users, mock_tasks):
+    """Test that task events reach subscribers filtered by permission and full queues are dropped."""
+    from app.domain.observer import TaskNotifier
+    from app.adapters.api.live_events import TaskEventPublisher
+    from app.infrastructure.event_broker import EventBroker, InMemoryFanout, SubscriberLimitError
+    
+    broker = EventBroker(InMemoryFanout(), max_queue=2, max_subscribers=2)
+    lead = broker.subscribe(mock_users["tech_lead"].has_permission)
+    developer = broker.subscribe(mock_users["developer"].has_permission)
+    with pytest.raises(SubscriberLimitError):
+        broker.subscribe(mock_users["admin"].has_permission)
+    
+    notifier = TaskNotifier()
+    notifier.attach(TaskEventPublisher(broker))
+    task_service = TaskService(mock_task_repository, mock_user_repository, notifier)
+    
+    mock_task_repository.get_by_id.return_value = mock_tasks["pending"]
+    mock_task_repository.apply_changes.return_value = mock_tasks["completed"]
+    task_service.update_task_status(1, TaskStatus.COMPLETED, mock_users["tech_lead"])
+    
+    lead_frames = lead.get(timeout=0, max_frames=10)
+    developer_frames = developer.get(timeout=0, max_frames=10)
+    assert lead_frames[0].startswith("event: task.completed\n")
+    assert json.loads(lead_frames[0].split("data: ")[1])["task"]["id"] == mock_tasks["completed"].id
+    assert developer_frames == ['event: task.removed\ndata: {"type": "removed", "task_id": 2}\n\n']
+    
+    # The developer stops reading: publishing keeps going and the subscriber is dropped
+    mock_task_repository.apply_changes.return_value = mock_tasks["pending"]
+    for _ in range(3):
+        task_service.update_task_priority(1, TaskPriority.LOW, mock_users["tech_lead"])
+        lead.get(timeout=0, max_frames=10)
+    assert developer.overflowed
+    assert broker.subscriber_count == 1
+    assert broker.dropped == 1
+    
+    lead.close()
+    assert broker.subscriber_count == 0
+
+# Test 31: Async reads - same visibility rules as the sync service and async driver URLs
+def test_async_task_service_visibility(mock_users, mock_tasks):
+    """Test that the async task service hides completed tasks like TaskService and URLs get async drivers."""
+    import asyncio
+    from unittest.mock import AsyncMock
+    from app.application.ports import AsyncTaskRepository, TaskVersion
+    from app.application.task_service import AsyncTaskService
+    from app.infrastructure.async_database import async_database_url
+    
+    repository = AsyncMock(spec=AsyncTaskRepository)
+    repository.get_by_id.return_value = mock_tasks["completed"]
+    repository.get_version.return_value = TaskVersion(TaskStatus.COMPLETED, "v1")
+    repository.find.return_value = [mock_tasks["pending"]]
+    task_service = AsyncTaskService(repository)
+    
+    async def reads(user):
+        return (
+            await task_service.get_task_by_id(2, user),
+            await task_service.get_task_version(2, user),
+            await task_service.get_tasks(requesting_user=user)
+        )
+    
+    task, version, tasks = asyncio.run(reads(mock_users["tech_lead"]))
+    assert task is mock_tasks["completed"]
+    assert version == "v1"
+    assert tasks == [mock_tasks["pending"]]
+    
+    task, version, _ = asyncio.run(reads(mock_users["developer"]))
+    assert task is None
+    assert version is None
+    assert repository.find.call_args.args[0].exclude_statuses == {TaskStatus.COMPLETED}
+    
+    assert async_database_url("postgres://u:p@db/tasks") == "postgresql+asyncpg://u:p@db/tasks"
+    assert async_database_url("postgresql+psycopg2://db/tasks") == "postgresql+asyncpg://db/tasks"
+    assert async_database_url("sqlite:///:memory:") == "sqlite+aiosqlite:///:memory:"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://db/tasks")
+
+# Test 32: Worker pools - each server worker gets an even share of the database connections
+def test_worker_pool_size_splits_connections():
+    """Test that per-worker pools cover the worker's threads within its share of the connection budget."""
+    from app.infrastructure.database import worker_pool_size
+    
+    # 9 workers share 80 connections: 4 pooled (one per thread) and 4 overflow each
+    assert worker_pool_size(workers=9, threads=4, max_connections=80) == (4, 4)
+    # More threads than the share allows: the pool is capped and there is no overflow
+    assert worker_pool_size(workers=20, threads=8, max_connections=80) == (4, 0)
+    # A worker always gets at least one connection
+    assert worker_pool_size(workers=100, threads=4, max_connections=10) == (1, 0)
+    
+    pool_size, max_overflow = worker_pool_size(workers=5, threads=4, max_connections=100)
+    assert 5 * (pool_size + max_overflow) <= 100
+
+# Test 33: Pool monitor - checkout waits, connections in use, overflow and timeouts are counted
+def test_pool_monitor_counts_checkouts(tmp_path):
+    """Test that the monitored pool reports in-use connections, overflow checkouts and timeouts."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+    from app.infrastructure.pool_monitor import MonitoredQueuePool, PoolMonitor
+    
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MonitoredQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05
+    )
+    monitor = PoolMonitor(report_interval=0, slow_checkout=10)
+    monitor.attach(engine)
+    
+    first = engine.connect()
+    second = engine.connect()
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    
+    stats = monitor.stats()
+    assert stats["checkouts"] == 2
+    assert stats["in_use"] == 2
+    assert stats["overflow_checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["connects"] == 2
+    
+    first.close()
+    second.close()
+    # Disposing the engine keeps the new pool reporting to the same monitor
+    engine.dispose()
+    with engine.connect():
+        pass
+    
+    stats = monitor.stats()
+    assert stats["checkouts"] == 3
+    assert stats["in_use"] == 0
+    assert stats["peak_in_use"] == 2
+
+# Test 34: Query profiler - statements per request, Server-Timing header and repeated shapes flagged as N+1
+def test_query_profiler_flags_repeated_statements(caplog):
+    """Test that sampled requests report their SQL statements and repeated statement shapes."""
+    from sqlalchemy import create_engine, text
+    from app.adapters.api.query_profiler import QueryProfiler, statement_shape
+    
+    engine = create_engine("sqlite://")
+    profiled_app = Flask(__name__)
+    QueryProfiler(sample_rate=0.5, repeat_threshold=3, sampler=iter([0.1, 0.9]).__next__).init_app(profiled_app, engine)
+    
+    @profiled_app.route("/items")
+    def items():
+        with engine.connect() as connection:
+            for item_id in range(4):
+                connection.execute(text("SELECT :id"), {"id": item_id})
+            connection.execute(text("SELECT 1, 2"))
+        return "ok"
+    
+    client = profiled_app.test_client()
+    with caplog.at_level("INFO", logger="app.adapters.api.query_profiler"):
+        sampled = client.get("/items")
+        skipped = client.get("/items")
+    
+    assert sampled.headers["Server-Timing"].startswith("db;dur=")
+    assert 'desc="5 queries"' in sampled.headers["Server-Timing"]
+    assert "Server-Timing" not in skipped.headers
+    
+    assert len(caplog.records) == 1
+    assert caplog.records[0].levelname == "WARNING"
+    profile = json.loads(caplog.records[0].getMessage().split(" ", 2)[2])
+    assert profile["queries"] == 5
+    assert [(shape["count"], shape["statement"]) for shape in profile["repeated"]] == [(4, "SELECT ?")]
+    
+    assert statement_shape("SELECT * FROM tasks WHERE id IN (?, ?, ?) AND title = 'x'") == \
+        statement_shape("SELECT *  FROM tasks WHERE id IN (?) AND title = 'y'")
+
+# Test 35: Token revocation - later updates, even from a stale copy, never restore revoked tokens
+def test_update_after_revoke_keeps_tokens_revoked(sqlite_app):
+    """Test that user updates after a revocation or role change leave the old tokens rejected."""
+    client = sqlite_app.test_client()
+    admin_id, admin_headers = create_and_login(client, "Revoked", Role.ADMIN)
+    developer_id, developer_headers = create_and_login(client, "Promoted", Role.DEVELOPER)
+    
+    with sqlite_app.app_context():
+        stale_admin = PostgreSQLUserRepository().get_by_id(admin_id)
+    
+    assert client.post("/auth/revoke", headers=admin_headers).status_code == 204
+    
+    # A write from a copy loaded before the revocation must not roll the version back
+    stale_admin.name = "Renamed"
+    with sqlite_app.app_context():
+        PostgreSQLUserRepository().update(stale_admin)
+        assert PostgreSQLUserRepository().get_token_version(admin_id) == 1
+    assert client.get(f"/users/{admin_id}", headers=admin_headers).status_code == 401
+    
+    # A role change is applied as an increment in SQL
+    login = client.post("/auth/login", json={"email": "revoked@example.com", "password": "secret"})
+    new_admin_headers = {"Authorization": f"Bearer {login.json['access_token']}"}
+    response = client.put(f"/users/{developer_id}", json={"role": Role.TECH_LEAD.value}, headers=new_admin_headers)
+    assert response.status_code == 200
+    assert client.get(f"/users/{developer_id}", headers=developer_headers).status_code == 401
+    assert client.get(f"/users/{developer_id}", headers=new_admin_headers).status_code == 200
+
+# Test 36: Token versions - a revocation in one worker is seen by every other worker's cache
+def test_token_version_bypasses_user_cache(mock_user_repository, mock_users):
+    """Test that token versions are read from the repository even when the user is cached."""
+    from app.adapters.cached_user_repository import CachedUserRepository
+    from app.infrastructure.cache import InMemoryLRUCache
+    
+    developer = mock_users["developer"]
+    mock_user_repository.get_by_id.return_value = developer
+    mock_user_repository.get_token_version.return_value = 0
+    # Two workers, each with its own in-memory cache, over the same database
+    revoking_worker = CachedUserRepository(mock_user_repository, InMemoryLRUCache(), ttl=60)
+    other_worker = CachedUserRepository(mock_user_repository, InMemoryLRUCache(), ttl=60)
+    other_worker.get_by_id(developer.id)
+    assert other_worker.get_token_version(developer.id) == 0
+    
+    mock_user_repository.bump_token_version.return_value = True
+    revoking_worker.bump_token_version(developer.id)
+    mock_user_repository.get_token_version.return_value = 1
+    
+    assert other_worker.get_token_version(developer.id) == 1
+
+# Test 37: Event streams - they cannot take every worker thread and end when the worker stops
+def test_event_streams_fit_worker_threads(mock_users):
+    """Test that the subscriber cap is checked against the threads and shutdown ends open streams."""
+    from app.adapters.api.live_events import RESYNC_FRAME, event_stream_response
+    from app.infrastructure.event_broker import EventBroker, InMemoryFanout, SubscriberLimitError
+    from app.infrastructure.server import worker_settings_errors
+    
+    settings = {
+        "WEB_WORKERS": 1, "WEB_THREADS": 4, "USER_CACHE_BACKEND": "memory",
+        "LIVE_EVENTS_BACKEND": "memory", "LIVE_EVENTS_MAX_SUBSCRIBERS": 4
+    }
+    assert len(worker_settings_errors(settings)) == 1
+    assert worker_settings_errors({**settings, "LIVE_EVENTS_MAX_SUBSCRIBERS": 2}) == []
+    assert worker_settings_errors({**settings, "LIVE_EVENTS_BACKEND": "none"}) == []
+    # Per-process memory backends cannot be shared by several workers
+    several = {**settings, "WEB_WORKERS": 3, "LIVE_EVENTS_MAX_SUBSCRIBERS": 2}
+    assert len(worker_settings_errors(several)) == 2
+    assert worker_settings_errors({**several, "USER_CACHE_BACKEND": "redis", "LIVE_EVENTS_BACKEND": "redis"}) == []
+    
+    broker = EventBroker(InMemoryFanout())
+    subscription = broker.subscribe(mock_users["developer"].has_permission)
+    frames = event_stream_response(subscription, heartbeat=60).response
+    
+    broker.shut_down_subscribers()
+    # The stream ends at once instead of waiting for the next heartbeat
+    assert list(frames)[-1] == RESYNC_FRAME
+    assert broker.subscriber_count == 0
+    with pytest.raises(SubscriberLimitError):
+        broker.subscribe(mock_users["developer"].has_permission)
+
+
+# Test 38: Shared backends - several workers never default to per-process memory backends
+def test_several_workers_default_to_shared_backends(monkeypatch):
+    """Test that the cache and event backends follow WEB_WORKERS and REDIS_URL."""
+    import importlib
+    import app.infrastructure.config as config_module
+    
+    def load(**env):
+        for key in ('USER_CACHE_BACKEND', 'LIVE_EVENTS_BACKEND', 'REDIS_URL'):
+            monkeypatch.delenv(key, raising=False)
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        return importlib.reload(config_module).Config
+    
+    try:
+        config = load(WEB_WORKERS='1')
+        assert (config.USER_CACHE_BACKEND, config.LIVE_EVENTS_BACKEND) == ('memory', 'memory')
+        
+        config = load(WEB_WORKERS='3')
+        assert (config.USER_CACHE_BACKEND, config.LIVE_EVENTS_BACKEND) == ('none', 'none')
+        
+        config = load(WEB_WORKERS='3', REDIS_URL='redis://cache:6379/0')
+        assert (config.USER_CACHE_BACKEND, config.LIVE_EVENTS_BACKEND) == ('redis', 'redis')
+        assert config.USER_CACHE_REDIS_URL == config.LIVE_EVENTS_REDIS_URL == 'redis://cache:6379/0'
+    finally:
+        monkeypatch.undo()
+        importlib.reload(config_module)
+
+# Test 39: ASGI app - native reads match Flask and everything else falls back to it
+def test_asgi_app_reads_and_fallback(sqlite_app):
+    """Test the ASGI app's native GET /tasks (200, 304, 401, 422) and its fallback to Flask."""
+    pytest.importorskip("starlette")
+    pytest.importorskip("a2wsgi")
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("httpx")
+    from starlette.testclient import TestClient
+    from app.asgi import create_asgi_app
+    
+    client = sqlite_app.test_client()
+    _, headers = create_and_login(client, "Asgi", Role.ADMIN)
+    
+    with TestClient(create_asgi_app(sqlite_app)) as asgi_client:
+        # Writes are not native: they reach the Flask app through the fallback
+        created = asgi_client.post(
+            "/tasks", headers=headers,
+            json={"title": "ASGI task", "description": "Served by Flask", "priority": "Alta"}
+        )
+        assert created.status_code == 201
+        
+        response = asgi_client.get("/tasks", headers=headers)
+        assert response.status_code == 200
+        assert created.json()["id"] in [task["id"] for task in response.json()]
+        flask_response = client.get("/tasks", headers=headers)
+        assert response.json() == flask_response.json
+        assert response.headers["etag"] == flask_response.headers["ETag"]
+        
+        unchanged = asgi_client.get("/tasks", headers={**headers, "If-None-Match": response.headers["etag"]})
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+        # Parameters are validated before the tag is compared
+        assert asgi_client.get("/tasks?limit=0", headers={**headers, "If-None-Match": "*"}).status_code == 400
+        assert asgi_client.get("/users?cursor=WyJhIl0", headers={**headers, "If-None-Match": "*"}).status_code == 400
+        
+        assert asgi_client.get("/tasks").status_code == 401
+        assert asgi_client.get("/tasks", headers={"Authorization": "Bearer not-a-token"}).status_code == 422
+        # Routes without a native handler are served by Flask as well
+        assert asgi_client.get("/tasks/changes", headers=headers).status_code == \
+            client.get("/tasks/changes", headers=headers).status_code
+
+# Test 40: Change feed - writes are positioned right after they commit, so reading the feed writes nothing
+def test_change_feed_read_is_read_only(sqlite_app):
+    """Test that committed writes get their feed positions and GET /tasks/changes only runs SELECTs."""
+    from sqlalchemy import event
+    from app.infrastructure.database import db
+    
+    client = sqlite_app.test_client()
+    _, headers = create_and_login(client, "Feed", Role.ADMIN)
+    page = client.get("/tasks/changes", headers=headers).json
+    while page["has_more"]:
+        page = client.get(f"/tasks/changes?since={page['cursor']}", headers=headers).json
+    start = page["cursor"]
+    
+    first = client.post("/tasks", headers=headers, json={"title": "First", "description": "d", "priority": "Alta"})
+    second = client.post("/tasks", headers=headers, json={"title": "Second", "description": "d", "priority": "Baja"})
+    client.put(f"/tasks/{first.json['id']}/status", headers=headers, json={"status": TaskStatus.IN_PROGRESS.value})
+    
+    with sqlite_app.app_context():
+        pending = db.session.execute(db.text("SELECT COUNT(*) FROM task_changes WHERE seq IS NULL")).scalar()
+    assert pending == 0
+    
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lstrip().split(None, 1)[0].upper())
+    
+    with sqlite_app.app_context():
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            response = client.get(f"/tasks/changes?since={start}", headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+    
+    assert response.status_code == 200
+    # The later write moves the first task after the second
+    assert [task["id"] for task in response.json["items"]] == [second.json["id"], first.json["id"]]
+    assert set(statements) == {"SELECT"}
+
+# Test 41: Conditional listings - invalid parameters get a 400 even with a matching ETag
+def test_invalid_listing_params_never_get_not_modified(sqlite_app):
+    """Test that limit and cursor are validated before a matching If-None-Match can answer 304."""
+    client = sqlite_app.test_client()
+    _, headers = create_and_login(client, "Conditional", Role.ADMIN)
+    client.post("/tasks", headers=headers, json={"title": "Tagged", "description": "d", "priority": "Media"})
+    
+    requests = {
+        "/tasks": ["?limit=0", "?limit=abc", "?cursor=not-a-cursor", "?q=Tagged&cursor=WzEsIDJd"],
+        "/users": ["?limit=1000", "?cursor=WyJhIl0"],
+    }
+    for path, invalid in requests.items():
+        for params in invalid:
+            # "*" matches whatever tag the listing would get
+            response = client.get(path + params, headers={**headers, "If-None-Match": "*"})
+            assert response.status_code == 400, path + params
+
+# Test 42: User cache - password hashes never reach the cache backend
+def test_user_cache_never_stores_password_hashes(mock_user_repository, mock_users):
+    """Test that cached user records leave out the password hash and logins bypass the cache."""
+    from app.adapters.cached_user_repository import CachedUserRepository
+    from app.infrastructure.cache import InMemoryLRUCache
+    
+    developer = mock_users["developer"]
+    developer.password_hash = "$2b$12$hash"
+    mock_user_repository.get_by_id.return_value = developer
+    mock_user_repository.get_by_email.return_value = developer
+    mock_user_repository.suggest.return_value = [developer]
+    backend = InMemoryLRUCache()
+    repository = CachedUserRepository(mock_user_repository, backend, ttl=60)
+    
+    repository.get_by_id(developer.id)
+    repository.suggest("dev", 5)
+    assert "password_hash" not in backend.get(f"user:{developer.id}")
+    assert all("password_hash" not in record for record in backend.get("suggest::5:dev")["users"])
+    
+    cached = repository.get_by_id(developer.id)
+    assert cached.password_hash is None
+    assert cached.token_version == developer.token_version
+    # Logins read by email, so they still get the hash
+    assert repository.get_by_email(developer.email).password_hash == "$2b$12$hash"
+
+# Test 43: Bulk transitions - object bodies only, per-task codes from the service's outcomes
+def test_bulk_transition_bodies_and_outcomes(sqlite_app):
+    """Test that bulk status updates reject non-object bodies and report 200 and 404 per task."""
+    from app.infrastructure.database import db
+    
+    client = sqlite_app.test_client()
+    _, headers = create_and_login(client, "Bulk", Role.ADMIN)
+    task = client.post("/tasks", headers=headers, json={"title": "Bulk", "description": "d", "priority": "Baja"}).json
+    
+    for path in ("/tasks/bulk/status", "/tasks/bulk/priority"):
+        for body in ("null", "[]"):
+            response = client.put(path, headers={**headers, "Content-Type": "application/json"}, data=body)
+            assert response.status_code == 400, (path, body)
+    
+    missing_id = task["id"] + 1000
+    response = client.put(
+        "/tasks/bulk/status", headers=headers,
+        json={"status": TaskStatus.IN_PROGRESS.value, "task_ids": [task["id"], missing_id]}
+    )
+    assert response.status_code == 207
+    assert [(result["task_id"], result["status"]) for result in response.json["results"]] == [
+        (task["id"], 200), (missing_id, 404)
+    ]
+    
+    # The repository returns the IDs it updated, never tasks without their assignees
+    with sqlite_app.app_context():
+        updated = PostgreSQLTaskRepository().apply_changes_many([task["id"], missing_id], {"priority": TaskPriority.HIGH})
+        db.session.remove()
+    assert updated == [task["id"]]
+
+
+
+# Test 44: Redis fan-out - writers only queue events, a stalled Redis never blocks them
+def test_redis_fanout_publishes_off_the_request_thread(monkeypatch):
+    """Test that RedisFanout sets socket timeouts, publishes on its own thread and drops events it cannot send."""
+    import sys
+    import threading
+    import time
+    import types
+    from app.infrastructure.event_broker import BrokerMessage, RedisFanout
+    
+    stalled = threading.Event()
+    release = threading.Event()
+    
+    class StalledRedis:
+        def __init__(self, **options):
+            self.options = options
+            self.published = []
+        
+        @classmethod
+        def from_url(cls, url, **options):
+            return cls(**options)
+        
+        def publish(self, channel, data):
+            stalled.set()
+            release.wait(5)
+            if len(self.published) == 0:
+                self.published.append(data)
+                raise ConnectionError("Redis went away")
+            self.published.append(data)
+    
+    monkeypatch.setitem(sys.modules, "redis", types.SimpleNamespace(Redis=StalledRedis))
+    fanout = RedisFanout("redis://cache:6379/0", timeout=0.5, max_pending=2)
+    fanout._publisher = threading.Thread(target=fanout._send_pending, daemon=True)
+    fanout._publisher.start()
+    try:
+        assert fanout._client.options == {"socket_timeout": 0.5, "socket_connect_timeout": 0.5}
+        
+        fanout.publish(BrokerMessage("first"))
+        assert stalled.wait(5)
+        started = time.monotonic()
+        for frame in ("second", "third", "fourth"):
+            fanout.publish(BrokerMessage(frame))
+        assert time.monotonic() - started < 0.5
+        assert fanout.dropped == 1
+        
+        # A failed publish is logged and dropped; the publisher keeps going
+        release.set()
+        deadline = time.monotonic() + 5
+        while len(fanout._client.published) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [BrokerMessage.decode(data).frame for data in fanout._client.published] == ["first", "second", "third"]
+        assert fanout.dropped == 2
+    finally:
+        release.set()
+        fanout.close()
+
+
+# Test 45: ASGI app - same token locations and user loading as the Flask app
+def test_asgi_app_token_locations_and_loader(sqlite_app):
+    """Test that the ASGI app accepts the same token locations as Flask and rejects revoked tokens."""
+    pytest.importorskip("starlette")
+    pytest.importorskip("a2wsgi")
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("httpx")
+    from starlette.testclient import TestClient
+    from app.asgi import create_asgi_app
+    
+    client = sqlite_app.test_client()
+    _, headers = create_and_login(client, "AsgiTokens", Role.ADMIN)
+    token = headers["Authorization"].split()[1]
+    
+    def both(path, **kwargs):
+        flask_response = client.get(path, **kwargs)
+        asgi_response = asgi_client.get(path, **kwargs)
+        assert asgi_response.status_code == flask_response.status_code, path
+        assert asgi_response.json() == flask_response.json, path
+        return asgi_response.status_code
+    
+    with TestClient(create_asgi_app(sqlite_app)) as asgi_client:
+        # Query string tokens only count when the app is configured to read them
+        assert both(f"/tasks?jwt={token}") == 401
+        assert both("/tasks", headers={"Authorization": "Token abc"}) == 401
+        locations = sqlite_app.config["JWT_TOKEN_LOCATION"]
+        sqlite_app.config["JWT_TOKEN_LOCATION"] = ["query_string", "headers"]
+        try:
+            assert both(f"/tasks?jwt={token}") == 200
+            assert both("/tasks/stats", headers=headers) == 200
+        finally:
+            sqlite_app.config["JWT_TOKEN_LOCATION"] = locations
+        
+        assert both("/tasks", headers={"Authorization": "Bearer not-a-token"}) == 422
+        
+        # Revoked tokens are refused by both stacks through the same loader
+        assert client.post("/auth/revoke", headers=headers).status_code == 204
+        assert both("/tasks", headers=headers) == 401
+        assert both("/users/1", headers=headers) == 401
@@ -3,4 +3,5 @@ from app import create_app
 app = create_app()
 
 if __name__ == '__main__':
+    # Development server only; production runs gunicorn -c gunicorn.conf.py wsgi:app
     app.run(host='0.0.0.0', port=5000) 
\ No newline at end of file